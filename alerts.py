@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from data_quality import validate_frames, quality_summary
+from drawdown import BUY_ZONE_DD, CORRECTION_ZONE_DD, STATUS_BUY, STATUS_CORRECTION, STATUS_STABLE, classify_status
+
+# ============================================================
+# 헤드리스 하락 구간 알림 데몬
+# ============================================================
+# - 티커별 누적 고점 / 현재 상태 단계만 배열로 보관하므로 새 봉 1개 평가는 O(티커 수) 벡터 연산이며 과거 데이터를 다시 읽지 않습니다.
+# - 히스테리시스: 더 깊은 구간 진입은 기준선 도달 즉시, 얕은 구간으로의 복귀는 기준선 + hysteresis(%p) 를 넘어야 인정
+# - 중복 제거: 같은 하락 국면(같은 고점)에서는 이미 알린 가장 깊은 단계보다 더 깊어질 때만 발송
+#   (기준선 부근에서 오르내려도 같은 단계/얕은 단계 알림은 반복되지 않음). 고점 갱신 시 초기화, 상태 파일로 재시작 후에도 유지
+# 사용법: python alerts.py --sink stdout --sink file:alerts.jsonl --interval 60
+STATUS_NAMES = {
+    STATUS_BUY: "🔴 물타기 구간",
+    STATUS_CORRECTION: "🟡 조정 구간",
+    STATUS_STABLE: "🔵 안정 구간",
+}
+DEFAULT_HYSTERESIS = 2.0
+DEFAULT_STATE_FILE = "alerts_state.json"
+
+
+class DrawdownAlertEngine:
+    def __init__(self, tickers, hysteresis=DEFAULT_HYSTERESIS, themes=None):
+        self.tickers = list(tickers)
+        self.hysteresis = float(hysteresis)
+        self.themes = themes or {}
+        k = len(self.tickers)
+        self.peak = np.full(k, np.nan)
+        self.peak_date = np.full(k, None, dtype=object)
+        self.price = np.full(k, np.nan)
+        self.level = np.full(k, STATUS_STABLE, dtype=np.int8)
+        self.last_date = None
+        # 중복 제거 키: 고점(sent_peak) 이후 알림을 보낸 가장 깊은 단계(sent_level)
+        self.sent_level = np.full(k, -1, dtype=np.int8)
+        self.sent_peak = np.full(k, np.nan)
+
+    # --------------------------------------------------------
+    # 과거 종가로 한 번만 초기화 (이후로는 새 봉만 반영)
+    # --------------------------------------------------------
+    def seed(self, close_prices: pd.DataFrame):
+        values = close_prices.reindex(columns=self.tickers).to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        rows = np.arange(len(values))[:, None]
+        self.peak = np.fmax.reduce(values, axis=0) if len(values) else np.full(len(self.tickers), np.nan)
+        peak_idx = np.where(valid & (values == self.peak), rows, -1).max(axis=0, initial=-1)
+        last_idx = np.where(valid, rows, -1).max(axis=0, initial=-1)
+        dates = close_prices.index
+        self.peak_date = np.array([str(dates[i].date()) if i >= 0 else None for i in peak_idx], dtype=object)
+        self.price = np.where(last_idx >= 0, values[np.maximum(last_idx, 0), np.arange(len(self.tickers))], np.nan)
+        self.level = self._levels(self.price).astype(np.int8)
+        # 이미 진행 중인 하락 구간은 시작 시점에 재알림하지 않음
+        self.sent_level = self.level.copy()
+        self.sent_peak = self.peak.copy()
+        self.last_date = dates[-1] if len(dates) else None
+
+    def _levels(self, price):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = (price / self.peak - 1.0) * 100
+        return classify_status(np.nan_to_num(dd, nan=0.0))
+
+    # --------------------------------------------------------
+    # 새 봉 1개 평가: O(티커 수)
+    # --------------------------------------------------------
+    def update(self, row, date=None):
+        row = np.asarray(row, dtype=float)
+        valid = ~np.isnan(row)
+        new_high = valid & ~(row <= self.peak)
+        self.peak = np.where(new_high, row, self.peak)
+        if new_high.any():
+            self.peak_date[new_high] = str(pd.Timestamp(date or datetime.now()).date())
+        self.price = np.where(valid, row, self.price)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = (self.price / self.peak - 1.0) * 100
+        dd0 = np.nan_to_num(dd, nan=0.0)
+        deeper = classify_status(dd0)                      # 기준선 도달 즉시 진입
+        held = classify_status(dd0 - self.hysteresis)      # 기준선 + hysteresis 위로 올라와야 해제
+        level = np.where(deeper > self.level, deeper, np.minimum(self.level, held)).astype(np.int8)
+        level = np.where(valid, level, self.level).astype(np.int8)
+
+        changed = level != self.level
+        self.level = level
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+
+        # 같은 고점 기준으로 이미 알린 단계 이하(같거나 얕은 단계)면 생략. 고점 갱신 시 새 국면으로 간주해 초기화
+        alerted = np.where(self.sent_peak == self.peak, self.sent_level, STATUS_STABLE).astype(np.int8)
+        deeper_than_sent = level > alerted
+        fire = np.flatnonzero(changed & deeper_than_sent)
+        self.sent_level = np.where(deeper_than_sent, level, alerted).astype(np.int8)
+        self.sent_peak = self.peak.copy()
+        return [self._alert(i, dd[i], date) for i in fire]
+
+    def _alert(self, i, dd, date):
+        ticker = self.tickers[i]
+        level = int(self.level[i])
+        return {
+            "ticker": ticker,
+            "theme": self.themes.get(ticker, ""),
+            "level": level,
+            "status": STATUS_NAMES[level],
+            "price": float(self.price[i]),
+            "drawdown": round(float(dd), 2),
+            "peak": float(self.peak[i]),
+            "peak_date": self.peak_date[i],
+            "time": str(pd.Timestamp(date or datetime.now())),
+        }
+
+    # --------------------------------------------------------
+    # 상태 저장 / 복원 (재시작 시 과거 데이터 재조회 없이 이어서 평가)
+    # --------------------------------------------------------
+    def save(self, path):
+        state = {
+            "tickers": self.tickers,
+            "peak": self.peak.tolist(),
+            "peak_date": self.peak_date.tolist(),
+            "price": self.price.tolist(),
+            "level": self.level.tolist(),
+            "sent_level": self.sent_level.tolist(),
+            "sent_peak": self.sent_peak.tolist(),
+            "last_date": str(self.last_date) if self.last_date is not None else None,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        # 저장된 상태 중 현재 감시 목록에 있는 티커만 복원. 복원되지 않은 티커 목록을 반환
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        pos = {t: i for i, t in enumerate(state["tickers"])}
+        idx = np.array([pos.get(t, -1) for t in self.tickers])
+        hit = idx >= 0
+        src = np.maximum(idx, 0)
+        for name, dtype in (("peak", float), ("price", float), ("sent_peak", float), ("level", np.int8), ("sent_level", np.int8)):
+            values = np.array(state[name], dtype=float)[src] if len(state["tickers"]) else np.zeros(len(self.tickers))
+            current = getattr(self, name)
+            setattr(self, name, np.where(hit, values, current).astype(dtype))
+        peak_dates = np.array(state["peak_date"], dtype=object)
+        self.peak_date = np.where(hit, peak_dates[src] if len(peak_dates) else None, self.peak_date)
+        self.last_date = pd.Timestamp(state["last_date"]) if state.get("last_date") else None
+        return [t for t, ok in zip(self.tickers, hit) if not ok]
+
+
+# ============================================================
+# 알림 출력 대상 (sink)
+# ============================================================
+def format_alert(alert):
+    return (f"[{alert['time']}] {alert['status']} {alert['ticker']} "
+            f"{alert['drawdown']:.2f}% (고점 {alert['peak']:,.2f} @ {alert['peak_date']}, 현재가 {alert['price']:,.2f})")
+
+
+class StdoutSink:
+    def emit(self, alerts):
+        for alert in alerts:
+            print(format_alert(alert), flush=True)
+
+
+class FileSink:
+    # JSON Lines 로 추가 기록
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, alerts):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for alert in alerts:
+                f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+
+
+class WebhookSink:
+    # 알림 묶음을 JSON 으로 POST. 실패해도 데몬은 계속 동작
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def emit(self, alerts):
+        body = json.dumps({"alerts": alerts}, ensure_ascii=False).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                resp.read()
+        except OSError as e:
+            print(f"웹훅 전송 실패 ({self.url}): {e}", file=sys.stderr)
+
+
+def make_sink(spec):
+    # "stdout" | "file:<경로>" | "webhook:<URL>"
+    kind, _, target = spec.partition(":")
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "file" and target:
+        return FileSink(target)
+    if kind == "webhook" and target:
+        return WebhookSink(target)
+    raise ValueError(f"알 수 없는 알림 출력 대상: {spec}")
+
+
+def run_webhook_stub(port=8765):
+    # 로컬 테스트용 웹훅 수신기: 받은 알림을 그대로 출력
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            for alert in payload.get("alerts", []):
+                print("웹훅 수신:", format_alert(alert), flush=True)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    print(f"웹훅 수신기 실행 중: http://127.0.0.1:{port}/")
+    HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+# ============================================================
+# 데이터 공급 (yfinance)
+# ============================================================
+def load_history(tickers, years=20):
+    # 초기 고점 계산용 과거 종가 (최신 공유 스냅샷이 있으면 그대로 사용)
+    from dateutil.relativedelta import relativedelta
+    from snapshot import open_snapshot
+
+    start = datetime.today() - relativedelta(years=years)
+    snap = open_snapshot()
+    if snap is not None and snap.is_fresh() and snap.covers(tickers, start):
+        return snap.frame("close")[tickers].iloc[snap.index.searchsorted(start):]
+    import yfinance as yf
+    df = yf.download(tickers, start=start.strftime('%Y-%m-%d'), progress=False, auto_adjust=True)
+    close = df["Close"] if isinstance(df.columns, pd.MultiIndex) else df[["Close"]].set_axis(tickers, axis=1)
+    # 잘못된 시세(0 이하, 튀는 가격)로 고점이 왜곡되지 않도록 품질 검증 후 사용
+    fields, quality, _ = validate_frames({"close": close.reindex(columns=tickers)})
+    text = quality_summary(quality)
+    if text:
+        print(text, file=sys.stderr)
+    return fields["close"]
+
+
+def fetch_latest(tickers, chunk_size=500):
+    # 티커별 최신 1분봉 종가 (대량 감시 목록은 chunk 단위로 한 번에 요청)
+    import yfinance as yf
+    latest = pd.Series(np.nan, index=tickers)
+    for i in range(0, len(tickers), chunk_size):
+        chunk = tickers[i:i + chunk_size]
+        df = yf.download(chunk, period="1d", interval="1m", progress=False, auto_adjust=True)
+        if df.empty:
+            continue
+        close = df["Close"] if isinstance(df.columns, pd.MultiIndex) else df[["Close"]].set_axis(chunk, axis=1)
+        latest.update(close.ffill().iloc[-1])
+    return latest
+
+
+def run(engine, sinks, interval=60, state_file=None, once=False):
+    while True:
+        started = time.monotonic()
+        try:
+            row = fetch_latest(engine.tickers).to_numpy(dtype=float)
+            alerts = engine.update(row, datetime.now())
+            if alerts:
+                for sink in sinks:
+                    sink.emit(alerts)
+            if state_file:
+                engine.save(state_file)
+        except Exception as e:
+            print(f"평가 실패: {e}", file=sys.stderr)
+        if once:
+            return
+        time.sleep(max(interval - (time.monotonic() - started), 0))
+
+
+def main(argv=None):
+    from universe import load_universe
+
+    parser = argparse.ArgumentParser(description="MDD 하락 구간 알림 데몬")
+    parser.add_argument("--universe", help="감시 목록 CSV (기본: MDD_UNIVERSE_FILE 또는 universe.csv)")
+    parser.add_argument("--sink", action="append", default=None, help="stdout | file:<경로> | webhook:<URL> (여러 번 지정 가능)")
+    parser.add_argument("--interval", type=float, default=60, help="평가 주기 (초)")
+    parser.add_argument("--hysteresis", type=float, default=DEFAULT_HYSTERESIS, help="상태 해제 여유폭 (%%p)")
+    parser.add_argument("--state", default=DEFAULT_STATE_FILE, help="상태 저장 파일")
+    parser.add_argument("--years", type=int, default=20, help="초기 고점 계산 기간 (년)")
+    parser.add_argument("--once", action="store_true", help="한 번만 평가하고 종료")
+    parser.add_argument("--webhook-stub", type=int, metavar="PORT", help="로컬 웹훅 수신기만 실행")
+    args = parser.parse_args(argv)
+
+    if args.webhook_stub:
+        run_webhook_stub(args.webhook_stub)
+        return
+
+    universe = load_universe(args.universe)
+    tickers = universe["ticker"].tolist()
+    engine = DrawdownAlertEngine(tickers, args.hysteresis, dict(zip(universe["ticker"], universe["theme"])))
+    sinks = [make_sink(spec) for spec in (args.sink or ["stdout"])]
+
+    missing = tickers
+    if args.state and os.path.exists(args.state):
+        missing = engine.load(args.state)
+    if missing:
+        # 상태 파일에 없는 티커만 과거 데이터로 초기화
+        partial = DrawdownAlertEngine(missing, args.hysteresis)
+        partial.seed(load_history(missing, args.years))
+        pos = [tickers.index(t) for t in missing]
+        for name in ("peak", "peak_date", "price", "level", "sent_level", "sent_peak"):
+            getattr(engine, name)[pos] = getattr(partial, name)
+    print(f"감시 시작: {len(tickers)}개 티커 (기준 {CORRECTION_ZONE_DD:.0f}% / {BUY_ZONE_DD:.0f}%, 히스테리시스 {args.hysteresis}%p)", flush=True)
+    run(engine, sinks, args.interval, args.state, args.once)
+
+
+if __name__ == "__main__":
+    main()
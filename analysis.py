@@ -0,0 +1,106 @@
+from drawdown import drawdown_frame, drawdown_summary, rolling_mdd, STATUS_BUY, STATUS_CORRECTION, BUY_ZONE_DD, CORRECTION_ZONE_DD
+from drawdown_rank import drawdown_ranks, drawdown_ranks_asof
+from event_study import cached_event_study, event_text, events_asof, event_summary
+from range_index import panel_index
+
+# ============================================================
+# 티커별 분석 결과 (Tk 대시보드 main.py / 로컬 HTTP 서비스 api_server.py 공용)
+# ============================================================
+def analyze(close_prices, tickers, asof=None, status_mode="fixed"):
+    # 반환: {티커: 분석 결과 dict}. 데이터가 없는(또는 품질 검증에서 격리된) 티커는 제외
+    # asof: 과거 기준일. 요약값은 구간 질의 인덱스에서, 시계열은 기준일까지 잘라서 사용 (이후 데이터는 쓰지 않음)
+    # status_mode: "fixed" 고정 기준선(-10% / -20%), "vol" 티커 변동성에 맞춘 기준선
+    tickers = [t for t in tickers if t in close_prices.columns]
+    if asof is None:
+        summary = drawdown_summary(close_prices[tickers])
+    else:
+        summary = panel_index(close_prices).summary_asof(asof, tickers)
+    tickers = [t for t in tickers if t in summary.index]
+    if not tickers:
+        return {}
+    rolling_1y = rolling_mdd(close_prices[tickers], {"1y": 1})["1y"]
+    # 기준선 진입 이후 과거 성과 (같은 데이터로 새로고침되면 캐시 사용)
+    events, event_stats, _ = cached_event_study(close_prices[tickers])
+    if asof is not None:
+        event_stats = event_summary(events_asof(events, close_prices.index, asof))
+    # 과거 하락률 분포 내 백분위 / 변동성 기준선 (새로고침 때는 새 거래일만 반영)
+    ranks = drawdown_ranks(close_prices[tickers]) if asof is None else drawdown_ranks_asof(close_prices[tickers], asof)
+    results = {
+        ticker: analyze_ticker(
+            ticker, close_prices[ticker].dropna().loc[:asof], summary.loc[ticker], rolling_1y[ticker].dropna().loc[:asof],
+            ranks.loc[ticker], status_mode,
+        )
+        for ticker in tickers
+    }
+    for ticker, res in results.items():
+        res['event_text'] = "\n".join(event_text(event_stats, ticker))
+    return results
+
+
+def analyze_ticker(ticker, prices, summary_row, rolling_mdd_1y, rank_row=None, status_mode="fixed"):
+    # 1. 고점 및 하락률 계산 (공용 drawdown 모듈의 요약값 사용)
+    drawdown_20y = drawdown_frame(prices.to_frame(ticker))[ticker]
+    mdd_20y = summary_row['mdd']
+    current_dd_20y = summary_row['current_dd']
+    
+    # 2. 현재 하락 지속 기간 계산 (마지막 고점 기준)
+    is_peak = drawdown_20y == 0
+    peak_dates = prices[is_peak].index
+    
+    last_peak = summary_row['last_peak']
+    ongoing_days = summary_row['ongoing_days']
+    
+    # 3. 주요 회복 구간 리스트 계산 (50일 이상)
+    recovery_list = []
+    for i in range(len(peak_dates) - 1):
+        start = peak_dates[i]
+        end = peak_dates[i+1]
+        days = (end - start).days
+        if days >= 50:
+            period_mdd = drawdown_20y.loc[start:end].min()
+            recovery_list.append((start, end, days, period_mdd))
+            
+    if ongoing_days >= 50:
+        period_mdd = drawdown_20y.loc[last_peak:].min()
+        recovery_list.append((last_peak, None, ongoing_days, period_mdd))
+        
+    recovery_list.sort(key=lambda x: x[2], reverse=True)
+    
+    # 4. 구간 판단 로직 (변동성 기준이면 티커별 기준선)
+    level, correction, buy = summary_row['status_level'], CORRECTION_ZONE_DD, BUY_ZONE_DD
+    if status_mode == "vol" and rank_row is not None:
+        level, correction, buy = rank_row['status_level_vol'], rank_row['band_correction'], rank_row['band_buy']
+    if level == STATUS_BUY:
+        status = "🔴 물타기 구간"
+        status_desc = f"고점 대비 {-buy:.0f}% 이상 하락 (바겐세일 적극 검토)"
+        color = "#ffcccc"
+    elif level == STATUS_CORRECTION:
+        status = "🟡 조정 구간"
+        status_desc = f"고점 대비 {-correction:.0f}~{-buy:.0f}% 하락 (분할 매수 준비)"
+        color = "#fff0b3"
+    else:
+        status = "🔵 안정 구간"
+        status_desc = f"고점 대비 {-correction:.0f}% 이내 하락 (월 적립 매수 유지)"
+        color = "#cce6ff"
+        
+    return {
+        'drawdown_20y': drawdown_20y,
+        'mdd_20y': mdd_20y,
+        'mdd_1y': summary_row['mdd_1y'],
+        'mdd_3y': summary_row['mdd_3y'],
+        'mdd_5y': summary_row['mdd_5y'],
+        'rolling_mdd_1y': rolling_mdd_1y,
+        'current_dd_20y': current_dd_20y,
+        'recovery_list': recovery_list,
+        'status': status,
+        'status_level': int(level),
+        'status_desc': status_desc,
+        'bg_color': color,
+        'last_peak': last_peak,
+        'ongoing_days': ongoing_days,
+        'status_mode': status_mode,
+        'dd_percentile': rank_row['dd_percentile'] if rank_row is not None else float('nan'),
+        'vol': rank_row['vol'] if rank_row is not None else float('nan'),
+        'band_correction': correction,
+        'band_buy': buy,
+    }
@@ -0,0 +1,440 @@
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from analysis import analyze
+from data_quality import validate_frames, quality_summary
+from event_study import data_version
+from rai_model import RAI_TICKERS, STRATEGIES, W_FULL, rai_features, risk_appetite_index, rai_percentile, quantile_to_weight
+from snapshot import open_snapshot, price_fields
+from universe import load_universe, normalize_ticker
+
+# ============================================================
+# 로컬 HTTP/JSON 서비스: 미리 계산한 MDD / RAI 결과 제공
+# ============================================================
+# - 백그라운드 스레드가 주기적으로 데이터를 받아 분석하고, 티커별 JSON 본문(bytes)과 ETag 를 미리 만들어 둡니다.
+#   완성된 결과 묶음(state)을 참조 하나로 교체하므로 요청 처리 중에는 잠금 없이 항상 일관된 한 버전만 읽습니다.
+# - 요청 처리는 본문 조회 + 헤더 작성뿐 (캐시 적중 시 1ms 미만). 여러 티커 조회는 티커별 본문을 이어 붙이고 LRU 에 보관
+# - If-None-Match 가 일치하면 304, Accept-Encoding: gzip 이면 압축 본문 (본문별로 처음 한 번만 압축)
+# 엔드포인트
+#   GET  /health                                 상태 / 데이터 버전 / 품질 요약 / 캐시 통계
+#   GET  /mdd?tickers=QQQ,SPY&series=1           여러 티커 (tickers 생략 시 전체, series=1 이면 하락률 시계열 포함)
+#   GET  /mdd/QQQ?series=1                       한 티커
+#   POST /mdd  {"tickers": [...], "series": false}  여러 티커 (목록이 길 때)
+#   GET  /rai?strategy=neutral&days=252          RAI / 백분위(q) / 목표 비중 (고정 가중치 W_FULL, days=0 이면 최신값만)
+# 사용법: python api_server.py --port 8787 --interval 900
+DEFAULT_PORT = 8787
+DEFAULT_INTERVAL = 900     # 새로고침 주기 (초)
+BATCH_CACHE_SIZE = 256     # 여러 티커 / RAI 응답 본문 LRU 크기
+GZIP_MIN_BYTES = 1024      # 이보다 작은 본문은 압축하지 않음
+DEFAULT_RAI_DAYS = 252
+STRATEGY_KEYS = {"defensive": STRATEGIES[0], "neutral": STRATEGIES[1], "aggressive": STRATEGIES[2]}
+
+
+class Body:
+    # 미리 인코딩한 응답 본문 (gzip 은 처음 요청될 때 한 번만 압축해 보관)
+    __slots__ = ("raw", "etag", "_gz")
+
+    def __init__(self, raw: bytes, etag=None):
+        self.raw = raw
+        self.etag = etag or '"%s"' % hashlib.sha1(raw).hexdigest()
+        self._gz = None
+
+    def gzipped(self) -> bytes:
+        if self._gz is None:
+            self._gz = gzip.compress(self.raw, 6)
+        return self._gz
+
+
+def json_bytes(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def _num(x):
+    return None if x is None or pd.isna(x) else float(x)
+
+
+def _date(x):
+    return None if x is None or pd.isna(x) else pd.Timestamp(x).strftime("%Y-%m-%d")
+
+
+def _values(values, decimals=4):
+    arr = np.round(np.asarray(values, dtype=float), decimals)
+    return [None if v != v else v for v in arr.tolist()]
+
+
+def _series(s: pd.Series, decimals=4) -> dict:
+    return {"dates": s.index.strftime("%Y-%m-%d").tolist(), "values": _values(s, decimals)}
+
+
+def result_json(ticker, res, series=False) -> dict:
+    # analysis_results[티커] -> JSON (Timestamp 는 YYYY-MM-DD, NaN 은 null, 시계열은 series=True 일 때만)
+    out = {
+        "ticker": ticker,
+        "as_of": _date(res["drawdown_20y"].index[-1]) if len(res["drawdown_20y"]) else None,
+        "status": res["status"],
+        "status_desc": res["status_desc"],
+        "bg_color": res["bg_color"],
+        "current_dd_20y": _num(res["current_dd_20y"]),
+        "mdd_20y": _num(res["mdd_20y"]),
+        "mdd_1y": _num(res["mdd_1y"]),
+        "mdd_3y": _num(res["mdd_3y"]),
+        "mdd_5y": _num(res["mdd_5y"]),
+        "last_peak": _date(res["last_peak"]),
+        "ongoing_days": int(res["ongoing_days"]),
+        "recovery_list": [
+            {"start": _date(start), "end": _date(end), "days": int(days), "mdd": _num(mdd)}
+            for start, end, days, mdd in res["recovery_list"]
+        ],
+        "event_text": res.get("event_text", ""),
+        "dd_percentile": _num(res.get("dd_percentile")),
+        "vol": _num(res.get("vol")),
+        "band_correction": _num(res.get("band_correction")),
+        "band_buy": _num(res.get("band_buy")),
+    }
+    if series:
+        out["drawdown_20y"] = _series(res["drawdown_20y"])
+        out["rolling_mdd_1y"] = _series(res["rolling_mdd_1y"])
+    return out
+
+
+def rai_frame(close, high, low) -> pd.DataFrame:
+    # 2페이지 기본 설정(고정 가중치)과 같은 계산: 날짜별 RAI, 백분위(q), 성향별 목표 비중
+    Xz, _, _ = rai_features(close, high, low)
+    rai = risk_appetite_index(Xz, W_FULL)
+    q = rai_percentile(rai)
+    frame = pd.DataFrame({"rai": rai, "q": q})
+    for key, strategy in STRATEGY_KEYS.items():
+        frame[key] = q.apply(lambda x: quantile_to_weight(x, strategy))
+    return frame
+
+
+def build_state(close, high, low, tickers, quality) -> dict:
+    # 한 번의 새로고침 결과 (만든 뒤에는 수정하지 않음)
+    results = analyze(close, tickers)
+    bodies = {
+        t: (Body(json_bytes(result_json(t, res))), Body(json_bytes(result_json(t, res, series=True))))
+        for t, res in results.items()
+    }
+    try:
+        rai, rai_error = rai_frame(close, high, low), None
+    except (KeyError, ValueError) as e:
+        rai, rai_error = None, f"RAI 계산 실패: {e}"
+    return {
+        "version": data_version(close)[:16],
+        "as_of": _date(close.index[-1]) if len(close.index) else None,
+        "tickers": bodies,
+        "order": [t for t in tickers if t in bodies],
+        "missing": [t for t in tickers if t not in bodies],
+        "rai": rai,
+        "rai_error": rai_error,
+        "quality": quality_summary(quality),
+    }
+
+
+class AnalyticsService:
+    def __init__(self, tickers, years=20, interval=DEFAULT_INTERVAL, cache_size=BATCH_CACHE_SIZE):
+        self.tickers = list(tickers)
+        self.years = years
+        self.interval = interval
+        self.cache_size = cache_size
+        self.state = None            # 새로고침이 끝날 때마다 통째로 교체
+        self.quality_state = None    # 이력이 그대로인 티커는 품질 재검사 생략
+        self.last_error = None
+        self.refreshed_at = None
+        self.refresh_ms = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0, "failures": 0}
+
+    def load_prices(self):
+        # 공유 스냅샷이 최신이면 메모리 매핑으로, 아니면 다운로드 후 품질 검증
+        all_tickers = list(dict.fromkeys(self.tickers + RAI_TICKERS))
+        start = datetime.today() - relativedelta(years=self.years)
+        snap = open_snapshot()
+        if snap is not None and snap.is_fresh() and snap.covers(all_tickers, start):
+            i0 = snap.index.searchsorted(pd.Timestamp(start))
+            fields = {f: snap.frame(f)[all_tickers].iloc[i0:] for f in ("close", "high", "low")}
+            return fields, snap.quality()
+        import yfinance as yf
+        df = yf.download(all_tickers, start=start.strftime('%Y-%m-%d'), progress=False, auto_adjust=True)
+        if df.empty:
+            raise ValueError("데이터를 가져오지 못했습니다.")
+        fields, self.quality_state, _ = validate_frames(price_fields(df), self.quality_state)
+        return fields, self.quality_state
+
+    def refresh(self):
+        t0 = time.perf_counter()
+        fields, quality = self.load_prices()
+        close = fields["close"].dropna(how="all")
+        state = build_state(close, fields["high"].reindex(close.index), fields["low"].reindex(close.index), self.tickers, quality)
+        with self._lock:
+            self.state = state
+            self._cache.clear()
+        self.refreshed_at = datetime.now()
+        self.refresh_ms = (time.perf_counter() - t0) * 1000
+        self.last_error = None
+        self.stats["refreshes"] += 1
+
+    def run_refresh_loop(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                # 실패해도 직전 결과는 계속 제공
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.stats["failures"] += 1
+                print(f"새로고침 실패: {self.last_error}", file=sys.stderr, flush=True)
+            time.sleep(self.interval)
+
+    def start(self):
+        threading.Thread(target=self.run_refresh_loop, daemon=True).start()
+
+    def cached(self, key, build):
+        # 조합형 응답(여러 티커 / RAI 기간) 본문 LRU. key 에 데이터 버전을 포함하므로 새로고침 후에는 새로 만듦
+        with self._lock:
+            body = self._cache.get(key)
+            if body is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return body
+            self.stats["misses"] += 1
+        body = build()
+        with self._lock:
+            self._cache[key] = body
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return body
+
+    def health(self) -> Body:
+        state = self.state
+        return Body(json_bytes({
+            "status": "ok" if state is not None else ("error" if self.last_error else "loading"),
+            "version": state["version"] if state else None,
+            "as_of": state["as_of"] if state else None,
+            "refreshed_at": self.refreshed_at.isoformat(timespec="seconds") if self.refreshed_at else None,
+            "refresh_ms": round(self.refresh_ms, 1) if self.refresh_ms is not None else None,
+            "interval": self.interval,
+            "tickers": len(state["tickers"]) if state else 0,
+            "missing": state["missing"] if state else [],
+            "quality": state["quality"] if state else "",
+            "rai_error": state["rai_error"] if state else None,
+            "last_error": self.last_error,
+            "cache": dict(self.stats, size=len(self._cache)),
+        }))
+
+    def mdd_batch(self, state, tickers, series=False) -> Body:
+        # 티커별 본문을 그대로 이어 붙임 (다시 인코딩하지 않음). ETag 는 티커별 ETag 로부터 계산
+        key = (state["version"], "mdd", tuple(tickers), series)
+
+        def build():
+            parts = [(t, state["tickers"][t][series]) for t in tickers if t in state["tickers"]]
+            missing = [t for t in tickers if t not in state["tickers"]]
+            raw = b"".join([
+                b'{"as_of":', json_bytes(state["as_of"]), b',"results":{',
+                b",".join(json_bytes(t) + b":" + body.raw for t, body in parts),
+                b'},"missing":', json_bytes(missing), b"}",
+            ])
+            tag = hashlib.sha1("|".join([body.etag for _, body in parts] + missing).encode()).hexdigest()
+            return Body(raw, f'"{tag}"')
+
+        return self.cached(key, build)
+
+    def rai_body(self, state, strategy, days) -> Body:
+        key = (state["version"], "rai", strategy, days)
+
+        def build():
+            frame = state["rai"].dropna(subset=["rai"])
+            if frame.empty:
+                raise ApiError(503, "계산된 RAI 값이 아직 없습니다.")
+            latest = frame.iloc[-1]
+            out = {
+                "as_of": _date(frame.index[-1]),
+                "strategy": strategy,
+                "weights": "W_FULL",
+                "latest": {"rai": _num(latest["rai"]), "q": _num(latest["q"]), "target_w": _num(latest[strategy])},
+            }
+            if days:
+                tail = frame.iloc[-days:]
+                out["series"] = {
+                    "dates": tail.index.strftime("%Y-%m-%d").tolist(),
+                    "rai": _values(tail["rai"]),
+                    "q": _values(tail["q"]),
+                    "target_w_series": _values(tail[strategy]),
+                }
+            return Body(json_bytes(out))
+
+        return self.cached(key, build)
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_tickers(values) -> list:
+    # "QQQ,SPY" / ["QQQ", "spy"] -> 정규화 + 중복 제거 (요청 순서 유지)
+    if isinstance(values, str):
+        values = [values]
+    tickers = [normalize_ticker(t) for v in values for t in str(v).split(",") if t.strip()]
+    return list(dict.fromkeys(tickers))
+
+
+def parse_flag(value) -> bool:
+    return str(value).lower() in ("1", "true", "yes", "on")
+
+
+def accepts_gzip(header) -> bool:
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def make_handler(service: AnalyticsService):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"   # keep-alive: 반복 조회 시 연결 재사용
+        disable_nagle_algorithm = True  # 헤더/본문을 나눠 쓸 때 지연 ACK 대기(~40ms) 방지
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            self.dispatch(url.path, {k: v[-1] for k, v in parse_qs(url.query).items()}, None)
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                length = -1
+            if length < 0:
+                # 본문 길이를 알 수 없으므로 응답 후 연결을 닫음
+                self.close_connection = True
+                self.reply(400, Body(json_bytes({"error": "Content-Length 헤더가 올바르지 않습니다."})), time.perf_counter())
+                return
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                payload = None
+            self.dispatch(url.path, {k: v[-1] for k, v in parse_qs(url.query).items()}, payload)
+
+        def dispatch(self, path, query, payload):
+            t0 = time.perf_counter()
+            try:
+                status, body = 200, self.route(path.rstrip("/") or "/", query, payload)
+            except ApiError as e:
+                status, body = e.status, Body(json_bytes({"error": str(e)}))
+            except Exception as e:
+                # 예상하지 못한 오류도 연결을 끊지 않고 500 으로 응답 (상세 내용은 서버 로그에만)
+                print(f"요청 처리 실패: {self.command} {path}", file=sys.stderr, flush=True)
+                traceback.print_exc()
+                status, body = 500, Body(json_bytes({"error": f"서버 내부 오류: {type(e).__name__}"}))
+            self.reply(status, body, t0)
+
+        def route(self, path, query, payload):
+            if path == "/health":
+                return service.health()
+            state = service.state
+            if state is None:
+                raise ApiError(503, service.last_error or "첫 데이터 로드 중입니다.")
+
+            if path == "/mdd":
+                if self.command == "POST":
+                    if not isinstance(payload, dict) or not isinstance(payload.get("tickers", []), list):
+                        raise ApiError(400, '본문은 {"tickers": [...]} 형식의 JSON 이어야 합니다.')
+                    tickers = parse_tickers(payload.get("tickers") or state["order"])
+                    series = bool(payload.get("series", False))
+                else:
+                    tickers = parse_tickers(query["tickers"]) if query.get("tickers") else state["order"]
+                    series = parse_flag(query.get("series", "0"))
+                return service.mdd_batch(state, tickers, series)
+
+            if path.startswith("/mdd/") and self.command == "GET":
+                ticker = normalize_ticker(unquote(path[len("/mdd/"):]))
+                if ticker not in state["tickers"]:
+                    raise ApiError(404, f"결과가 없는 티커입니다: {ticker}")
+                return state["tickers"][ticker][parse_flag(query.get("series", "0"))]
+
+            if path == "/rai" and self.command == "GET":
+                if state["rai"] is None:
+                    raise ApiError(503, state["rai_error"])
+                strategy = query.get("strategy", "neutral")
+                if strategy not in STRATEGY_KEYS:
+                    raise ApiError(400, f"strategy 는 {', '.join(STRATEGY_KEYS)} 중 하나여야 합니다.")
+                try:
+                    days = int(query.get("days", DEFAULT_RAI_DAYS))
+                except ValueError:
+                    days = -1
+                if days < 0:
+                    raise ApiError(400, "days 는 0 이상의 정수여야 합니다.")
+                return service.rai_body(state, strategy, days)
+
+            raise ApiError(404, f"알 수 없는 경로입니다: {self.command} {path}")
+
+        def reply(self, status, body, t0):
+            headers = [("ETag", body.etag), ("Cache-Control", "no-cache")]
+            if service.state is not None:
+                headers.append(("X-Data-Version", service.state["version"]))
+
+            # 클라이언트가 가진 본문과 같으면 304 (본문 없음)
+            match = self.headers.get("If-None-Match")
+            if status == 200 and match and (match.strip() == "*" or body.etag in [m.strip() for m in match.split(",")]):
+                status, payload = 304, b""
+            elif len(body.raw) >= GZIP_MIN_BYTES and accepts_gzip(self.headers.get("Accept-Encoding")):
+                payload = body.gzipped()
+                headers += [("Content-Encoding", "gzip"), ("Vary", "Accept-Encoding")]
+            else:
+                payload = body.raw
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("Server-Timing", f"app;dur={(time.perf_counter() - t0) * 1000:.3f}")
+            self.end_headers()
+            if payload:
+                self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MDD / RAI 분석 결과 로컬 HTTP 서비스")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩 주소 (기본: 로컬 전용)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--universe", help="티커 목록 CSV (기본: MDD_UNIVERSE_FILE 또는 universe.csv)")
+    parser.add_argument("--years", type=int, default=20, help="분석 기간 (년)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="새로고침 주기 (초)")
+    args = parser.parse_args(argv)
+
+    service = AnalyticsService(load_universe(args.universe)["ticker"].tolist(), args.years, args.interval)
+    service.start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    server.daemon_threads = True
+    print(f"분석 서비스 실행 중: http://{args.host}:{args.port}/ (새로고침 {args.interval:.0f}초)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
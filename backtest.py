@@ -0,0 +1,445 @@
+import hashlib
+import threading
+import time
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from compute_backend import get_backend
+
+# ============================================================
+# DCA(적립식) 백테스트 엔진 - PricePanel(panel.py) 기반
+# ============================================================
+# 여러 포트폴리오를 (티커 x 포트폴리오) 비중 행렬 하나로 한 번에 시뮬레이션합니다.
+# 상장 여부(listed)는 상장일에만 바뀌므로, 상장일로 나눈 구간(epoch) 안에서는 포트폴리오별 비중 합계가 일정하고
+#   보유 수량(t) = 구간 시작 보유 수량 + 비중 x (구간 내 1/가격 누적합) / 비중 합계
+# 로 정리되어 평가금액은 구간마다 (날짜 x 티커) @ (티커 x 포트폴리오) 행렬곱 두 번으로 계산됩니다.
+# 적립금(contributions)은 매일 같은 금액(스칼라) 또는 날짜별 적립금 벡터(contributions.py 에서 컴파일한 일정)이며,
+# 벡터면 1/가격 대신 적립금/가격을 누적하는 것만 달라집니다.
+TRADING_DAYS = 252
+
+METRIC_NAMES = [
+    "start_balance", "total_invested", "end_balance", "total_return", "cagr", "std_dev",
+    "best_year", "worst_year", "mdd", "sharpe", "sortino", "xirr",
+    "cvar", "ulcer", "calmar", "longest_underwater", "recovery_days",
+]
+CVAR_LEVEL = 0.05       # CVaR(기대 손실): 하위 5% 일간 수익률의 평균
+
+
+def weights_matrix(weights, tickers) -> pd.DataFrame:
+    # dict {포트폴리오: {티커: 비중}} 또는 DataFrame(티커 x 포트폴리오) -> tickers 순서의 비중 행렬
+    if not isinstance(weights, pd.DataFrame):
+        weights = pd.DataFrame(weights)
+    return weights.reindex(index=tickers).fillna(0.0).astype(float)
+
+
+def contribution_matrix(contributions, n, p) -> np.ndarray:
+    # 적립금: 스칼라(매일 같은 금액) / (날짜,) 벡터(모든 컬럼 공통) / (날짜 x 컬럼) 행렬 -> (n, p) 배열
+    c = np.asarray(contributions, dtype=float)
+    if c.ndim == 1:
+        c = c[:, None]
+    return np.broadcast_to(c, (n, p))
+
+
+def simulate_dca_batch(panel, weights, initial_invest, daily_invest) -> pd.DataFrame:
+    # weights: (티커 x 포트폴리오) 비중. 아직 상장되지 않은 티커의 비중은 그날 상장된 나머지 티커에 비례 배분
+    # daily_invest: 매일 적립금(스칼라) 또는 날짜별 적립금 벡터. 해당 포트폴리오의 어떤 티커도 상장되기 전 적립금은 투자되지 않음
+    # 반환: (날짜 x 포트폴리오) 평가금액. 포트폴리오의 어떤 티커도 상장되지 않은 구간은 NaN
+    W = weights_matrix(weights, panel.columns)
+    names = W.columns
+    W = W.to_numpy()
+    listed = panel.listed.to_numpy()
+    prices = panel.prices.to_numpy(dtype=float)
+    n, k = prices.shape
+    p = W.shape[1]
+    value = np.zeros((n, p))
+    if n == 0 or p == 0:
+        return pd.DataFrame(value, index=panel.index, columns=names)
+
+    px = np.nan_to_num(prices)
+    with np.errstate(divide="ignore"):
+        inv_price = np.where(listed, 1.0 / np.where(listed, prices, 1.0), 0.0)
+    cum_inv = np.cumsum(inv_price * contribution_matrix(daily_invest, n, 1), axis=0)
+
+    total = listed @ W                              # (n, p) 날짜별 상장 티커 비중 합계
+    active = total > 0
+    first = np.where(active.any(axis=0), active.argmax(axis=0), n)
+
+    # 구간 경계: 상장 티커 집합이 바뀌는 날
+    change = np.flatnonzero((listed[1:] != listed[:-1]).any(axis=1)) + 1
+    bounds = np.r_[0, change, n]
+    carried = np.zeros((k, p))                      # 구간 시작 시점 누적 보유 수량
+    for s, e in zip(bounds[:-1], bounds[1:]):
+        tot = total[s]
+        scale = np.divide(1.0, tot, out=np.zeros(p), where=tot > 0)
+        base = cum_inv[s - 1] if s > 0 else np.zeros(k)
+        seg = cum_inv[s:e] - base                   # (rows, k) 구간 내 1/가격 누적
+        value[s:e] = (px[s:e] @ (W * carried)) + (px[s:e] * seg) @ W * scale
+        carried += (cum_inv[e - 1] - base)[:, None] * scale
+
+    # 초기 투자금: 포트폴리오별 첫 상장일에 그날 비중대로 한 번 매수
+    has_start = first < n
+    if initial_invest and has_start.any():
+        f = first[has_start]
+        init_shares = initial_invest * W[:, has_start] * inv_price[f].T / total[f, np.flatnonzero(has_start)]
+        value[:, has_start] += px @ init_shares
+
+    value[~active] = np.nan
+    return pd.DataFrame(value, index=panel.index, columns=names)
+
+
+def simulate_dca(panel, weights: dict, initial_invest, daily_invest) -> pd.Series:
+    # 단일 포트폴리오 {티커: 비중}
+    return simulate_dca_batch(panel, {"portfolio": weights}, initial_invest, daily_invest)["portfolio"]
+
+
+def simulate_cash(index, initial_invest, daily_invest, cash_interest_rate) -> pd.Series:
+    # 원금 + 일복리 이자 (적립금은 daily_invest 스칼라/날짜별 벡터)
+    #   잔고[t] = 잔고[t-1] x g + 적립금[t]  =  g^t x (초기금 x g + sum_{s<=t} 적립금[s] / g^s)
+    n = len(index)
+    g = (1 + cash_interest_rate / 100) ** (1 / 252)
+    growth = g ** np.arange(n)
+    flows = contribution_matrix(daily_invest, n, 1)[:, 0]
+    cash_hist = growth * (initial_invest * g + np.cumsum(flows / growth))
+    return pd.Series(cash_hist, index=index, dtype=float)
+
+
+# ============================================================
+# 성과 지표 (전체 결과 컬럼을 한 번에 계산, 컬럼별 시작 전 NaN 구간은 제외)
+# ============================================================
+def dca_returns(equity: pd.DataFrame, initial_invest, daily_invest) -> np.ndarray:
+    # 적립금을 제외한 일간 수익률: 평가금 / (전일 평가금 + 당일 적립금) - 1, 각 컬럼 첫날은 0
+    # daily_invest: 스칼라 / 날짜별 벡터 / (날짜 x 컬럼) 행렬 (contribution_matrix)
+    values = equity.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    prev = np.vstack([np.full((1, values.shape[1]), np.nan), values[:-1]])
+    prev = np.where(np.isnan(prev), initial_invest, prev)
+    denom = prev + contribution_matrix(daily_invest, *values.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets = np.where(denom != 0, values / denom - 1, 0.0)
+    first = valid & ~np.vstack([np.zeros((1, values.shape[1]), bool), valid[:-1]])
+    rets[first] = 0.0
+    rets[~valid] = np.nan
+    return rets
+
+
+def annual_returns(equity: pd.DataFrame, initial_invest, daily_invest, rets=None) -> pd.DataFrame:
+    # (연도 x 컬럼) 연간 수익률 (%). 데이터가 없는 연도는 NaN
+    rets = dca_returns(equity, initial_invest, daily_invest) if rets is None else rets
+    years = equity.index.year.to_numpy()
+    starts = np.r_[0, np.flatnonzero(years[1:] != years[:-1]) + 1]
+    growth = np.multiply.reduceat(np.where(np.isnan(rets), 1.0, 1.0 + rets), starts, axis=0) - 1
+    seen = np.add.reduceat((~np.isnan(rets)).astype(int), starts, axis=0) > 0
+    return pd.DataFrame(np.where(seen, growth * 100, np.nan), index=years[starts], columns=equity.columns)
+
+
+def performance_metrics(equity: pd.DataFrame, initial_invest, daily_invest, cash_interest_rate) -> pd.DataFrame:
+    # 반환: (METRIC_NAMES x 컬럼) 수치 표. 수익률/변동성/낙폭/CVaR/울서 지수는 %, 샤프/소르티노/칼마는 비율, 기간은 달력 일수
+    # 수익률 배열(rets)과 하락률 배열(dd)을 한 번씩만 만들고 모든 지표가 이를 재사용 (지표/컬럼별 반복 없음)
+    values = equity.to_numpy(dtype=float)
+    n, p = values.shape
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    rets = dca_returns(equity, initial_invest, daily_invest)
+    rows = np.arange(n)[:, None]
+    cols = np.arange(p)
+    days = (equity.index - equity.index[0]).days.to_numpy() if n else np.zeros(0, int)
+
+    last_idx = np.where(valid, np.arange(n)[:, None], -1).max(axis=0, initial=-1)
+    end_bal = np.where(last_idx >= 0, values[np.maximum(last_idx, 0), np.arange(p)], np.nan)
+    flows = np.where(valid, contribution_matrix(daily_invest, n, p), 0.0)
+    total_inv = initial_invest + flows.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"), warnings.catch_warnings():
+        # 데이터가 1일뿐인 컬럼의 표준편차 등은 NaN (기존 pandas 계산과 동일)
+        warnings.simplefilter("ignore", RuntimeWarning)
+        roi = np.where(total_inv > 0, (end_bal / total_inv - 1) * 100, 0.0)
+        years = count / TRADING_DAYS
+        ok = (years > 0) & (end_bal > 0) & (total_inv > 0)
+        cagr = np.where(ok, ((end_bal / total_inv) ** (1 / np.where(ok, years, 1.0)) - 1) * 100, 0.0)
+
+        dd = get_backend().drawdown(equity).to_numpy()
+        mdd = np.nanmin(np.where(valid, dd, np.nan), axis=0, initial=np.inf)
+        mdd = np.where(count > 0, mdd, 0.0)
+        ulcer = np.where(count > 0, np.sqrt(np.nanmean(dd ** 2, axis=0)), 0.0)
+        calmar = np.where(mdd < 0, cagr / np.abs(mdd), np.nan)
+
+        # 수면 아래 기간: 고점(하락률 0) 이후 다시 고점을 회복하기까지 (진행 중이면 마지막 날까지)
+        at_peak = valid & (dd >= 0)
+        last_peak = np.maximum.accumulate(np.where(at_peak, rows, -1), axis=0)
+        prev_peak = np.vstack([np.full((1, p), -1), last_peak[:-1]])
+        ended = at_peak & (prev_peak >= 0) & (rows - prev_peak > 1)
+        episode = np.where(ended, days[:, None] - days[np.maximum(prev_peak, 0)], 0)
+        last_row = np.maximum(last_idx, 0)
+        ongoing = np.where(count > 0, days[last_row] - days[np.maximum(last_peak[last_row, cols], 0)], 0)
+        longest = np.maximum(episode.max(axis=0, initial=0), ongoing)
+
+        # MDD 저점 -> 전고점 회복까지 (미회복이면 NaN)
+        trough = np.where(count > 0, np.argmin(np.where(valid, dd, np.inf), axis=0), 0)
+        recovery = np.minimum.accumulate(np.where(at_peak, rows, n)[::-1], axis=0)[::-1] if n else np.zeros((0, p), int)
+        rec_row = recovery[trough, cols] if n else np.full(p, n)
+        recovery_days = np.where(
+            (count > 0) & (rec_row < n), days[np.minimum(rec_row, max(n - 1, 0))] - days[trough], np.nan
+        ) if n else np.full(p, np.nan)
+
+        std = np.nanstd(rets, axis=0, ddof=1)
+        rf_daily = (1 + cash_interest_rate / 100) ** (1 / TRADING_DAYS) - 1
+        excess = rets - rf_daily
+        excess_mean = np.nanmean(excess, axis=0)
+        sharpe = np.where(std != 0, excess_mean * TRADING_DAYS / (std * np.sqrt(TRADING_DAYS)), 0.0)
+        downside = np.where(excess < 0, excess, np.nan)
+        n_down = (~np.isnan(downside)).sum(axis=0)
+        down_std = np.nanstd(downside, axis=0, ddof=1)
+        sortino = np.where((n_down > 0) & (down_std != 0), excess_mean * TRADING_DAYS / (down_std * np.sqrt(TRADING_DAYS)), 0.0)
+
+        # CVaR: 컬럼별로 정렬한 수익률(NaN 은 뒤로)의 누적합에서 하위 k 개 평균
+        k = np.maximum(np.ceil(count * CVAR_LEVEL).astype(int), 1)
+        tail = np.cumsum(np.sort(np.where(valid, rets, np.inf), axis=0), axis=0) if n else np.zeros((1, p))
+        cvar = np.where(count > 0, tail[np.minimum(k, max(n, 1)) - 1, cols] / k * 100, np.nan)
+
+        yearly = annual_returns(equity, initial_invest, daily_invest, rets).to_numpy()
+        has_year = ~np.isnan(yearly).all(axis=0)
+        best = np.where(has_year, np.nanmax(yearly, axis=0), 0.0)
+        worst = np.where(has_year, np.nanmin(yearly, axis=0), 0.0)
+
+    table = np.vstack([
+        np.full(p, float(initial_invest)), total_inv, end_bal, roi, cagr, std * np.sqrt(TRADING_DAYS) * 100,
+        best, worst, mdd, sharpe, sortino, xirr(equity, initial_invest, flows) * 100,
+        cvar, ulcer, calmar, longest, recovery_days,
+    ])
+    return pd.DataFrame(table, index=METRIC_NAMES, columns=equity.columns)
+
+
+def xirr(equity: pd.DataFrame, initial_invest, daily_invest, max_iter=100, tol=1e-10) -> np.ndarray:
+    # 금액가중 연수익률 (XIRR, 비율). 현금흐름: 첫날 -초기금, 날짜별 -적립금, 마지막 날 +최종 평가금 (연 365일 기준)
+    # 모든 컬럼을 한 번에 풀기 위해 x = log(1 + r) 에 대해 뉴턴법을 쓰고, 구간을 벗어나는 스텝은 이분법으로 대체
+    #   NPV(x) = sum_i 현금흐름_i x exp(-x t_i)
+    values = equity.to_numpy(dtype=float)
+    n, p = values.shape
+    valid = ~np.isnan(values)
+    has = valid.any(axis=0)
+    rows = np.arange(n)[:, None]
+    first = np.where(has, valid.argmax(axis=0), 0)
+    last = np.where(valid, rows, -1).max(axis=0, initial=-1)
+    cash = -np.where(valid, contribution_matrix(daily_invest, n, p), 0.0)
+    cols = np.arange(p)
+    cash[first, cols] -= np.where(has, initial_invest, 0.0)
+    cash[np.maximum(last, 0), cols] += np.where(has, values[np.maximum(last, 0), cols], 0.0)
+    days = (equity.index - equity.index[0]).days.to_numpy(dtype=float) if n else np.zeros(0)
+    t = (days[:, None] - days[first][None, :]) / 365.0
+    t = np.where(valid, t, 0.0)
+    span = np.where(has, days[np.maximum(last, 0)] - days[first], 0.0) / 365.0
+
+    def npv(x, j):
+        with np.errstate(over="ignore", invalid="ignore"):
+            flows = cash[:, j] * np.exp(-x * t[:, j])
+            return flows.sum(axis=0), -(flows * t[:, j]).sum(axis=0)
+
+    # 시작값: log(최종 평가금 / 총 투자금) / 금액가중 평균 보유 기간 (대개 뉴턴 몇 번이면 수렴)
+    outflow = np.maximum(-cash, 0.0)
+    invested = outflow.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        holding = (outflow * (span - t)).sum(axis=0) / invested
+        x = np.log(np.where(has, values[np.maximum(last, 0), cols], np.nan) / invested) / holding
+    x = np.clip(np.nan_to_num(x), -9.0, 9.0)
+    lo, hi = np.full(p, -10.0), np.full(p, 10.0)
+    done = ~has | (span <= 0)
+    # x -> -inf 에서는 마지막 날 현금흐름(최종 평가금 - 당일 적립금)이 NPV 를 지배하므로 하한의 부호는 그 부호
+    f_lo = np.sign(cash[np.maximum(last, 0), cols])
+    for _ in range(max_iter):
+        # 수렴하지 않은 컬럼만 계산
+        j = np.flatnonzero(~done)
+        if not len(j):
+            break
+        xj, loj, hij = x[j], lo[j], hi[j]
+        f, df = npv(xj, j)
+        # 현금흐름 부호가 한 번만 바뀌므로(적립 -> 최종 평가금) 근은 하나, 부호로 구간을 좁힘
+        same = np.sign(f) == np.sign(f_lo[j])
+        lo[j], f_lo[j] = np.where(same, xj, loj), np.where(same, f, f_lo[j])
+        hi[j] = np.where(same, hij, xj)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = xj - f / df
+        inside = np.isfinite(step) & (step > lo[j]) & (step < hi[j])
+        nxt = np.where(inside, step, (lo[j] + hi[j]) / 2)
+        x[j] = nxt
+        done[j] = np.abs(nxt - xj) < tol
+    ok = has & (span > 0) & (np.abs(x) < 10.0 - 1e-6)
+    return np.where(ok, np.expm1(np.round(x, 9)) + 0.0, np.nan)
+
+
+# ============================================================
+# 롤링 성과 지표 (최근 1년/3년 창, 전체 결과 컬럼을 한 번에 계산)
+# ============================================================
+# 창마다 rolling().apply 를 돌리지 않고 누적합의 차이로 창 안의 합계를 구합니다. (컬럼 수와 무관하게 O(n))
+#   창 합계 = cumsum[t] - cumsum[t - w]   → 평균/분산(변동성, 샤프), 하락 수익률만의 개수/합/제곱합(소르티노), log(1 + r) 합(CAGR)
+# 지표 정의는 performance_metrics 와 같되 CAGR 은 적립금 영향을 뺀 시간가중 수익률 기준입니다.
+# 창 안의 수익률이 w 개 모두 있는 날부터 값이 있고, 그 전은 NaN 입니다.
+ROLLING_WINDOWS = {"1y": 1, "3y": 3}
+ROLLING_METRICS = ["cagr", "std_dev", "sharpe", "sortino"]
+
+
+def _window_sum(values, w):
+    # (n, p) -> 각 행에서 끝나는 길이 w 창의 합 (앞 w - 1 행은 부분합)
+    csum = np.cumsum(values, axis=0)
+    out = csum.copy()
+    out[w:] -= csum[:-w]
+    return out
+
+
+def rolling_metrics(equity: pd.DataFrame, initial_invest, daily_invest, cash_interest_rate, windows=None, rets=None) -> dict:
+    # 반환: {(창, 지표): (날짜 x 컬럼) DataFrame}. CAGR/변동성은 %, 샤프/소르티노는 비율
+    windows = ROLLING_WINDOWS if windows is None else windows
+    rets = dca_returns(equity, initial_invest, daily_invest) if rets is None else rets
+    ok = ~np.isnan(rets)
+    rf_daily = (1 + cash_interest_rate / 100) ** (1 / TRADING_DAYS) - 1
+    excess = np.where(ok, rets - rf_daily, 0.0)
+    # 분산은 컬럼 평균을 뺀 값으로 누적 (합이 커져 생기는 자릿수 손실 방지, 분산은 평행이동에 불변)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        center = np.nan_to_num(np.nanmean(np.where(ok, excess, np.nan), axis=0))
+    centered = np.where(ok, excess - center, 0.0)
+    down = ok & (excess < 0)
+    down_x = np.where(down, excess, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_growth = np.where(ok, np.log(np.where(ok, 1.0 + rets, 1.0)), 0.0)
+
+    out = {}
+    for label, years in windows.items():
+        w = int(round(years * TRADING_DAYS))
+        count = _window_sum(ok.astype(float), w)
+        full = count >= w
+        s1 = _window_sum(centered, w)
+        s2 = _window_sum(centered ** 2, w)
+        mean_excess = _window_sum(excess, w) / w
+        n_down = _window_sum(down.astype(float), w)
+        d1 = _window_sum(down_x, w)
+        d2 = _window_sum(down_x ** 2, w)
+        growth = _window_sum(log_growth, w)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            var = np.maximum((s2 - s1 ** 2 / w) / (w - 1), 0.0)
+            std = np.sqrt(var)
+            down_var = np.maximum((d2 - d1 ** 2 / n_down) / (n_down - 1), 0.0)
+            down_std = np.sqrt(down_var)
+            # 누적합 오차로 0 이 아닌 아주 작은 분산이 남는 경우(이자만 붙는 현금 등)는 0 으로 취급
+            tiny = 1e-12 * np.maximum(np.abs(mean_excess), 1e-12)
+            sharpe = np.where(std > tiny, mean_excess * np.sqrt(TRADING_DAYS) / std, 0.0)
+            sortino = np.where((n_down > 1) & (down_std > tiny), mean_excess * np.sqrt(TRADING_DAYS) / down_std, 0.0)
+            cagr = (np.exp(growth * TRADING_DAYS / w) - 1) * 100
+        values = {"cagr": cagr, "std_dev": std * np.sqrt(TRADING_DAYS) * 100, "sharpe": sharpe, "sortino": sortino}
+        for name in ROLLING_METRICS:
+            out[(label, name)] = pd.DataFrame(np.where(full, values[name], np.nan), index=equity.index, columns=equity.columns)
+    return out
+
+
+# ============================================================
+# 결과 캐시 (정규화된 입력의 해시 -> 결과, 세션 간 공유)
+# ============================================================
+# 두 층으로 보관합니다.
+#   결과 단위: 폼 입력 전체(포트폴리오/벤치마크/기간/금액/이율) 해시 -> 화면에 그릴 결과 묶음 (TTL: 가격 데이터 캐시와 동일)
+#   컬럼 단위: (달력, 컬럼 비중, 금액/이율, 사용 티커 가격) 해시 -> 평가금액 + 성과 지표
+# 컬럼 키에는 가격 자체의 해시가 들어가므로 TTL 없이 LRU 로만 관리하며,
+# 벤치마크만 바뀐 경우 등은 캐시에 없는 컬럼만 한 번의 비중 행렬로 시뮬레이션합니다.
+def canonical_weights(weights: pd.Series) -> tuple:
+    # 비중의 순서/스케일과 무관한 표현: 0 초과 비중만 합계 1로 정규화 후 티커 순 정렬
+    return _canonical(weights.index.astype(str).to_numpy(), weights.to_numpy(dtype=float))
+
+
+def _canonical(tickers, values) -> tuple:
+    held = np.flatnonzero(values > 0)
+    held = held[np.argsort(tickers[held], kind="stable")]
+    w = values[held] / values[held].sum()
+    return tuple(zip(tickers[held].tolist(), np.round(w, 12).tolist()))
+
+
+def canonical_hash(*parts) -> str:
+    # parts: 문자열/숫자/튜플 등 repr 이 결정적인 값 (set/dict 는 정렬된 튜플로 넘길 것)
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def _array_hash(values) -> str:
+    return hashlib.sha256(np.ascontiguousarray(values).tobytes()).hexdigest()
+
+
+class BacktestCache:
+    def __init__(self, max_results=32, max_columns=512, ttl=900):
+        self.max_results = max_results
+        self.max_columns = max_columns
+        self.ttl = ttl
+        self._results = OrderedDict()       # key -> (저장 시각, 결과)
+        self._columns = OrderedDict()       # key -> (평가금액 Series, 성과 지표 Series)
+        self._lock = threading.Lock()
+        self.stats = {"result_hits": 0, "result_misses": 0, "column_hits": 0, "column_misses": 0}
+
+    @staticmethod
+    def _touch(store, key, value, limit):
+        store.pop(key, None)
+        store[key] = value
+        while len(store) > limit:
+            store.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._results[key]
+                entry = None
+            if entry is None:
+                self.stats["result_misses"] += 1
+                return None
+            self._results.move_to_end(key)
+            self.stats["result_hits"] += 1
+            return entry[1]
+
+    def put(self, key, result):
+        with self._lock:
+            self._touch(self._results, key, (time.monotonic(), result), self.max_results)
+
+    def simulate(self, panel, weights, initial_invest, daily_invest, cash_interest_rate, cash_col=None):
+        # weights: (티커 x 컬럼) 비중, daily_invest: 매일 적립금 또는 날짜별 적립금 벡터. cash_col 을 주면 원금+이자 컬럼을 맨 앞에 추가
+        # 반환: (날짜 x 컬럼) 평가금액, (METRIC_NAMES x 컬럼) 성과 지표, 새로 계산한 컬럼 수
+        W = weights_matrix(weights, panel.columns)
+        index_key = _array_hash(panel.index.asi8)
+        # 적립금이 날짜별 벡터(적립 일정)면 벡터 해시를 키에 사용
+        contrib = np.asarray(daily_invest, dtype=float)
+        contrib_key = float(contrib) if contrib.ndim == 0 else _array_hash(contrib)
+        params = (float(initial_invest), contrib_key, float(cash_interest_rate))
+        keys = {}
+        if cash_col is not None:
+            keys[cash_col] = canonical_hash("cash", index_key, params)
+        # 티커별 가격 해시는 한 번만 계산하고, 컬럼 키는 (정규화 비중, 보유 티커 가격 해시) 조합
+        tickers = W.index.astype(str).to_numpy()
+        price_keys = [_array_hash(col) for col in panel.prices.to_numpy(dtype=float).T]
+        w = W.to_numpy()
+        for j, c in enumerate(W.columns):
+            canon = _canonical(tickers, w[:, j])
+            held = np.flatnonzero(w[:, j] > 0)
+            held = held[np.argsort(tickers[held], kind="stable")]
+            keys[c] = canonical_hash("dca", index_key, params, canon, tuple(price_keys[i] for i in held))
+
+        with self._lock:
+            hits = {c: self._columns[k] for c, k in keys.items() if k in self._columns}
+            for c in hits:
+                self._columns.move_to_end(keys[c])
+            self.stats["column_hits"] += len(hits)
+            self.stats["column_misses"] += len(keys) - len(hits)
+
+        missing = [c for c in keys if c not in hits]
+        if missing:
+            parts = []
+            if cash_col in missing:
+                parts.append(simulate_cash(panel.index, initial_invest, daily_invest, cash_interest_rate).rename(cash_col))
+            dca_cols = [c for c in missing if c != cash_col]
+            if dca_cols:
+                parts.append(simulate_dca_batch(panel, W[dca_cols], initial_invest, daily_invest))
+            equity = pd.concat(parts, axis=1)
+            metrics = performance_metrics(equity, initial_invest, daily_invest, cash_interest_rate)
+            with self._lock:
+                for c in missing:
+                    hits[c] = (equity[c], metrics[c])
+                    self._touch(self._columns, keys[c], hits[c], self.max_columns)
+
+        order = list(keys)
+        equity = pd.concat({c: hits[c][0] for c in order}, axis=1)
+        metrics = pd.concat({c: hits[c][1] for c in order}, axis=1)
+        return equity, metrics, len(missing)
@@ -0,0 +1,75 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from compute_backend import BACKENDS, NumpyBackend
+
+# ============================================================
+# 연산 백엔드 비교 (numpy / polars / arrow): 결과 일치 여부 + 실행 시간
+# 사용법: python bench_backend.py [티커 수, 기본 500] [기간(년), 기본 30] [반복 횟수, 기본 3]
+# ============================================================
+# 비교 대상은 백엔드로 바꿀 수 있는 두 커널(rolling_zscore, drawdown)뿐입니다 (compute_backend.py 참고).
+# 일치 기준: numpy 결과와 결측 위치가 같고, 값 차이가 허용 오차 이내 (z-score 는 백엔드별 이동 분산 계산 방식 차이로 1e-6)
+TOLERANCE = {"rolling_zscore": 1e-6, "drawdown": 1e-9}
+ZSCORE_WINDOW = 252
+
+
+def make_prices(n_tickers, years, seed=0):
+    # 가상 가격: 일부 티커는 중간에 상장, 일부 구간은 결측
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * years)
+    prices = np.exp(np.cumsum(rng.normal(0.0003, 0.015, (len(index), n_tickers)), axis=0)) * 100
+    prices[rng.random(prices.shape) < 0.001] = np.nan
+    for j in range(0, n_tickers, 5):
+        prices[:rng.integers(1, len(index) // 2), j] = np.nan
+    return pd.DataFrame(prices, index=index, columns=[f"T{i:03d}" for i in range(n_tickers)])
+
+
+def best_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t)
+    return result, min(times)
+
+
+def compare(expected: pd.DataFrame, actual: pd.DataFrame, tol):
+    a, b = expected.to_numpy(), actual.to_numpy()
+    same_missing = np.array_equal(np.isnan(a), np.isnan(b))
+    finite = np.isfinite(a) & np.isfinite(b)
+    err = np.max(np.abs(a[finite] - b[finite]) / np.maximum(np.abs(a[finite]), 1.0), initial=0.0)
+    return same_missing and err <= tol, err
+
+
+if __name__ == "__main__":
+    n_tickers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    prices = make_prices(n_tickers, years)
+    print(f"{n_tickers}개 티커 x {len(prices)}일")
+    kernels = {
+        "rolling_zscore": lambda b: b.rolling_zscore(prices, ZSCORE_WINDOW),
+        "drawdown": lambda b: b.drawdown(prices),
+    }
+    reference = {name: fn(NumpyBackend()) for name, fn in kernels.items()}
+
+    failed = False
+    baseline = {}
+    for backend_name, cls in BACKENDS.items():
+        try:
+            backend = cls()
+        except ImportError as e:
+            print(f"{backend_name:<8} 사용 불가 ({e})")
+            continue
+        for name, fn in kernels.items():
+            result, elapsed = best_time(lambda: fn(backend), repeat)
+            baseline.setdefault(name, elapsed)
+            ok, err = compare(reference[name], result, TOLERANCE[name])
+            failed |= not ok
+            print(f"{backend_name:<8} {name:<16} {elapsed * 1000:>9.1f} ms  (numpy 대비 {elapsed / baseline[name]:.2f}배)"
+                  f"   최대 오차 {err:.1e}  {'일치' if ok else '불일치'}")
+    sys.exit(1 if failed else 0)
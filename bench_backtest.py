@@ -0,0 +1,59 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from panel import build_price_panel
+from backtest import simulate_dca, simulate_dca_batch, performance_metrics
+
+# ============================================================
+# N개 포트폴리오 백테스트 시간 비교 (포트폴리오별 반복 vs 비중 행렬 한 번)
+# 사용법: python bench_backtest.py [포트폴리오 수, 기본 100] [티커 수, 기본 30] [기간(년), 기본 20]
+# ============================================================
+
+
+def make_panel(n_tickers, years, seed=0):
+    # 가상 가격: 일부 티커는 중간에 상장, 일부는 주말 거래(암호화폐)
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=252 * years)
+    prices = np.exp(np.cumsum(rng.normal(0.0003, 0.015, (len(index), n_tickers)), axis=0)) * 100
+    raw = pd.DataFrame(prices, index=index, columns=[f"T{i:03d}" for i in range(n_tickers)])
+    for j in range(0, n_tickers, 4):
+        raw.iloc[:rng.integers(1, len(index) // 2), j] = np.nan
+    return build_price_panel(raw, calendar="trading")
+
+
+def make_weights(tickers, n_portfolios, seed=0):
+    rng = np.random.default_rng(seed)
+    w = rng.random((len(tickers), n_portfolios)) * (rng.random((len(tickers), n_portfolios)) < 0.3)
+    w[0] = np.where(w.sum(axis=0) == 0, 1.0, w[0])
+    return pd.DataFrame(w / w.sum(axis=0), index=tickers, columns=[f"포트폴리오 {i + 1}" for i in range(n_portfolios)])
+
+
+def timed(fn):
+    t = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t
+
+
+if __name__ == "__main__":
+    n_portfolios = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    n_tickers = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    years = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    panel = make_panel(n_tickers, years)
+    weights = make_weights(panel.columns, n_portfolios)
+    print(f"{n_portfolios}개 포트폴리오 x {n_tickers}개 티커 x {len(panel.index)}일")
+
+    loop, t_loop = timed(lambda: pd.DataFrame({
+        c: simulate_dca(panel, weights[c][weights[c] > 0].to_dict(), 1000, 80) for c in weights.columns
+    }))
+    batch, t_batch = timed(lambda: simulate_dca_batch(panel, weights, 1000, 80))
+    _, t_metrics = timed(lambda: performance_metrics(batch, 1000, 80, 0.0))
+    diff = np.nanmax(np.abs(batch.to_numpy() - loop.to_numpy()) / np.maximum(np.abs(loop.to_numpy()), 1.0))
+
+    print(f"{'포트폴리오별 반복':<20} {t_loop * 1000:>10.1f} ms")
+    print(f"{'비중 행렬 한 번':<20} {t_batch * 1000:>10.1f} ms")
+    print(f"{'성과 지표 (전체)':<20} {t_metrics * 1000:>10.1f} ms")
+    print(f"최대 상대 오차: {diff:.2e}")
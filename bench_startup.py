@@ -0,0 +1,43 @@
+import os
+import statistics
+import subprocess
+import sys
+
+# ============================================================
+# 콜드 스타트 import 시간 비교 (이전: 전체 즉시 import / 이후: 페이지 단위 지연 import)
+# 사용법: python bench_startup.py [반복 횟수]
+# ============================================================
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS = {
+    # 이전 구조: app.py 최상단에서 모든 라이브러리를 import
+    "app.py (이전, 즉시 import)": "import streamlit, yfinance, pandas, numpy, matplotlib.pyplot",
+    # 이후 구조: 셸 + 선택된 페이지 모듈만 import (yfinance 는 캐시 미스 시에만)
+    "app.py 셸 (이후)": "import streamlit, market_data",
+    "app.py 셸 + 1. MDD 페이지": "import streamlit, market_data, page_mdd",
+    "app.py 셸 + 2. RAI 페이지": "import streamlit, market_data, page_rai",
+    "app.py 셸 + 3. 백테스트 페이지": "import streamlit, market_data, page_backtest",
+    "app.py 셸 + 4. 동조화 페이지": "import streamlit, market_data, page_comovement",
+    "main.py (이전, 즉시 import)": "import tkinter, yfinance, pandas, matplotlib.figure, matplotlib.backends.backend_tkagg",
+    "main.py (이후)": "import main",
+}
+
+
+def time_import(stmt):
+    code = f"import time; t = time.perf_counter(); {stmt}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, capture_output=True, text=True)
+    if out.returncode != 0:
+        return None
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'시나리오':<36} {'중앙값(ms)':>10} {'최소(ms)':>10}")
+    for name, stmt in SCENARIOS.items():
+        samples = [time_import(stmt) for _ in range(repeat)]
+        samples = [s for s in samples if s is not None]
+        if not samples:
+            print(f"{name:<36} {'import 실패':>10}")
+            continue
+        print(f"{name:<36} {statistics.median(samples) * 1000:>10.0f} {min(samples) * 1000:>10.0f}")
@@ -0,0 +1,127 @@
+import tkinter as tk
+from tkinter import ttk
+
+# ============================================================
+# 가상화 카드 그리드 (Tk 종합 대시보드)
+# ============================================================
+# 티커마다 카드 위젯을 만들지 않고, 화면에 보이는 행(+ 위아래 여유 행)만큼의 카드를 풀로 만들어 재사용합니다.
+#   - 캔버스 스크롤 영역은 (전체 행 수 x 행 높이) 로만 잡고, 카드는 캔버스 window 항목으로 해당 위치에 배치
+#   - 스크롤 시 계속 보이는 카드는 위치만 옮기고, 새로 드러난 칸에만 빠진 카드를 옮겨 내용을 채움
+# 위젯 수가 유니버스 크기와 무관하므로 티커 1,000개여도 스크롤/갱신 비용은 화면 크기에만 비례합니다.
+CARD_HEIGHT = 380
+CARD_PAD = 10
+BUFFER_ROWS = 1
+HIDDEN_Y = -10 * CARD_HEIGHT
+
+
+def visible_slice(top, height, n_items, columns, row_height, buffer_rows=BUFFER_ROWS):
+    # 스크롤 위치(top, 픽셀)와 화면 높이 -> 보여야 하는 항목 위치 범위 [start, stop)
+    if n_items == 0 or height <= 0:
+        return 0, 0
+    first_row = max(0, int(top // row_height) - buffer_rows)
+    last_row = int((top + height) // row_height) + buffer_rows
+    return first_row * columns, min(n_items, (last_row + 1) * columns)
+
+
+class VirtualCardGrid:
+    def __init__(self, parent, create_card, fill_card, columns=3, card_height=CARD_HEIGHT, on_click=None):
+        # create_card(master) -> (카드 Frame, {이름: Label}), fill_card(card, labels, key): 카드 내용 채우기
+        self.create_card = create_card
+        self.fill_card = fill_card
+        self.columns = columns
+        self.row_height = card_height + CARD_PAD
+        self.card_height = card_height
+        self.on_click = on_click
+        self.keys = []
+        self.pool = []          # [{'window', 'card', 'labels', 'key'}]
+        self.shown = {}         # key -> pool 항목
+        self._pending = False
+        self._width = 0
+
+        self.canvas = tk.Canvas(parent, borderwidth=0, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_yview, yscrollincrement=20)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.bind("<Configure>", lambda event: self.schedule(resize=True))
+        self._bind_wheel(self.canvas)
+
+    # --------------------------------------------------------
+    # 스크롤 / 크기 변경 (여러 이벤트는 idle 시점에 한 번만 배치)
+    # --------------------------------------------------------
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda event: self.scroll(-1))
+        widget.bind("<Button-5>", lambda event: self.scroll(1))
+
+    def scroll(self, direction):
+        self.canvas.yview_scroll(direction * 3, "units")
+
+    def on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        self.schedule()
+
+    def schedule(self, resize=False):
+        if resize:
+            self._width = 0
+        if not self._pending:
+            self._pending = True
+            self.canvas.after_idle(self.layout)
+
+    # --------------------------------------------------------
+    # 항목 교체 (정렬/필터 변경, 새로고침)
+    # --------------------------------------------------------
+    def set_keys(self, keys, refresh=False, to_top=False):
+        # keys: 표시 순서대로의 티커 목록. refresh=True 면 보이는 카드 내용도 다시 채움 (데이터 변경)
+        self.keys = list(keys)
+        if refresh:
+            for slot in self.shown.values():
+                slot['key'] = None
+            self.shown = {}
+        if to_top:
+            self.canvas.yview_moveto(0)
+        self._width = 0
+        self.layout()
+
+    def layout(self):
+        self._pending = False
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        card_width = max(1, (width - CARD_PAD * (self.columns + 1)) // self.columns)
+        if width != self._width:
+            # 폭이 바뀌면 전체 스크롤 영역과 카드 폭을 다시 잡음
+            self._width = width
+            n_rows = -(-len(self.keys) // self.columns)
+            self.canvas.configure(scrollregion=(0, 0, width, n_rows * self.row_height + CARD_PAD))
+            for slot in self.pool:
+                self.canvas.itemconfigure(slot['window'], width=card_width)
+
+        start, stop = visible_slice(self.canvas.canvasy(0), height, len(self.keys), self.columns, self.row_height)
+        wanted = {self.keys[i]: i for i in range(start, stop)}
+        # 계속 보이는 카드는 그대로, 벗어난 카드는 재사용 대상으로
+        free = [slot for key, slot in self.shown.items() if key not in wanted]
+        free += [slot for slot in self.pool if slot['key'] is None]
+        self.shown = {key: slot for key, slot in self.shown.items() if key in wanted}
+        for key, i in wanted.items():
+            slot = self.shown.get(key)
+            if slot is None:
+                slot = free.pop() if free else self._new_slot(card_width)
+                slot['key'] = key
+                self.fill_card(slot['card'], slot['labels'], key)
+                self.shown[key] = slot
+            row, col = divmod(i, self.columns)
+            self.canvas.coords(slot['window'], CARD_PAD + col * (card_width + CARD_PAD), CARD_PAD + row * self.row_height)
+        for slot in free:
+            slot['key'] = None
+            self.canvas.coords(slot['window'], 0, HIDDEN_Y)
+
+    def _new_slot(self, card_width):
+        card, labels = self.create_card(self.canvas)
+        window = self.canvas.create_window(0, HIDDEN_Y, window=card, anchor="nw", width=card_width, height=self.card_height)
+        slot = {'window': window, 'card': card, 'labels': labels, 'key': None}
+        for widget in [card, *labels.values()]:
+            self._bind_wheel(widget)
+            if self.on_click is not None:
+                widget.bind("<Button-1>", lambda event, s=slot: s['key'] is not None and self.on_click(s['key']))
+        self.pool.append(slot)
+        return slot
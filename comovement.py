@@ -0,0 +1,308 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from drawdown import drawdown_values
+
+# ============================================================
+# 자산 간 동조화 분석 (롤링 수익률 상관계수 + 동반 하락 빈도)
+# ============================================================
+# 상관계수는 결측(상장 전, 휴장일)을 제외한 pairwise 방식이며, 아래 합계 행렬만 유지하면
+# 새 거래일이 들어올 때마다 rank-1 갱신(추가/제거)으로 O(k^2) 에 전체 행렬을 다시 얻을 수 있습니다.
+#   P = X'X,  A = X'M,  Q = (X^2)'M,  N = M'M   (X: 결측을 0으로 채운 로그수익률, M: 유효 마스크)
+# 조회 창이 밀리면 전체 기간 동반 하락 합계에서 빠지는 행만 빼고, 장중 새로고침으로 마지막 거래일이 바뀌면 그 행만 교체합니다.
+MIN_CORR_OBS = 20
+
+
+def log_returns(prices: pd.DataFrame) -> np.ndarray:
+    # 각 자산의 직전 유효 종가 대비 로그수익률 (당일 가격이 없으면 NaN)
+    values = prices.to_numpy(dtype=float)
+    filled = prices.ffill().to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_p = np.log(filled)
+    rets = np.full_like(log_p, np.nan)
+    rets[1:] = log_p[1:] - log_p[:-1]
+    rets[np.isnan(values)] = np.nan
+    return rets
+
+
+def correlation_from_sums(P, A, Q, N, min_obs=MIN_CORR_OBS):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        num = N * P - A * A.T
+        var = N * Q - A ** 2
+        corr = num / np.sqrt(var * var.T)
+    corr[(N < min_obs) | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+class CoMovementState:
+    def __init__(self, tickers, window, threshold):
+        self.tickers = list(tickers)
+        self.window = int(window)
+        self.threshold = float(threshold)
+        self.first_date = None
+        self.last_date = None
+        self.lock = threading.Lock()
+        self.stats = {"rebuilds": 0, "appends": 0, "slides": 0, "revisions": 0}
+
+    # --------------------------------------------------------
+    # 전체 패널로부터 한 번에 초기화 (행렬곱 몇 번으로 끝남)
+    # --------------------------------------------------------
+    def rebuild(self, prices: pd.DataFrame):
+        k, w = len(self.tickers), self.window
+        values = prices.to_numpy(dtype=float)
+        rets = log_returns(prices)
+        _, dd = drawdown_values(values)
+        under = (dd <= self.threshold).astype(float)
+
+        x = np.nan_to_num(rets[-w:])
+        m = (~np.isnan(rets[-w:])).astype(float)
+        u = under[-w:]
+        self._P, self._A = x.T @ x, x.T @ m
+        self._Q, self._N = (x * x).T @ m, m.T @ m
+        self._C_window = u.T @ u
+        self._C_total = under.T @ under
+
+        # 가장 오래된 행부터 빠져나가도록 링버퍼 구성
+        self._ring_x = np.zeros((w, k))
+        self._ring_m = np.zeros((w, k))
+        self._ring_u = np.zeros((w, k))
+        filled = len(x)
+        self._ring_x[:filled], self._ring_m[:filled], self._ring_u[:filled] = x, m, u
+        self._pos = filled % w
+        self._count = filled
+
+        # 창 안의 가격: 창이 밀리거나 마지막 행이 바뀔 때 되돌릴 항목을 다시 계산하는 데 사용
+        self._index = prices.index
+        self._values = values
+        self._peak = np.fmax.reduce(values, axis=0) if len(values) else np.full(k, np.nan)
+        self._last_price = prices.ffill().to_numpy(dtype=float)[-1] if len(values) else np.full(k, np.nan)
+        self._underwater_now = under[-1].astype(bool) if len(values) else np.zeros(k, bool)
+        self.first_date = prices.index[0] if len(prices) else None
+        self.last_date = prices.index[-1] if len(prices) else None
+        self.stats["rebuilds"] += 1
+
+    # --------------------------------------------------------
+    # 새 거래일 1개 반영: O(k^2)
+    # --------------------------------------------------------
+    def update(self, date, row):
+        row = np.asarray(row, dtype=float)
+        self._apply(date, row)
+        self._index = self._index.append(pd.DatetimeIndex([date]))
+        self._values = np.vstack([self._values, row])
+
+    def _apply(self, date, row):
+        valid = ~np.isnan(row)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = np.log(row / self._last_price)
+        m = (valid & ~np.isnan(ret)).astype(float)
+        x = np.where(m > 0, ret, 0.0)
+
+        self._peak = np.fmax(self._peak, row)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            u = (valid & ((row / self._peak - 1.0) * 100 <= self.threshold)).astype(float)
+
+        if self._count >= self.window:
+            self._add_terms(self._ring_x[self._pos], self._ring_m[self._pos], self._ring_u[self._pos], -1.0)
+        self._add_terms(x, m, u, 1.0)
+        self._C_total += np.outer(u, u)
+
+        self._ring_x[self._pos], self._ring_m[self._pos], self._ring_u[self._pos] = x, m, u
+        self._pos = (self._pos + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+        self._last_price = np.where(valid, row, self._last_price)
+        self._underwater_now = u.astype(bool)
+        self.last_date = date
+
+    def _add_terms(self, x, m, u, sign):
+        # 한 행의 기여분을 롤링 합계에 더하거나(sign=1) 뺌(sign=-1)
+        self._P += sign * np.outer(x, x)
+        self._A += sign * np.outer(x, m)
+        self._Q += sign * np.outer(x * x, m)
+        self._N += sign * np.outer(m, m)
+        self._C_window += sign * np.outer(u, u)
+
+    def _row_terms(self, r):
+        # 보관 중인 가격으로 r 번째 행의 (수익률, 유효 마스크, 하락 구간 여부)를 rebuild 와 같은 방식으로 다시 계산
+        v, before = self._values[r], self._values[:r]
+        valid = ~np.isnan(before)
+        prev = np.full(len(v), np.nan)
+        if r:
+            last = r - 1 - valid[::-1].argmax(axis=0)
+            prev = np.where(valid.any(axis=0), before[last, np.arange(len(v))], np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = np.log(v) - np.log(prev)
+            peak = np.fmax.reduce(self._values[:r + 1], axis=0)
+            u = (~np.isnan(v) & ((v / peak - 1.0) * 100 <= self.threshold)).astype(float)
+        m = (~np.isnan(ret)).astype(float)
+        return np.nan_to_num(ret), m, u
+
+    # --------------------------------------------------------
+    # 조회 창 시작이 밀림 (오늘 - N년): 앞쪽 d 개 행 제거
+    # --------------------------------------------------------
+    def drop_front(self, d) -> bool:
+        # 롤링 합계(최근 window 행)는 그대로이고, 전체 기간 동반 하락 합계에서 빠지는 행만 뺌.
+        # 빠진 구간의 고점 때문에 하락 구간 여부가 바뀌는 행(새 창의 누적 고점이 그 고점에 도달하기 전)만 다시 반영.
+        # 링버퍼가 창 앞쪽까지 닿아 수익률이 바뀌는 경우(짧은 기간)는 False -> 재구성
+        head, values = self._values[:d], self._values[d:]
+        n = len(values)
+        dropped_peak = np.fmax.reduce(head, axis=0)
+        lost = ~np.isnan(dropped_peak)
+        valid = ~np.isnan(values)
+        first = np.where(valid.any(axis=0), valid.argmax(axis=0), n)
+        if n < self._count or (lost & (first >= n - self._count) & (first < n)).any():
+            return False
+
+        _, head_dd = drawdown_values(head)
+        u_head = (head_dd <= self.threshold).astype(float)
+        self._C_total -= u_head.T @ u_head
+
+        hit = values >= dropped_peak
+        e = np.where(lost, np.where(hit.any(axis=0), hit.argmax(axis=0), n), 0)
+        end = int(e.max()) if len(e) else 0
+        if end:
+            # 고점이 빠진 티커 열만 다시 계산하고, 하락 구간 여부가 실제로 바뀐 행만 합계에 반영
+            cols = np.flatnonzero(e > 0)
+            seg = values[:end, cols]
+            new_peak = np.fmax.accumulate(seg, axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                flip_old = (seg / np.fmax(new_peak, dropped_peak[cols]) - 1.0) * 100 <= self.threshold
+                flip_new = (seg / new_peak - 1.0) * 100 <= self.threshold
+            rows = np.flatnonzero((flip_old != flip_new).any(axis=1))
+            u_old = self._under_rows(values, rows, dropped_peak)
+            u_new = u_old.copy()
+            u_new[:, cols] = flip_new[rows]
+            self._C_total += u_new.T @ u_new - u_old.T @ u_old
+            # 바뀐 행 중 롤링 창(최근 count 행)에 있는 행은 링버퍼 / 롤링 합계도 교체
+            for i in np.flatnonzero(rows >= n - self._count):
+                slot = (self._pos - (n - rows[i])) % self.window
+                self._C_window += np.outer(u_new[i], u_new[i]) - np.outer(u_old[i], u_old[i])
+                self._ring_u[slot] = u_new[i]
+            if len(rows) and rows[-1] == n - 1:
+                self._underwater_now = u_new[-1].astype(bool)
+            self._peak[cols] = np.where(e[cols] == n, new_peak[-1], self._peak[cols])
+
+        has = valid.any(axis=0)
+        self._peak = np.where(has, self._peak, np.nan)
+        self._last_price = np.where(has, self._last_price, np.nan)
+        self._index = self._index[d:]
+        self._values = values
+        self.first_date = self._index[0]
+        return True
+
+    def _under_rows(self, values, rows, dropped_peak):
+        # 창이 밀리기 전 기준(빠진 구간 고점 포함)의 하락 구간 여부. rows: 오름차순 행 번호
+        if not len(rows):
+            return np.empty((0, values.shape[1]))
+        peak = np.fmax(np.fmax.accumulate(values[:rows[-1] + 1], axis=0)[rows], dropped_peak)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ((values[rows] / peak - 1.0) * 100 <= self.threshold).astype(float)
+
+    # --------------------------------------------------------
+    # 마지막 거래일 수정 (장중 새로고침): 마지막 행 기여분만 되돌린 뒤 다시 반영
+    # --------------------------------------------------------
+    def drop_last(self):
+        n = len(self._values)
+        last = (self._pos - 1) % self.window
+        lu = self._ring_u[last]
+        self._add_terms(self._ring_x[last], self._ring_m[last], lu, -1.0)
+        self._C_total -= np.outer(lu, lu)
+        self._pos = last
+        if n > self.window:
+            # 마지막 행이 들어오며 롤링 창에서 밀려난 행을 되살림
+            x, m, u = self._row_terms(n - 1 - self.window)
+            self._add_terms(x, m, u, 1.0)
+            self._ring_x[last], self._ring_m[last], self._ring_u[last] = x, m, u
+        else:
+            self._count -= 1
+
+        v, prev_values = self._values[-1], self._values[:-1]
+        valid = ~np.isnan(v)
+        peak, last_price = self._peak.copy(), self._last_price.copy()
+        for j in np.flatnonzero(valid):
+            prev = np.flatnonzero(~np.isnan(prev_values[:, j]))
+            last_price[j] = prev_values[prev[-1], j] if len(prev) else np.nan
+            if v[j] >= peak[j]:
+                peak[j] = np.fmax.reduce(prev_values[:, j])
+        self._peak, self._last_price = peak, last_price
+        self._underwater_now = self._ring_u[(self._pos - 1) % self.window].astype(bool)
+        self._index = self._index[:-1]
+        self._values = prev_values
+        self.last_date = self._index[-1]
+
+    def sync(self, prices: pd.DataFrame):
+        # 보관 중인 창과 겹치는 구간이 그대로면 증분 반영, 과거 데이터가 바뀌었으면 재구성
+        #   - 창 시작이 밀림 (오늘 - N년) : drop_front
+        #   - 마지막 거래일 값이 바뀜      : drop_last 후 다시 반영
+        #   - 새 거래일                    : 행마다 rank-1 갱신
+        prices = prices.reindex(columns=self.tickers)
+        with self.lock:
+            if (self.last_date is None or not len(prices) or self.last_date not in prices.index
+                    or prices.index[0] < self.first_date or prices.index[0] not in self._index):
+                self.rebuild(prices)
+                return
+            d = self._index.get_loc(prices.index[0])
+            end = prices.index.get_loc(self.last_date)
+            first_row = prices.iloc[0].to_numpy(dtype=float)
+            old_row = prices.iloc[end].to_numpy(dtype=float)
+            revised = not np.array_equal(old_row, self._values[-1], equal_nan=True)
+            new_rows = prices.iloc[end if revised else end + 1:]
+            if (end != len(self._index) - 1 - d or not np.array_equal(first_row, self._values[d], equal_nan=True)
+                    or d > self.window or len(new_rows) > self.window or (revised and end == 0)):
+                self.rebuild(prices)
+                return
+            if d:
+                if not self.drop_front(d):
+                    self.rebuild(prices)
+                    return
+                self.stats["slides"] += 1
+            if revised:
+                self.drop_last()
+                self.stats["revisions"] += 1
+            if len(new_rows):
+                values = new_rows.to_numpy(dtype=float)
+                for date, row in zip(new_rows.index, values):
+                    self._apply(date, row)
+                self._index = self._index.append(new_rows.index)
+                self._values = np.vstack([self._values, values])
+                self.stats["appends"] += 1
+
+    # --------------------------------------------------------
+    # 조회
+    # --------------------------------------------------------
+    def correlation(self, min_obs=MIN_CORR_OBS) -> pd.DataFrame:
+        corr = correlation_from_sums(self._P, self._A, self._Q, self._N, min_obs)
+        return pd.DataFrame(corr, index=self.tickers, columns=self.tickers)
+
+    def cooccurrence(self, full_history=True) -> pd.DataFrame:
+        # 행 자산이 하락 구간일 때 열 자산도 하락 구간이었던 비율: P(열 하락 | 행 하락)
+        C = self._C_total if full_history else self._C_window
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cond = C / np.diag(C)[:, None]
+        return pd.DataFrame(cond, index=self.tickers, columns=self.tickers)
+
+    def underwater_now(self) -> pd.Series:
+        return pd.Series(self._underwater_now, index=self.tickers)
+
+
+class CoMovementRegistry:
+    # (티커 목록, 윈도우, 기준선, 조회 기간) 별로 상태를 보관해 세션/재실행 간 재사용
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, prices: pd.DataFrame, window, threshold, key_extra=None) -> CoMovementState:
+        key = (tuple(prices.columns), int(window), float(threshold), key_extra)
+        with self._lock:
+            state = self._states.pop(key, None)
+            if state is None:
+                state = CoMovementState(prices.columns, window, threshold)
+            self._states[key] = state
+            while len(self._states) > self.max_entries:
+                self._states.popitem(last=False)
+        state.sync(prices)
+        return state
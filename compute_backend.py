@@ -0,0 +1,164 @@
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from drawdown import drawdown_values
+from indicators import rolling_zscore
+
+# ============================================================
+# 열 단위 연산 백엔드 (RAI 피처 z-score / 백테스트 하락률 두 커널만)
+# ============================================================
+# 백엔드로 바꿀 수 있는 것은 (날짜 x 컬럼) DataFrame 을 받아 같은 모양을 돌려주는 두 커널뿐입니다.
+#   rolling_zscore : rai_model.rai_features 의 252일 z-score
+#   drawdown       : backtest.py 의 포트폴리오 하락률
+# RAI 피처 자체(수익률, 실현 변동성, 추세 괴리, ADX)와 백테스트 성과/롤링/꼬리 위험 지표는 백엔드와 무관하게
+# indicators.py / backtest.py 의 numpy 커널로 계산합니다.
+#   numpy  : 기본값이자 권장값. indicators.py / drawdown.py 의 기존 커널 그대로
+#   polars : 지연 실행(LazyFrame) - 컬럼별 식을 한 쿼리로 묶어 실행 (pip install polars 필요)
+#   arrow  : pyarrow.compute - 컬럼별 커널을 스레드 풀에서 병렬 실행 (pyarrow 는 streamlit 의존성으로 이미 설치됨)
+# numpy 커널이 이미 2차원 배열을 한 번에 처리하므로 다른 엔진으로 바꿔도 빨라지지 않습니다 (DataFrame 변환 비용이 더 큼).
+#   500 티커 x 30년 측정 예: z-score  numpy 583 ms / polars 565 ms / arrow 972 ms
+#                            하락률   numpy  40 ms / polars 236 ms / arrow 224 ms
+# polars / arrow 는 결과 일치 검증(tests/test_compute_backend.py)과 환경별 비교(bench_backend.py)를 위해 유지합니다.
+# 선택: 환경 변수 MDD_COMPUTE_BACKEND (기본 numpy). 라이브러리가 없으면 경고 후 numpy 로 대체합니다.
+BACKEND_ENV = "MDD_COMPUTE_BACKEND"
+DEFAULT_BACKEND = "numpy"
+
+
+class NumpyBackend:
+    name = "numpy"
+
+    def rolling_zscore(self, frame: pd.DataFrame, window) -> pd.DataFrame:
+        # (x - 이동평균) / 이동표준편차 (ddof=0). 구간에 NaN 이 있으면 NaN
+        return pd.DataFrame(rolling_zscore(frame.to_numpy(dtype=float), window), index=frame.index, columns=frame.columns)
+
+    def drawdown(self, frame: pd.DataFrame) -> pd.DataFrame:
+        # 누적 고점 대비 하락률 (%). 결측은 결측 그대로
+        _, dd = drawdown_values(frame.to_numpy(dtype=float))
+        return pd.DataFrame(dd, index=frame.index, columns=frame.columns)
+
+
+class PolarsBackend:
+    name = "polars"
+
+    def __init__(self):
+        import polars
+        self.pl = polars
+
+    def _run(self, frame, expr):
+        # 컬럼 이름은 문자열로 바꿔 실행하고 원래 인덱스/컬럼으로 복원 (NaN 은 null 로 읽혀 pandas 와 같은 결측 규칙)
+        pl = self.pl
+        names = [str(c) for c in frame.columns]
+        data = pl.from_numpy(frame.to_numpy(dtype=float), schema=names, orient="row").fill_nan(None)
+        out = data.lazy().select([expr(pl.col(c)).alias(c) for c in names]).collect()
+        return pd.DataFrame(out.to_numpy().astype(float), index=frame.index, columns=frame.columns)
+
+    def rolling_zscore(self, frame: pd.DataFrame, window) -> pd.DataFrame:
+        return self._run(frame, lambda c: (c - c.rolling_mean(window)) / c.rolling_std(window, ddof=0))
+
+    def drawdown(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return self._run(frame, lambda c: (c / c.cum_max() - 1.0) * 100)
+
+
+class ArrowBackend:
+    name = "arrow"
+
+    def __init__(self, max_workers=None):
+        import pyarrow
+        import pyarrow.compute
+        self.pa = pyarrow
+        self.pc = pyarrow.compute
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+
+    def _map(self, frame, kernel):
+        # 컬럼별 커널을 스레드 풀에서 실행 (pyarrow.compute 는 GIL 을 풀고 실행)
+        pa = self.pa
+        columns = [pa.array(frame.iloc[:, j].to_numpy(dtype=float), from_pandas=True) for j in range(frame.shape[1])]
+        with ThreadPoolExecutor(self.max_workers) as pool:
+            results = list(pool.map(kernel, columns))
+        values = np.column_stack([r.to_numpy(zero_copy_only=False) for r in results]) if results else np.empty((len(frame), 0))
+        return pd.DataFrame(values.astype(float), index=frame.index, columns=frame.columns)
+
+    def _take(self, values, positions):
+        return self.pc.take(values, self.pa.array(positions))
+
+    def _segment(self, sums, anchor, lo, hi, window):
+        # [lo, hi] 구간의 (개수, 평균, M2). sums: 블록 기준값 대비 편차의 (개수, 합, 제곱합) 누적 (앞에 0 추가)
+        pc = self.pc
+        c0, c1, c2 = (pc.subtract(self._take(c, hi + 1), self._take(c, lo)) for c in sums)
+        mean_dev = pc.if_else(pc.greater(c0, 0.0), pc.divide(c1, pc.max_element_wise(c0, 1.0)), 0.0)
+        m2 = pc.max_element_wise(pc.subtract(c2, pc.multiply(c1, mean_dev)), 0.0)
+        return c0, pc.add(self._take(anchor, lo // window), mean_dev), m2
+
+    def rolling_zscore(self, frame: pd.DataFrame, window) -> pd.DataFrame:
+        # numpy 커널(indicators.rolling_moments)과 같은 계산: window 크기 블록마다 블록 평균 대비 편차로 누적하고,
+        # 각 구간을 "시작 블록의 suffix + 끝 블록의 prefix" 로 나눠 Chan 결합 (수준이 큰 시계열도 자릿수 손실 없음)
+        pa, pc = self.pa, self.pc
+        w = max(int(window), 1)
+        n = len(frame)
+        if n < w:
+            return self._map(frame, lambda x: pa.nulls(len(x), pa.float64()))
+        starts = np.arange(0, n, w)
+        ends = np.minimum(starts + w, n) - 1
+        lo = np.arange(n - w + 1)
+        hi = lo + w - 1
+        mid = np.minimum((lo // w) * w + w - 1, hi)     # 시작 블록의 마지막 행 (구간이 블록에 딱 맞으면 hi)
+        block_of_row = np.arange(n) // w
+        zero = pa.array([0.0])
+
+        def kernel(x):
+            valid = pc.cast(pc.is_valid(x), pa.float64())
+            # 블록 기준값: 블록 내 유효값 평균 (기준값 정밀도는 결과에 영향 없음)
+            cv = pa.concat_arrays([zero, pc.cumulative_sum(valid)])
+            cx = pa.concat_arrays([zero, pc.cumulative_sum(pc.fill_null(x, 0.0))])
+            b_cnt = pc.subtract(self._take(cv, ends + 1), self._take(cv, starts))
+            b_sum = pc.subtract(self._take(cx, ends + 1), self._take(cx, starts))
+            anchor = pc.if_else(pc.greater(b_cnt, 0.0), pc.divide(b_sum, pc.max_element_wise(b_cnt, 1.0)), 0.0)
+            d = pc.fill_null(pc.subtract(x, self._take(anchor, block_of_row)), 0.0)
+            sums = (cv, pa.concat_arrays([zero, pc.cumulative_sum(d)]), pa.concat_arrays([zero, pc.cumulative_sum(pc.multiply(d, d))]))
+
+            a_cnt, a_mean, a_m2 = self._segment(sums, anchor, lo, mid, w)
+            b_cnt, b_mean, b_m2 = self._segment(sums, anchor, np.minimum(mid + 1, hi), hi, w)
+            # 끝 블록 부분이 비어 있으면(mid == hi) 시작 블록 부분만 사용
+            has_b = pa.array(mid < hi)
+            b_cnt = pc.if_else(has_b, b_cnt, 0.0)
+            tot = pc.add(a_cnt, b_cnt)
+            delta = pc.if_else(has_b, pc.subtract(b_mean, a_mean), 0.0)
+            frac = pc.divide(b_cnt, pc.max_element_wise(tot, 1.0))
+            mean = pc.add(a_mean, pc.multiply(delta, frac))
+            m2 = pc.add(pc.add(a_m2, pc.if_else(has_b, b_m2, 0.0)), pc.multiply(pc.multiply(delta, delta), pc.multiply(a_cnt, frac)))
+            std = pc.sqrt(pc.divide(m2, float(w)))
+            z = pc.divide(pc.subtract(x.slice(w - 1), mean), std)
+            # 구간에 결측이 있으면 null (pandas rolling(window) 와 동일)
+            z = pc.if_else(pc.equal(tot, float(w)), z, pa.scalar(None, pa.float64()))
+            return pa.concat_arrays([pa.nulls(w - 1, pa.float64()), z])
+
+        return self._map(frame, kernel)
+
+    def drawdown(self, frame: pd.DataFrame) -> pd.DataFrame:
+        pc = self.pc
+        return self._map(frame, lambda x: pc.multiply(pc.subtract(pc.divide(x, pc.cumulative_max(x, skip_nulls=True)), 1.0), 100.0))
+
+
+BACKENDS = {"numpy": NumpyBackend, "polars": PolarsBackend, "arrow": ArrowBackend}
+_backends = {}
+
+
+def get_backend(name=None):
+    # name(기본: MDD_COMPUTE_BACKEND 또는 numpy) 백엔드. 설치되지 않았거나 모르는 이름이면 경고 후 numpy
+    name = (name or os.environ.get(BACKEND_ENV) or DEFAULT_BACKEND).strip().lower()
+    backend = _backends.get(name)
+    if backend is None:
+        try:
+            backend = BACKENDS[name]()
+        except KeyError:
+            warnings.warn(f"알 수 없는 연산 백엔드 '{name}' - numpy 사용 (지원: {', '.join(BACKENDS)})")
+            backend = NumpyBackend()
+        except ImportError as e:
+            warnings.warn(f"연산 백엔드 '{name}' 를 사용할 수 없어 numpy 사용: {e}")
+            backend = NumpyBackend()
+        _backends[name] = backend
+    return backend
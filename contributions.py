@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 적립 일정 (매일 / 매주 / 매월 / 급여일 / 일시금 / 사용자 현금흐름 파일)
+# ============================================================
+# 일정(spec)은 dict 하나이며, 백테스트 달력에 맞춰 날짜별 적립금 벡터로 한 번 컴파일합니다.
+# 이후 시뮬레이션/지표 계산(backtest.py)은 이 벡터만 사용하므로 일정 종류와 무관하게 같은 행렬 연산으로 처리됩니다.
+#   {"kind": "daily",   "amount": 80}
+#   {"kind": "weekly",  "amount": 400, "weekday": 0, "every": 1}     weekday: 0=월 ~ 4=금, every=2 면 격주
+#   {"kind": "monthly", "amount": 1700, "days": (1,), "every": 1}    days: 매월 적립일 (31 이면 말일), every=3 이면 분기
+#   {"kind": "lump",    "amount": 10000, "dates": ["2024-01-02"]}    일시금 (dates 가 없으면 달력 첫날)
+#   {"kind": "flows",   "flows": pd.Series}                          날짜 -> 금액 (사용자 현금흐름 파일)
+# 적립일이 휴장일이면 다음 거래일에 적립합니다. 주/월 적립일은 start(기본: 달력 첫날) 이후만 사용하고,
+# 일시금/파일의 달력 시작 전 현금흐름은 첫날에 적립, 마지막 날 이후는 버립니다.
+# 여러 일정을 합치려면 spec 리스트를 넘깁니다 (예: 매월 적립 + 연초 보너스 일시금).
+SCHEDULE_KINDS = ("daily", "weekly", "monthly", "lump", "flows")
+WEEKDAYS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+
+
+def _on_or_after(index: pd.DatetimeIndex, dates, amounts) -> np.ndarray:
+    # 날짜별 금액 -> 달력 위치별 합계 (다음 거래일로 이동, 같은 날로 모이면 합산)
+    pos = index.searchsorted(pd.DatetimeIndex(dates), side="left")
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=float), pos.shape)
+    return np.bincount(pos, weights=amounts, minlength=len(index) + 1)[:len(index)]
+
+
+def _weekly_dates(start, end, weekday=0, every=1):
+    return pd.date_range(start - pd.Timedelta(days=6), end, freq=f"W-{WEEKDAYS[weekday]}")[::every]
+
+
+def _monthly_dates(start, end, days=(1,), every=1):
+    months = pd.period_range(start, end, freq="M")[::every]
+    first = months.start_time
+    dates = [first + pd.to_timedelta(np.minimum(day, months.days_in_month) - 1, unit="D") for day in days]
+    return pd.DatetimeIndex(np.concatenate([d.to_numpy() for d in dates])) if dates else pd.DatetimeIndex([])
+
+
+def compile_schedule(spec, index: pd.DatetimeIndex, start=None) -> np.ndarray:
+    # spec(또는 spec 리스트) -> 달력(index) 길이의 날짜별 적립금 벡터
+    # start: 백테스트 시작일 (시작일이 휴장일이어도 그날의 적립이 다음 거래일로 들어가도록)
+    if isinstance(spec, (list, tuple)):
+        return sum((compile_schedule(s, index, start) for s in spec), np.zeros(len(index)))
+    if len(index) == 0:
+        return np.zeros(0)
+    start = index[0] if start is None else min(pd.Timestamp(start), index[0])
+    kind = spec["kind"]
+    if kind == "daily":
+        return np.full(len(index), float(spec["amount"]))
+    if kind == "weekly":
+        dates = _weekly_dates(start, index[-1], spec.get("weekday", 0), spec.get("every", 1))
+        dates = dates[dates >= start]
+        return _on_or_after(index, dates, spec["amount"])
+    if kind == "monthly":
+        dates = _monthly_dates(start, index[-1], spec.get("days", (1,)), spec.get("every", 1))
+        dates = dates[dates >= start]
+        return _on_or_after(index, dates, spec["amount"])
+    if kind == "lump":
+        dates = spec.get("dates") or [index[0]]
+        return _on_or_after(index, pd.to_datetime(dates), spec["amount"])
+    if kind == "flows":
+        flows = spec["flows"]
+        return _on_or_after(index, pd.DatetimeIndex(flows.index), flows.to_numpy(dtype=float))
+    raise ValueError(f"알 수 없는 적립 일정: {kind} (지원: {', '.join(SCHEDULE_KINDS)})")
+
+
+def compile_schedules(specs: dict, index: pd.DatetimeIndex, start=None) -> pd.DataFrame:
+    # {이름: spec} -> (날짜 x 일정) 적립금 표. 여러 일정 변형을 한 번에 비교할 때 사용
+    return pd.DataFrame({name: compile_schedule(spec, index, start) for name, spec in specs.items()}, index=index)
+
+
+def read_cashflow_file(file) -> dict:
+    # CSV (date, amount) -> flows 일정. 같은 날짜는 합산, 음수(인출)는 지원하지 않음
+    df = pd.read_csv(file, comment="#", skipinitialspace=True)
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if not {"date", "amount"} <= set(df.columns):
+        raise ValueError("현금흐름 파일에는 'date', 'amount' 컬럼이 필요합니다.")
+    dates = pd.to_datetime(df["date"], errors="coerce")
+    amounts = pd.to_numeric(df["amount"], errors="coerce")
+    bad = dates.isna() | amounts.isna()
+    if bad.any():
+        raise ValueError(f"날짜/금액을 읽을 수 없는 행: {', '.join(str(i + 2) for i in np.flatnonzero(bad)[:5])}")
+    if (amounts < 0).any():
+        raise ValueError("음수 금액(인출)은 지원하지 않습니다.")
+    return {"kind": "flows", "flows": amounts.groupby(dates.to_numpy()).sum().sort_index()}
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 가격 데이터 품질 검증 (다운로드 직후, 분석 전 단계)
+# ============================================================
+# 검사 항목별로 (날짜 x 티커) 종가 패널 전체를 한 번의 벡터 연산으로 훑습니다.
+#   nonpositive : 0 이하 종가
+#   spike       : 하루만 크게 튀었다가 다음 관측에서 되돌아온 가격 (잘못된 체결/표기)
+#   split       : 다음 날에도 유지되는 분할/병합 비율(1/2, 1/3, 10배 ...) 점프 (수정주가 미반영)
+#   stale       : 같은 가격이 STALE_MIN_RUN 회 이상 연속 (갱신 중단된 시세)
+#   gap         : 관측 간격이 MAX_GAP_DAYS(달력일) 초과
+#   dead_feed   : 마지막 관측이 패널 마지막 날짜보다 DEAD_FEED_DAYS 이상 오래됨
+# 규칙(action): "repair" 수정 (nonpositive/spike 는 결측 처리, split 은 이전 구간을 비율만큼 소급 조정)
+#              "report" 보고만, "quarantine" 해당 티커 전체를 결측 처리해 분석에서 제외, "ignore" 무시
+# split 은 기본값이 "report" 입니다. 수집 데이터(auto_adjust=True)는 이미 분할이 반영되어 있어, 1/2·1/3 근처의
+# 실제 하루 급락(코인, 소형주)을 소급 조정하면 진짜 하락이 MDD 에서 사라지기 때문입니다.
+# 수정주가가 아닌 원본을 검증할 때만 rules={"split": "repair"} 로 지정합니다.
+# 티커별 관측 이력 해시를 검사 결과와 함께 보관하므로, 이력이 그대로인 티커는 다시 검사하지 않습니다.
+QUALITY_RULES = {
+    "nonpositive": "repair",
+    "spike": "repair",
+    "split": "report",
+    "stale": "report",
+    "gap": "report",
+    "dead_feed": "quarantine",
+}
+REPAIRABLE = ("nonpositive", "spike", "split")
+
+STALE_MIN_RUN = 5               # 같은 가격 연속 관측 횟수
+SPIKE_MIN_MOVE = np.log(1.5)    # 튐 판정 최소 일간 변동 (로그 수익률)
+SPIKE_REVERT_TOL = 0.03         # 다음 관측에서 되돌아온 정도 허용 오차 (로그 수익률)
+SPLIT_RATIOS = (2, 3, 4, 5, 8, 10, 15, 20, 25, 50, 100)
+SPLIT_TOL = 0.03                # 분할 비율과의 허용 오차
+MAX_GAP_DAYS = 7
+DEAD_FEED_DAYS = 10
+
+REPORT_COLUMNS = [
+    "first", "last", "observed", "nonpositive", "spike", "split", "stale", "max_stale_run",
+    "gap", "max_gap_days", "last_age_days", "status", "issues",
+]
+
+
+def _fill_index(observed: np.ndarray, forward=True) -> np.ndarray:
+    # 각 행에서 (이전/이후) 가장 가까운 관측 행 번호, 없으면 -1 / n
+    n = observed.shape[0]
+    rows = np.arange(n)[:, None]
+    if forward:
+        return np.maximum.accumulate(np.where(observed, rows, -1), axis=0)
+    return np.minimum.accumulate(np.where(observed, rows, n)[::-1], axis=0)[::-1]
+
+
+def _neighbor(values: np.ndarray, observed: np.ndarray, forward=True) -> np.ndarray:
+    # 직전(forward=True) / 다음 관측값 (자기 자신 제외)
+    n, k = values.shape
+    idx = _fill_index(observed, forward)
+    if forward:
+        idx = np.vstack([np.full((1, k), -1), idx[:-1]])
+        ok = idx >= 0
+    else:
+        idx = np.vstack([idx[1:], np.full((1, k), n)])
+        ok = idx < n
+    return np.where(ok, np.take_along_axis(values, np.clip(idx, 0, n - 1), axis=0), np.nan)
+
+
+def column_hash(dates: np.ndarray, values: np.ndarray) -> str:
+    # 관측된 (날짜, 가격) 쌍만으로 계산 -> 다른 티커가 추가되어 달력이 바뀌어도 같은 이력이면 같은 해시
+    observed = ~np.isnan(values)
+    h = hashlib.sha256(dates[observed].tobytes())
+    h.update(np.ascontiguousarray(values[observed]).tobytes())
+    return h.hexdigest()
+
+
+def scan_prices(close: pd.DataFrame) -> dict:
+    # 반환: {티커: {"hash", 관측 범위, "counts": 검사별 건수, "repairs": 수정 후보}}
+    values = close.to_numpy(dtype=float)
+    n, k = values.shape
+    dates = close.index.to_numpy(dtype="datetime64[ns]")
+    rows = np.arange(n)[:, None]
+    observed = ~np.isnan(values)
+
+    # 1) 0 이하 종가 -> 이후 검사에서는 결측으로 취급
+    with np.errstate(invalid="ignore"):
+        nonpositive = observed & (values <= 0)
+    observed &= ~nonpositive
+    values = np.where(observed, values, np.nan)
+
+    # 2) 직전/다음 관측 대비 로그 수익률로 튐/분할 판정 (다음 관측이 없는 마지막 행은 판정 보류)
+    prev = _neighbor(values, observed, forward=True)
+    nxt = _neighbor(values, observed, forward=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        move = np.log(values / prev)
+        move_next = np.log(nxt / values)
+        jump = observed & (np.abs(move) >= SPIKE_MIN_MOVE) & ~np.isnan(move_next)
+        spike = jump & (np.abs(move + move_next) <= SPIKE_REVERT_TOL)
+    # 튄 가격 다음 관측(되돌아오는 움직임)은 분할로 보지 않음
+    prev_idx = np.vstack([np.full((1, k), -1), _fill_index(observed)[:-1]])
+    after_spike = (prev_idx >= 0) & np.take_along_axis(spike, np.maximum(prev_idx, 0), axis=0)
+    # 분할 비율 대조는 큰 점프가 있는 칸에서만 (전체 대비 극소수)
+    ratios = np.array([1 / r for r in SPLIT_RATIOS] + list(SPLIT_RATIOS), dtype=float)
+    ji, jj = np.nonzero(jump & ~spike & ~after_spike)
+    err = np.abs(np.exp(move[ji, jj])[:, None] / ratios - 1)
+    best = err.argmin(axis=1) if len(ji) else np.zeros(0, dtype=int)
+    hit = err[np.arange(len(ji)), best] <= SPLIT_TOL
+    split = np.zeros_like(jump)
+    split[ji[hit], jj[hit]] = True
+    split_factor = np.ones(values.shape)
+    split_factor[ji[hit], jj[hit]] = ratios[best[hit]]
+
+    # 3) 같은 가격 연속: 직전 관측과 같으면 이어지고, 다르면 끊기는 연속 길이 (자기 자신 포함)
+    same = observed & (values == prev)
+    count = np.cumsum(same, axis=0)
+    base = np.maximum.accumulate(np.where(observed & ~same, count, 0), axis=0)
+    run = np.where(observed, count - base + 1, 0)
+    stale = run >= STALE_MIN_RUN
+
+    # 4) 관측 간격 (달력일). 마지막 관측 경과일(dead_feed)은 전체 패널 기준이라 judge 에서 판정
+    day = dates.astype("datetime64[D]").astype(np.int64)[:, None]
+    gap_days = np.where(observed & (prev_idx >= 0), day - day[np.maximum(prev_idx, 0), 0], 0)
+    gap = gap_days > MAX_GAP_DAYS
+    last_idx = np.where(observed, rows, -1).max(axis=0, initial=-1)
+    first_idx = np.where(observed.any(axis=0), observed.argmax(axis=0), -1)
+
+    records = {}
+    for j, ticker in enumerate(close.columns):
+        found = {"nonpositive": nonpositive[:, j], "spike": spike[:, j], "split": split[:, j]}
+        records[str(ticker)] = {
+            "hash": column_hash(dates, close.iloc[:, j].to_numpy(dtype=float)),
+            "first": str(pd.Timestamp(dates[first_idx[j]]).date()) if first_idx[j] >= 0 else None,
+            "last": str(pd.Timestamp(dates[last_idx[j]]).date()) if last_idx[j] >= 0 else None,
+            "observed": int(observed[:, j].sum()),
+            "counts": {
+                "nonpositive": int(nonpositive[:, j].sum()), "spike": int(spike[:, j].sum()), "split": int(split[:, j].sum()),
+                "stale": int(stale[:, j].sum()), "gap": int(gap[:, j].sum()),
+            },
+            "max_stale_run": int(run[:, j].max(initial=0)),
+            "max_gap_days": int(gap_days[:, j].max(initial=0)),
+            # 수정 후보: [날짜, 검사, 분할 비율] (실제 적용 여부는 규칙에 따라 apply_quality 에서 결정)
+            "repairs": [
+                [str(pd.Timestamp(dates[i]).date()), check, float(split_factor[i, j]) if check == "split" else None]
+                for check in REPAIRABLE for i in np.flatnonzero(found[check])
+            ],
+        }
+    return records
+
+
+def quality_settings() -> dict:
+    # 저장된 검사 결과를 재사용해도 되는지 판단하는 기준 (임계값이 바뀌면 전체 재검사)
+    return {
+        "stale_min_run": STALE_MIN_RUN, "spike_min_move": float(SPIKE_MIN_MOVE), "spike_revert_tol": SPIKE_REVERT_TOL,
+        "split_ratios": list(SPLIT_RATIOS), "split_tol": SPLIT_TOL, "max_gap_days": MAX_GAP_DAYS,
+    }
+
+
+def validate_prices(close: pd.DataFrame, state=None, rules=None):
+    # state: 이전 검증 결과. 관측 이력 해시가 같은 티커는 검사 결과를 재사용하고, 바뀐 티커만 모아서 한 번에 검사
+    # 규칙 적용(판정)은 가벼우므로 매번 다시 수행 (dead_feed 는 패널 마지막 날짜에 따라 달라짐)
+    # 반환: (새 state, 새로 검사한 티커 수)
+    settings = quality_settings()
+    known = state["tickers"] if state and state.get("settings") == settings else {}
+    dates = close.index.to_numpy(dtype="datetime64[ns]")
+    changed = [
+        t for t in close.columns
+        if str(t) not in known or known[str(t)]["hash"] != column_hash(dates, close[t].to_numpy(dtype=float))
+    ]
+    records = dict(known)
+    if changed:
+        records.update(scan_prices(close[changed]))
+    records = {str(t): records[str(t)] for t in close.columns}
+
+    rules = {**QUALITY_RULES, **(rules or {})}
+    lasts = [pd.Timestamp(rec["last"]) for rec in records.values() if rec["last"]]
+    panel_last = max(lasts) if lasts else None
+    judged = {t: judge(rec, rules, panel_last) for t, rec in records.items()}
+    return {"settings": settings, "rules": rules, "tickers": records, "judged": judged}, len(changed)
+
+
+def judge(rec, rules, panel_last) -> dict:
+    # 검사 결과 + 규칙 -> 상태 (ok / warning / repaired / quarantined), 문제 요약, 격리 여부
+    if rec["last"] is None:
+        return {"status": "quarantined", "issues": "데이터 없음", "quarantined": True, "last_age_days": None}
+    last_age = int((panel_last - pd.Timestamp(rec["last"])).days)
+    counts = {**rec["counts"], "dead_feed": int(last_age > DEAD_FEED_DAYS)}
+    found = [check for check, c in counts.items() if c > 0 and rules.get(check, "ignore") != "ignore"]
+    quarantined = any(rules[check] == "quarantine" for check in found)
+    repaired = any(rules[check] == "repair" for check in found if check in REPAIRABLE)
+    return {
+        "status": "quarantined" if quarantined else "repaired" if repaired else "warning" if found else "ok",
+        "issues": ", ".join(f"{check} {counts[check]}" for check in found),
+        "quarantined": quarantined,
+        "last_age_days": last_age,
+    }
+
+
+def apply_quality(frame: pd.DataFrame, state) -> pd.DataFrame:
+    # 검증 결과의 수정/격리를 (종가/고가/저가 등) 같은 모양의 패널에 적용한 복사본
+    rules = state["rules"]
+    out = frame.copy()
+    index = out.index.normalize()
+    for ticker in out.columns:
+        rec, verdict = state["tickers"].get(str(ticker)), state["judged"].get(str(ticker))
+        if rec is None:
+            continue
+        if verdict["quarantined"]:
+            out[ticker] = np.nan
+            continue
+        repairs = [r for r in rec["repairs"] if rules.get(r[1]) == "repair"]
+        if not repairs:
+            continue
+        col = out[ticker].to_numpy(dtype=float, copy=True)
+        for date, check, factor in repairs:
+            i = index.searchsorted(pd.Timestamp(date))
+            if i >= len(index) or index[i] != pd.Timestamp(date):
+                continue
+            if check == "split":
+                col[:i] *= factor
+            else:
+                col[i] = np.nan
+        out[ticker] = col
+    return out
+
+
+def quality_report(state) -> pd.DataFrame:
+    rows = []
+    for ticker, rec in (state["tickers"] if state else {}).items():
+        verdict = state["judged"][ticker]
+        rows.append({
+            "ticker": ticker, "first": rec["first"], "last": rec["last"], "observed": rec["observed"], **rec["counts"],
+            "max_stale_run": rec["max_stale_run"], "max_gap_days": rec["max_gap_days"],
+            "last_age_days": verdict["last_age_days"], "status": verdict["status"], "issues": verdict["issues"],
+        })
+    return pd.DataFrame(rows, columns=["ticker"] + REPORT_COLUMNS).set_index("ticker")
+
+
+def validate_frames(frames: dict, state=None, rules=None):
+    # 수집 단계 진입점: {"close": 종가, "high": ..., ...} 중 종가로 검사하고 모든 필드에 같은 수정/격리를 적용
+    # 반환: (수정된 frames, 새 state, 새로 검사한 티커 수)
+    state, scanned = validate_prices(frames["close"], state, rules)
+    return {name: apply_quality(df, state) for name, df in frames.items()}, state, scanned
+
+
+def quality_summary(state) -> str:
+    # 한 줄 요약 (문제 없으면 빈 문자열)
+    statuses = pd.Series([v["status"] for v in (state or {}).get("judged", {}).values()], dtype=object)
+    labels = {"repaired": "수정", "warning": "경고", "quarantined": "격리"}
+    parts = [f"{label} {int((statuses == status).sum())}" for status, label in labels.items() if (statuses == status).any()]
+    return f"데이터 품질: {' · '.join(parts)}" if parts else ""
+
+
+def load_quality(path):
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_quality(path, state):
+    # 임시 파일에 쓴 뒤 교체 (읽는 쪽이 쓰는 도중의 파일을 보지 않도록)
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
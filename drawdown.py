@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 공용 MDD(최대 낙폭) 분석 모듈 (app.py / main.py 공용)
+# ============================================================
+BUY_ZONE_DD = -20.0         # 🔴 물타기 구간 기준 (%)
+CORRECTION_ZONE_DD = -10.0  # 🟡 조정 구간 기준 (%)
+
+# 상태 단계: 2 = 물타기, 1 = 조정, 0 = 안정
+STATUS_BUY, STATUS_CORRECTION, STATUS_STABLE = 2, 1, 0
+
+SUMMARY_COLUMNS = ["price", "daily_return", "current_dd", "mdd", "last_peak", "ongoing_days", "status_level"]
+ROLLING_MDD_YEARS = {"1y": 1, "3y": 3, "5y": 5}
+
+
+def classify_status(current_dd, correction=CORRECTION_ZONE_DD, buy=BUY_ZONE_DD):
+    # 스칼라/배열 모두 지원 (NaN 은 안정 구간으로 처리). 기준선은 티커별 배열도 가능 (변동성 기준)
+    dd = np.asarray(current_dd, dtype=float)
+    level = np.select([dd <= buy, dd <= correction], [STATUS_BUY, STATUS_CORRECTION], STATUS_STABLE)
+    return int(level) if level.ndim == 0 else level
+
+
+def drawdown_values(prices: np.ndarray):
+    # (n_days, n_tickers) 가격 배열 -> (누적 고점, 하락률 %). 상장 전 NaN 은 그대로 유지
+    with np.errstate(divide="ignore", invalid="ignore"):
+        peak = np.fmax.accumulate(prices, axis=0)
+        dd = (prices / peak - 1.0) * 100
+    return peak, dd
+
+
+def drawdown_frame(close_prices: pd.DataFrame) -> pd.DataFrame:
+    _, dd = drawdown_values(close_prices.to_numpy(dtype=float))
+    return pd.DataFrame(dd, index=close_prices.index, columns=close_prices.columns)
+
+
+def drawdown_summary(close_prices: pd.DataFrame, years=None) -> pd.DataFrame:
+    # 전체 티커의 현재가/하락률/MDD/고점일/하락 지속일 + 최근 N년 MDD(mdd_1y 등)를 한 번의 벡터 연산으로 계산
+    years = ROLLING_MDD_YEARS if years is None else years
+    prices = close_prices.to_numpy(dtype=float)
+    n_days, n_tickers = prices.shape
+    peak, dd = drawdown_values(prices)
+
+    valid = ~np.isnan(prices)
+    rows = np.arange(n_days)[:, None]
+    cols = np.arange(n_tickers)
+
+    last_idx = np.where(valid, rows, -1).max(axis=0, initial=-1)
+    prev_idx = np.where(valid & (rows < last_idx), rows, -1).max(axis=0, initial=-1)
+    peak_idx = np.where(valid & (prices == peak), rows, -1).max(axis=0, initial=-1)
+    has_data = last_idx >= 0
+    if n_days == 0:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS + [f"mdd_{label}" for label in years], index=close_prices.columns[:0])
+
+    last = np.maximum(last_idx, 0)
+    price = prices[last, cols]
+    prev_price = np.where(prev_idx >= 0, prices[np.maximum(prev_idx, 0), cols], price)
+    current_dd = dd[last, cols]
+    mdd = np.where(valid, dd, np.inf).min(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily_return = (price / prev_price - 1) * 100
+
+    dates = close_prices.index.to_numpy()
+    last_peak = dates[np.maximum(peak_idx, 0)]
+    ongoing_days = ((dates[last] - last_peak) / np.timedelta64(1, "D")).astype(int)
+
+    summary = pd.DataFrame({
+        "price": price,
+        "daily_return": daily_return,
+        "current_dd": current_dd,
+        "mdd": mdd,
+        "last_peak": pd.DatetimeIndex(last_peak),
+        "ongoing_days": ongoing_days,
+        "status_level": classify_status(current_dd),
+    }, index=close_prices.columns)
+    trailing = trailing_mdd(close_prices, years)
+    for label in years:
+        summary[f"mdd_{label}"] = trailing.loc[label]
+    summary.index.name = "ticker"
+    return summary[has_data]
+
+
+# ============================================================
+# 롤링(이동 구간) MDD - 구간 길이와 무관한 O(n) 커널
+# ============================================================
+# 구간 집계 (최고가, 최저가, 구간 MDD) 는 결합 법칙이 성립하므로, 배열을 window 크기의 블록으로 나눈 뒤
+# 블록 내 누적(prefix)과 역누적(suffix) 집계를 한 번씩만 구하면 임의의 window 구간은
+# "앞 블록의 suffix + 뒷 블록의 prefix" 두 조각의 결합으로 바로 얻어집니다. (van Herk / Gil-Werman 방식)
+def rows_per_year(index: pd.DatetimeIndex) -> float:
+    # 달력(거래일만 / 주말 포함 등)에 따른 연간 행 수 추정
+    if len(index) < 2:
+        return 252.0
+    span_years = (index[-1] - index[0]).days / 365.25
+    return len(index) / span_years if span_years > 0 else 252.0
+
+
+def rolling_mdd_values(prices: np.ndarray, window: int, min_periods=None) -> np.ndarray:
+    # prices: (n_days, n_tickers), NaN 허용. 반환값: 각 시점의 직전 window 행 MDD (%)
+    prices = np.asarray(prices, dtype=float)
+    squeeze = prices.ndim == 1
+    if squeeze:
+        prices = prices[:, None]
+    n, k = prices.shape
+    w = max(int(window), 1)
+    min_periods = w if min_periods is None else max(int(min_periods), 1)
+
+    n_blocks = -(-n // w)
+    padded = np.full((n_blocks * w, k), np.nan)
+    padded[:n] = prices
+    blocks = padded.reshape(n_blocks, w, k)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # prefix: 블록 시작 ~ 현재 위치
+        pre_max = np.fmax.accumulate(blocks, axis=1)
+        pre_min = np.fmin.accumulate(blocks, axis=1)
+        pre_mdd = np.fmin.accumulate(blocks / pre_max - 1.0, axis=1)
+
+        # suffix: 현재 위치 ~ 블록 끝 (새로 추가되는 값이 가장 이른 시점이므로 이후 최저가 대비 낙폭)
+        rev = blocks[:, ::-1]
+        suf_max = np.fmax.accumulate(rev, axis=1)
+        suf_min = np.fmin.accumulate(rev, axis=1)
+        suf_mdd = np.fmin.accumulate(suf_min / rev - 1.0, axis=1)[:, ::-1]
+        suf_max = suf_max[:, ::-1]
+
+        pre_max, pre_min, pre_mdd = (a.reshape(-1, k)[:n] for a in (pre_max, pre_min, pre_mdd))
+        suf_max, suf_mdd = (a.reshape(-1, k)[:n] for a in (suf_max, suf_mdd))
+
+        t = np.arange(n)
+        start = np.maximum(t - w + 1, 0)
+        # 구간 시작이 블록 경계이면 prefix 하나로 구간 전체가 표현됨
+        single = (start % w == 0)[:, None]
+        cross = np.fmin(np.fmin(suf_mdd[start], pre_mdd), pre_min / suf_max[start] - 1.0)
+        out = np.where(single, pre_mdd, cross) * 100
+
+    valid_count = np.cumsum(~np.isnan(prices), axis=0)
+    in_window = valid_count - np.vstack([np.zeros((1, k)), valid_count])[start]
+    out[in_window < min_periods] = np.nan
+    return out[:, 0] if squeeze else out
+
+
+def rolling_mdd(close_prices: pd.DataFrame, years=None, min_periods=None) -> dict:
+    # years: {"1y": 1, ...} -> {"1y": DataFrame(MDD %), ...}
+    years = ROLLING_MDD_YEARS if years is None else years
+    values = close_prices.ffill().to_numpy(dtype=float)
+    per_year = rows_per_year(close_prices.index)
+    return {
+        label: pd.DataFrame(
+            rolling_mdd_values(values, int(round(y * per_year)), min_periods),
+            index=close_prices.index, columns=close_prices.columns,
+        )
+        for label, y in years.items()
+    }
+
+
+def trailing_mdd(close_prices: pd.DataFrame, years=None) -> pd.DataFrame:
+    # 마지막 시점 기준 최근 N년 MDD 만 필요할 때 (카드/요약표/백테스트 지표): 꼬리 구간만 계산
+    # 반환: index = 구간 라벨("1y" 등), columns = 티커. 이력이 구간보다 짧으면 NaN
+    years = ROLLING_MDD_YEARS if years is None else years
+    per_year = rows_per_year(close_prices.index)
+    values = close_prices.ffill().to_numpy(dtype=float)
+    out = {}
+    for label, y in years.items():
+        w = int(round(y * per_year))
+        tail = values[-w:] if 0 < w <= len(values) else values[:0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mdd = (tail / np.fmax.accumulate(tail, axis=0) - 1.0).min(axis=0, initial=np.inf) * 100
+        mdd[np.isinf(mdd)] = np.nan
+        out[label] = mdd
+    return pd.DataFrame(out, index=close_prices.columns).T
@@ -0,0 +1,321 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from drawdown import drawdown_values, classify_status, BUY_ZONE_DD, CORRECTION_ZONE_DD
+
+# ============================================================
+# 티커별 과거 하락률 분포 대비 현재 위치 (백분위) + 변동성 기준선
+# ============================================================
+# - 티커마다 지금까지의 일별 하락률을 정렬된 배열로 보관하고, 현재 하락률의 순위는 이진 탐색으로 구합니다.
+#   새 거래일은 정렬 위치에 끼워 넣기만 하므로 과거 분포를 다시 정렬하지 않습니다.
+#   조회 창이 밀리면 빠지는 행과, 빠진 고점 때문에 하락률이 바뀌는 행만 제거/재삽입하고,
+#   장중 새로고침으로 마지막 거래일 값이 바뀌면 그 행만 교체합니다.
+#   백분위 = 과거 거래일 중 하락률이 현재 이하(같거나 더 깊음)였던 비율 → 낮을수록 드문 낙폭
+# - 변동성 기준선: 고정 기준선(-10% / -20%)을 연 변동성 REFERENCE_VOL 자산의 기준으로 보고,
+#   로그 하락폭을 (티커 연 변동성 / REFERENCE_VOL) 배로 조정합니다.
+#     기준선 = (1 + 고정 기준선) ^ (변동성 / REFERENCE_VOL) - 1     예) 연 8% 채권 약 -5% / -11%, 연 80% 코인 약 -41% / -67%
+REFERENCE_VOL = 16.0           # 연 변동성 (%)
+MAX_INCREMENTAL_ROWS = 252     # 새로 들어오거나 창 앞에서 빠지는 거래일이 이보다 많으면 증분 대신 재구성
+RANK_CACHE_SIZE = 8
+STATUS_MODES = {"fixed": "고정 기준 (-10% / -20%)", "vol": "변동성 기준 (티커별)"}
+
+
+def vol_bands(vol):
+    # 연 변동성(%) -> (조정 기준선, 물타기 기준선) %. 변동성을 모르면 고정 기준선
+    scale = np.asarray(vol, dtype=float) / REFERENCE_VOL
+    scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+    correction = ((1 + CORRECTION_ZONE_DD / 100) ** scale - 1) * 100
+    buy = ((1 + BUY_ZONE_DD / 100) ** scale - 1) * 100
+    return correction, buy
+
+
+class DrawdownRanker:
+    def __init__(self, tickers):
+        self.tickers = list(tickers)
+        self.first_date = None
+        self.last_date = None
+        self.lock = threading.Lock()
+        self._table = None
+        self.stats = {"rebuilds": 0, "appends": 0, "slides": 0, "revisions": 0}
+
+    # --------------------------------------------------------
+    # 전체 패널로부터 한 번에 초기화
+    # --------------------------------------------------------
+    def rebuild(self, prices: pd.DataFrame):
+        # 창 안의 가격(_values)을 보관: 창이 밀리거나 마지막 행이 바뀔 때 되돌릴 하락률/수익률은 여기서 다시 계산
+        k = len(self.tickers)
+        values = prices.to_numpy(dtype=float)
+        self._index = prices.index
+        self._values = values
+        peak, dd = drawdown_values(values)
+        self._sorted = [np.sort(col[~np.isnan(col)]) for col in dd.T]
+
+        # 직전 유효 종가 대비 로그수익률의 합 / 제곱합 (변동성)
+        filled = prices.ffill().to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rets = np.log(filled[1:] / filled[:-1])
+        rets[np.isnan(values[1:])] = np.nan
+        ok = ~np.isnan(rets)
+        self._n_ret = ok.sum(axis=0).astype(float)
+        self._s1 = np.where(ok, rets, 0.0).sum(axis=0)
+        self._s2 = np.where(ok, rets ** 2, 0.0).sum(axis=0)
+
+        valid = ~np.isnan(values)
+        has = valid.any(axis=0) if len(values) else np.zeros(k, bool)
+        first = valid.argmax(axis=0) if len(values) else np.zeros(k, int)
+        last = len(values) - 1 - valid[::-1].argmax(axis=0) if len(values) else np.zeros(k, int)
+        dates = prices.index.to_numpy()
+        nat = np.datetime64("NaT", "ns")
+        self._first_date = np.where(has, dates[first] if len(values) else nat, nat).astype("datetime64[ns]")
+        self._last_valid = np.where(has, dates[last] if len(values) else nat, nat).astype("datetime64[ns]")
+
+        self._peak = peak[-1] if len(values) else np.full(k, np.nan)
+        self._last_price = filled[-1] if len(values) else np.full(k, np.nan)
+        self._update_current()
+        self.first_date = prices.index[0] if len(prices) else None
+        self.last_date = prices.index[-1] if len(prices) else None
+        self.stats["rebuilds"] += 1
+
+    def _update_current(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._current = (self._last_price / self._peak - 1.0) * 100
+        self._table = None
+
+    # --------------------------------------------------------
+    # 새 거래일 반영: 티커별로 새 하락률을 정렬해 이진 탐색 위치에 한 번에 삽입
+    # --------------------------------------------------------
+    def extend(self, new_rows: pd.DataFrame):
+        values = new_rows.to_numpy(dtype=float)
+        if not len(values):
+            return
+        valid = ~np.isnan(values)
+        filled = np.vstack([self._last_price, values])
+        filled = pd.DataFrame(filled).ffill().to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rets = np.log(filled[1:] / filled[:-1])
+        ok = valid & ~np.isnan(rets)
+        self._n_ret += ok.sum(axis=0)
+        self._s1 += np.where(ok, rets, 0.0).sum(axis=0)
+        self._s2 += np.where(ok, rets ** 2, 0.0).sum(axis=0)
+
+        peak = np.fmax.accumulate(np.vstack([self._peak, values]), axis=0)[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = (values / peak - 1.0) * 100
+        for j in np.flatnonzero(valid.any(axis=0)):
+            self._sorted[j] = _insert(self._sorted[j], dd[valid[:, j], j])
+
+        dates = new_rows.index.to_numpy().astype("datetime64[ns]")
+        rows = np.arange(len(values))[:, None]
+        first_new = dates[valid.argmax(axis=0)]
+        last_new = dates[np.where(valid, rows, 0).max(axis=0)]
+        has = valid.any(axis=0)
+        self._first_date = np.where(has & np.isnat(self._first_date), first_new, self._first_date)
+        self._last_valid = np.where(has, last_new, self._last_valid)
+        self._peak = peak[-1]
+        self._last_price = filled[-1]
+        self._update_current()
+        self._index = self._index.append(new_rows.index)
+        self._values = np.vstack([self._values, values])
+        self.last_date = new_rows.index[-1]
+
+    # --------------------------------------------------------
+    # 조회 창 시작이 밀림 (오늘 - N년): 앞쪽 d 개 행 제거
+    # --------------------------------------------------------
+    def drop_front(self, d):
+        # 빠지는 행의 하락률을 분포에서 제거하고, 빠진 구간의 고점 때문에 하락률이 달라지는 행만 다시 계산
+        # (새 창의 누적 고점이 빠진 구간 최고가에 도달하는 행부터는 이전과 같음)
+        if d <= 0:
+            return
+        head, values = self._values[:d], self._values[d:]
+        head_peak, head_dd = drawdown_values(head)
+        dropped_peak = head_peak[-1]
+        lost = ~np.isnan(dropped_peak)           # 빠지는 구간에 유효 가격이 있던 티커
+        peak = self._peak.copy()
+        for j in np.flatnonzero(lost):
+            gone = head_dd[:, j][~np.isnan(head_dd[:, j])]
+            col = values[:, j]
+            hit = col >= dropped_peak[j]
+            e = hit.argmax() if hit.any() else len(col)
+            add = np.empty(0)
+            if e:
+                runmax = np.fmax.accumulate(col[:e])
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    before = (col[:e] / np.fmax(runmax, dropped_peak[j]) - 1.0) * 100
+                    after = (col[:e] / runmax - 1.0) * 100
+                gone = np.concatenate([gone, before[~np.isnan(before)]])
+                add = after[~np.isnan(after)]
+                if e == len(col):
+                    peak[j] = runmax[-1]
+            self._sorted[j] = _insert(_remove(self._sorted[j], gone), add)
+
+        # 수익률: 새 창의 첫 유효 거래일까지는 합계에서 제외 (직전 가격이 창 밖)
+        valid = ~np.isnan(values)
+        has = valid.any(axis=0) if len(values) else np.zeros(len(self.tickers), bool)
+        first = valid.argmax(axis=0) if len(values) else np.zeros(len(self.tickers), int)
+        sub = lost & has
+        if sub.any():
+            m = d + first[sub].max() + 1
+            filled = pd.DataFrame(self._values[:m]).ffill().to_numpy()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rets = np.log(filled[1:] / filled[:-1])
+            rows = np.arange(1, m)[:, None]
+            drop = sub & (rows <= d + first) & ~np.isnan(self._values[1:m]) & ~np.isnan(rets)
+            self._n_ret -= drop.sum(axis=0)
+            self._s1 -= np.where(drop, rets, 0.0).sum(axis=0)
+            self._s2 -= np.where(drop, rets ** 2, 0.0).sum(axis=0)
+        empty = lost & ~has
+        self._n_ret[empty] = 0
+        self._s1 = np.where(self._n_ret > 0, self._s1, 0.0)
+        self._s2 = np.where(self._n_ret > 0, self._s2, 0.0)
+
+        self._index = self._index[d:]
+        self._values = values
+        dates = self._index.to_numpy().astype("datetime64[ns]")
+        nat = np.datetime64("NaT", "ns")
+        self._first_date = np.where(has, dates[first] if len(dates) else nat, nat).astype("datetime64[ns]")
+        self._last_valid = np.where(has, self._last_valid, nat).astype("datetime64[ns]")
+        self._last_price = np.where(has, self._last_price, np.nan)
+        self._peak = np.where(has, peak, np.nan)
+        self._update_current()
+        self.first_date = self._index[0]
+
+    # --------------------------------------------------------
+    # 마지막 거래일 수정 (장중 새로고침): 마지막 행만 되돌린 뒤 extend 로 다시 반영
+    # --------------------------------------------------------
+    def drop_last(self):
+        v, prev_values = self._values[-1], self._values[:-1]
+        valid = ~np.isnan(v)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dd = (v / self._peak - 1.0) * 100
+        dates = self._index[:-1].to_numpy().astype("datetime64[ns]")
+        nat = np.datetime64("NaT", "ns")
+        peak, last_price = self._peak.copy(), self._last_price.copy()
+        last_valid, first_date = self._last_valid.copy(), self._first_date.copy()
+        for j in np.flatnonzero(valid):
+            self._sorted[j] = _remove(self._sorted[j], dd[j:j + 1])
+            prev = np.flatnonzero(~np.isnan(prev_values[:, j]))
+            if not len(prev):
+                peak[j], last_price[j], last_valid[j], first_date[j] = np.nan, np.nan, nat, nat
+                continue
+            p = prev_values[prev[-1], j]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = np.log(v[j] / p)
+            if not np.isnan(r):
+                self._n_ret[j] -= 1
+                self._s1[j] -= r
+                self._s2[j] -= r ** 2
+            last_price[j], last_valid[j] = p, dates[prev[-1]]
+            if v[j] >= peak[j]:
+                # 마지막 행이 고점이었으면 그 이전 구간에서 다시 계산
+                peak[j] = np.fmax.reduce(prev_values[:, j])
+        self._peak, self._last_price, self._last_valid, self._first_date = peak, last_price, last_valid, first_date
+        self._update_current()
+        self._index = self._index[:-1]
+        self._values = prev_values
+        self.last_date = self._index[-1]
+
+    def sync(self, prices: pd.DataFrame):
+        # 보관 중인 창과 겹치는 구간이 그대로면 증분 반영, 과거 데이터가 바뀌었으면 재구성
+        #   - 창 시작이 밀림 (오늘 - N년) : drop_front
+        #   - 마지막 거래일 값이 바뀜      : drop_last 후 다시 extend
+        #   - 새 거래일                    : extend
+        prices = prices.reindex(columns=self.tickers)
+        with self.lock:
+            if (self.last_date is None or not len(prices) or self.last_date not in prices.index
+                    or prices.index[0] < self.first_date or prices.index[0] not in self._index):
+                self.rebuild(prices)
+                return
+            d = self._index.get_loc(prices.index[0])
+            end = prices.index.get_loc(self.last_date)
+            first_row = prices.iloc[0].to_numpy(dtype=float)
+            old_row = prices.iloc[end].to_numpy(dtype=float)
+            revised = not np.array_equal(old_row, self._values[-1], equal_nan=True)
+            new_rows = prices.iloc[end if revised else end + 1:]
+            if (end != len(self._index) - 1 - d or not np.array_equal(first_row, self._values[d], equal_nan=True)
+                    or d > MAX_INCREMENTAL_ROWS or len(new_rows) > MAX_INCREMENTAL_ROWS or (revised and end == 0)):
+                self.rebuild(prices)
+                return
+            if d:
+                self.drop_front(d)
+                self.stats["slides"] += 1
+            if revised:
+                self.drop_last()
+                self.stats["revisions"] += 1
+            if len(new_rows):
+                self.extend(new_rows)
+                self.stats["appends"] += 1
+
+    # --------------------------------------------------------
+    # 조회 (데이터가 바뀌기 전까지 같은 표를 재사용)
+    # --------------------------------------------------------
+    def table(self) -> pd.DataFrame:
+        # index = 티커 (데이터 없는 티커 제외)
+        #   dd_percentile: 현재 하락률의 과거 분포 내 백분위 (%), vol: 연 변동성 (%),
+        #   band_correction / band_buy: 변동성 기준선 (%), status_level_vol: 변동성 기준 상태 단계
+        with self.lock:
+            if self._table is not None:
+                return self._table
+            n = np.array([len(a) for a in self._sorted], dtype=float)
+            rank = np.array([a.searchsorted(c, side="right") for a, c in zip(self._sorted, self._current)], dtype=float)
+            span_years = (self._last_valid - self._first_date) / np.timedelta64(1, "D") / 365.25
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct = np.where(n > 0, rank / n * 100, np.nan)
+                var = np.where(self._n_ret > 1, (self._s2 - self._s1 ** 2 / self._n_ret) / (self._n_ret - 1), np.nan)
+                per_year = np.where(span_years > 0, n / span_years, np.nan)
+                vol = np.sqrt(np.where(var > 0, var, np.nan) * per_year) * 100
+            correction, buy = vol_bands(vol)
+            table = pd.DataFrame({
+                "current_dd": self._current,
+                "dd_percentile": pct,
+                "vol": vol,
+                "band_correction": correction,
+                "band_buy": buy,
+                "status_level_vol": classify_status(self._current, correction, buy),
+            }, index=pd.Index(self.tickers, name="ticker"))
+            self._table = table[n > 0]
+            return self._table
+
+
+def _insert(a, add):
+    # 정렬된 배열에 값들을 한 번에 삽입
+    if not len(add):
+        return a
+    add = np.sort(add)
+    return np.insert(a, a.searchsorted(add), add)
+
+
+def _remove(a, gone):
+    # 정렬된 배열에서 값들을 (같은 값은 개수만큼) 제거. 제거할 값은 이전에 삽입한 값과 정확히 같음
+    if not len(gone):
+        return a
+    gone = np.sort(gone)
+    pos = a.searchsorted(gone, side="left") + np.arange(len(gone)) - gone.searchsorted(gone, side="left")
+    return np.delete(a, pos)
+
+
+_rankers = OrderedDict()
+_rankers_lock = threading.Lock()
+
+
+def drawdown_ranks(prices: pd.DataFrame, key_extra=None) -> pd.DataFrame:
+    # (티커 목록, 조회 기간 등) 별 순위 상태를 보관해 새로고침/재실행 때는 새 거래일만 반영
+    key = (tuple(prices.columns), key_extra)
+    with _rankers_lock:
+        ranker = _rankers.pop(key, None)
+        if ranker is None:
+            ranker = DrawdownRanker(prices.columns)
+        _rankers[key] = ranker
+        while len(_rankers) > RANK_CACHE_SIZE:
+            _rankers.popitem(last=False)
+    ranker.sync(prices)
+    return ranker.table()
+
+
+def drawdown_ranks_asof(prices: pd.DataFrame, asof) -> pd.DataFrame:
+    # 과거 기준일: 그 시점까지의 데이터로 한 번 계산 (보관하지 않음)
+    ranker = DrawdownRanker(prices.columns)
+    ranker.rebuild(prices.loc[:pd.Timestamp(asof)])
+    return ranker.table()
@@ -0,0 +1,168 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from drawdown import drawdown_values, rows_per_year, BUY_ZONE_DD, CORRECTION_ZONE_DD
+
+# ============================================================
+# 이벤트 스터디: 하락 기준선(-10% / -20%) 진입 이후 실제로 어떻게 되었나
+# ============================================================
+# 이벤트 = 고점 갱신 이후 하락률이 처음으로 기준선 이하가 된 날 (같은 하락 구간 안에서 기준선을 오르내리는 재진입은 제외)
+# 모든 티커/이벤트를 (날짜 x 티커) 가격 행렬의 인덱스 연산으로 한 번에 계산합니다.
+#   h 거래일 후 수익률 : prices[t + h, j] / prices[t, j] - 1
+#   회복 시점           : t 이후 처음 하락률 0 (전고점 회복) 이 되는 행 (역방향 누적 최솟값)
+EVENT_THRESHOLDS = (CORRECTION_ZONE_DD, BUY_ZONE_DD)
+HORIZON_YEARS = {"1m": 1 / 12, "3m": 0.25, "6m": 0.5, "1y": 1}
+HORIZON_LABELS = {"1m": "1개월", "3m": "3개월", "6m": "6개월", "1y": "1년"}
+CACHE_SIZE = 8
+
+
+def data_version(close_prices: pd.DataFrame) -> str:
+    # 가격 패널 내용의 해시 (날짜/티커/가격 중 하나라도 바뀌면 다른 버전)
+    h = hashlib.sha256(close_prices.index.asi8.tobytes())
+    h.update("|".join(map(str, close_prices.columns)).encode())
+    h.update(np.ascontiguousarray(close_prices.to_numpy(dtype=float)).tobytes())
+    return h.hexdigest()
+
+
+def threshold_entries(dd: np.ndarray, threshold) -> np.ndarray:
+    # (날짜 x 티커) 하락률 -> 각 하락 구간에서 처음 threshold 이하가 된 날 (bool)
+    rows = np.arange(dd.shape[0])[:, None]
+    with np.errstate(invalid="ignore"):
+        below = dd <= threshold
+        at_peak = dd >= 0
+    count = np.cumsum(below, axis=0)
+    last_peak = np.maximum.accumulate(np.where(at_peak, rows, -1), axis=0)
+    base = np.where(last_peak >= 0, np.take_along_axis(count, np.maximum(last_peak, 0), axis=0), 0)
+    return below & (count - base == 1)
+
+
+def next_recovery(dd: np.ndarray) -> np.ndarray:
+    # 각 행 이후(자기 자신 포함) 처음 전고점을 회복하는 행, 없으면 n
+    n = dd.shape[0]
+    with np.errstate(invalid="ignore"):
+        at_peak = dd >= 0
+    nxt = np.where(at_peak, np.arange(n)[:, None], n)
+    return np.minimum.accumulate(nxt[::-1], axis=0)[::-1]
+
+
+def event_study(close_prices: pd.DataFrame, thresholds=EVENT_THRESHOLDS, horizons=None) -> pd.DataFrame:
+    # 반환: 이벤트별 행 (ticker, date, threshold, dd, fwd_<h> %, rec_<h>, recovery_days)
+    #   rec_<h>: h 이내 전고점 회복 1 / 미회복 0 / 아직 h 가 지나지 않았고 미회복이면 NaN
+    horizons = HORIZON_YEARS if horizons is None else horizons
+    # 거래하지 않는 날(주말 등)은 직전 가격으로 채워 모든 티커가 같은 달력 간격을 쓰도록 함 (상장 전은 NaN 유지)
+    prices = close_prices.ffill().to_numpy(dtype=float)
+    n = prices.shape[0]
+    _, dd = drawdown_values(prices)
+    recovery = next_recovery(dd)
+    dates = close_prices.index.to_numpy()
+    per_year = rows_per_year(close_prices.index)
+    steps = {label: max(1, int(round(years * per_year))) for label, years in horizons.items()}
+
+    frames = []
+    for threshold in thresholds:
+        t, j = np.nonzero(threshold_entries(dd, threshold))
+        rec = recovery[t, j]
+        recovered = rec < n
+        event = {
+            "ticker": close_prices.columns.to_numpy()[j],
+            "date": dates[t],
+            "threshold": np.full(len(t), float(threshold)),
+            "dd": dd[t, j],
+        }
+        for label, h in steps.items():
+            ahead = t + h
+            elapsed = ahead < n
+            fwd = np.full(len(t), np.nan)
+            fwd[elapsed] = (prices[ahead[elapsed], j[elapsed]] / prices[t[elapsed], j[elapsed]] - 1) * 100
+            event[f"fwd_{label}"] = fwd
+            event[f"rec_{label}"] = np.where(recovered & (rec - t <= h), 1.0, np.where(elapsed, 0.0, np.nan))
+        event["recovery_days"] = np.where(
+            recovered, (dates[np.minimum(rec, n - 1)] - dates[t]) / np.timedelta64(1, "D"), np.nan
+        )
+        frames.append(pd.DataFrame(event))
+    events = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return events.sort_values(["ticker", "threshold", "date"], ascending=[True, False, True], ignore_index=True) if len(events) else events
+
+
+def event_summary(events: pd.DataFrame, by=("ticker", "threshold"), horizons=None) -> pd.DataFrame:
+    # 그룹별 이벤트 수, 기간별 수익률 분포(중앙값/25%/75%/상승 확률), 기간 내 회복률, 회복 소요일 중앙값
+    horizons = HORIZON_YEARS if horizons is None else horizons
+    by = list(by)
+    if events.empty:
+        return pd.DataFrame()
+    grouped = events.groupby(by, sort=True)
+    out = {"events": grouped.size()}
+    for label in horizons:
+        fwd = grouped[f"fwd_{label}"]
+        out[f"{label}_median"] = fwd.median()
+        out[f"{label}_p25"] = fwd.quantile(0.25)
+        out[f"{label}_p75"] = fwd.quantile(0.75)
+        out[f"{label}_win"] = (events[f"fwd_{label}"] > 0).where(events[f"fwd_{label}"].notna()).groupby([events[c] for c in by]).mean() * 100
+        out[f"{label}_recovered"] = grouped[f"rec_{label}"].mean() * 100
+    out["recovered_pct"] = events["recovery_days"].notna().groupby([events[c] for c in by]).mean() * 100
+    out["recovery_median_days"] = grouped["recovery_days"].median()
+    return pd.DataFrame(out)
+
+
+def events_asof(events: pd.DataFrame, index: pd.DatetimeIndex, asof, horizons=None) -> pd.DataFrame:
+    # 기준일 시점에 알 수 있었던 정보만 남김 (event_study 를 다시 돌리지 않음)
+    #   기준일 이후 이벤트 제외, 기준일까지 h 가 지나지 않은 수익률/회복 여부와 기준일 이후 회복은 미확정(NaN)
+    horizons = HORIZON_YEARS if horizons is None else horizons
+    asof = pd.Timestamp(asof)
+    out = events[events["date"] <= asof].copy()
+    if out.empty:
+        return out
+    end = index.searchsorted(asof, side="right") - 1
+    t = index.get_indexer(out["date"])
+    per_year = rows_per_year(index)
+    recovered = (out["date"] + pd.to_timedelta(out["recovery_days"], unit="D") <= asof).to_numpy()
+    for label, years in horizons.items():
+        elapsed = t + max(1, int(round(years * per_year))) <= end
+        out[f"fwd_{label}"] = out[f"fwd_{label}"].where(elapsed)
+        out[f"rec_{label}"] = np.where(recovered & (out[f"rec_{label}"] == 1), 1.0, np.where(elapsed, 0.0, np.nan))
+    out.loc[~recovered, "recovery_days"] = np.nan
+    return out
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cached_event_study(close_prices: pd.DataFrame, version=None):
+    # 데이터 버전별로 (이벤트, 티커별 요약, 기준선별 전체 요약) 을 보관 (Streamlit 세션 / Tk 새로고침 간 공유)
+    version = data_version(close_prices) if version is None else version
+    with _cache_lock:
+        if version in _cache:
+            _cache.move_to_end(version)
+            return _cache[version]
+    events = event_study(close_prices)
+    result = (events, event_summary(events), event_summary(events, by=["threshold"]))
+    with _cache_lock:
+        _cache[version] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def event_text(summary: pd.DataFrame, ticker, horizons=("3m", "1y")) -> list:
+    # 카드 표시용 요약 문장 (기준선별 한 줄)
+    lines = []
+    for threshold in EVENT_THRESHOLDS:
+        key = (ticker, float(threshold))
+        if summary.empty or key not in summary.index:
+            lines.append(f"{threshold:.0f}% 진입 이력 없음")
+            continue
+        row = summary.loc[key]
+        parts = [
+            f"{HORIZON_LABELS[h]} 후 {row[f'{h}_median']:+.1f}% (상승 {row[f'{h}_win']:.0f}%)"
+            for h in horizons if pd.notna(row[f"{h}_median"])
+        ]
+        recovery = f"회복 {row['recovered_pct']:.0f}%"
+        if pd.notna(row["recovery_median_days"]):
+            recovery += f", 중앙 {row['recovery_median_days']:.0f}일"
+        lines.append(f"{threshold:.0f}% 진입 {int(row['events'])}회: " + " / ".join(parts + [recovery]))
+    return lines
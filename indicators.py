@@ -0,0 +1,201 @@
+import numpy as np
+
+# ============================================================
+# 롤링 통계 / 기술적 지표 커널 (2D 배열: 행 = 날짜, 열 = 티커/피처)
+# ============================================================
+# - 모든 함수는 (n_days,) 또는 (n_days, n_cols) 배열을 받아 같은 모양을 반환하며, out= 으로 결과 배열 재사용 가능
+# - 롤링 평균/표준편차는 window 크기 블록별 (개수, 평균, M2) 를 블록 기준값 대비 편차로 누적한 뒤
+#   "앞 블록 suffix + 뒷 블록 prefix" 를 Chan 병렬 결합식으로 합칩니다. (O(n), 누적합 상쇄 오차 없음)
+# - NaN 이 하나라도 포함된 구간은 pandas rolling(window) 와 동일하게 NaN (min_periods 로 완화 가능)
+
+
+def _as_2d(x):
+    x = np.asarray(x, dtype=float)
+    return (x[:, None], True) if x.ndim == 1 else (x, False)
+
+
+def _finish(result, squeeze, out):
+    if squeeze:
+        result = result[:, 0]
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def _block_stats(x, window):
+    # 블록 내 prefix / suffix 의 (개수, 평균, M2)
+    n, k = x.shape
+    w = window
+    n_blocks = -(-n // w)
+    padded = np.full((n_blocks * w, k), np.nan)
+    padded[:n] = x
+    blocks = padded.reshape(n_blocks, w, k)
+
+    valid = ~np.isnan(blocks)
+    n_valid = valid.sum(axis=1, keepdims=True)
+    block_sum = np.where(valid, blocks, 0.0).sum(axis=1, keepdims=True)
+    anchor = np.divide(block_sum, n_valid, out=np.zeros_like(block_sum), where=n_valid > 0)
+    dev = np.where(valid, blocks - anchor, 0.0)
+
+    def accumulate(v, d):
+        cnt = np.cumsum(v, axis=1, dtype=float)
+        s1 = np.cumsum(d, axis=1)
+        s2 = np.cumsum(d * d, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_dev = np.where(cnt > 0, s1 / cnt, 0.0)
+        m2 = np.maximum(s2 - s1 * mean_dev, 0.0)
+        return cnt, anchor + mean_dev, m2
+
+    pre = accumulate(valid, dev)
+    suf = tuple(a[:, ::-1] for a in accumulate(valid[:, ::-1], dev[:, ::-1]))
+    flat = lambda a: a.reshape(-1, k)[:n]
+    return tuple(map(flat, pre)), tuple(map(flat, suf))
+
+
+def rolling_moments(x, window, ddof=0, min_periods=None):
+    # 반환: (rolling mean, rolling var)
+    x, squeeze = _as_2d(x)
+    n = len(x)
+    w = max(int(window), 1)
+    min_periods = w if min_periods is None else max(int(min_periods), 1)
+    (p_cnt, p_mean, p_m2), (s_cnt, s_mean, s_m2) = _block_stats(x, w)
+
+    # 구간 시작이 블록 경계(또는 첫 w-1 행)이면 prefix 하나로 구간 전체가 표현됨
+    cnt, mean, m2 = p_cnt, p_mean, p_m2
+    if n >= w:
+        # t >= w-1 인 행: suffix(t-w+1) + prefix(t) 를 Chan 결합 (gather 없이 슬라이스로 정렬)
+        a_cnt, a_mean, a_m2 = s_cnt[:n - w + 1], s_mean[:n - w + 1], s_m2[:n - w + 1]
+        b_cnt, b_mean, b_m2 = p_cnt[w - 1:], p_mean[w - 1:], p_m2[w - 1:]
+        cross = (np.arange(n - w + 1) % w != 0)[:, None]
+        tot = a_cnt + b_cnt
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = b_mean - a_mean
+            frac = b_cnt / tot
+            np.copyto(b_mean, a_mean + delta * frac, where=cross)
+            np.copyto(b_m2, a_m2 + b_m2 + delta * delta * a_cnt * frac, where=cross)
+        np.copyto(b_cnt, tot, where=cross)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = m2 / (cnt - ddof)
+
+    # NaN 포함 구간 / 관측치 부족 구간 처리
+    bad = (cnt < min_periods) | (cnt - ddof <= 0)
+    mean[bad] = np.nan
+    var[bad] = np.nan
+    if squeeze:
+        return mean[:, 0], var[:, 0]
+    return mean, var
+
+
+def rolling_mean(x, window, min_periods=None, out=None):
+    x2, squeeze = _as_2d(x)
+    mean, _ = rolling_moments(x2, window, min_periods=min_periods)
+    return _finish(mean, squeeze, out)
+
+
+def rolling_std(x, window, ddof=0, min_periods=None, out=None):
+    x2, squeeze = _as_2d(x)
+    _, var = rolling_moments(x2, window, ddof=ddof, min_periods=min_periods)
+    return _finish(np.sqrt(var), squeeze, out)
+
+
+def rolling_zscore(x, window, ddof=0, min_periods=None, out=None):
+    # (x - 이동평균) / 이동표준편차. 표준편차 0 인 구간은 inf/NaN (기존 pandas 계산과 동일)
+    x2, squeeze = _as_2d(x)
+    mean, var = rolling_moments(x2, window, ddof=ddof, min_periods=min_periods)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (x2 - mean) / np.sqrt(var)
+    return _finish(z, squeeze, out)
+
+
+def pct_change(x, out=None):
+    x2, squeeze = _as_2d(x)
+    result = np.full_like(x2, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result[1:] = x2[1:] / x2[:-1] - 1.0
+    return _finish(result, squeeze, out)
+
+
+def realized_vol(close, window=20, periods_per_year=252, out=None):
+    # 일간 수익률의 롤링 표준편차(ddof=0) 연율화
+    result = rolling_std(pct_change(close), window, ddof=0) * np.sqrt(periods_per_year)
+    return result if out is None else _finish(result, False, out)
+
+
+def trend_gap(close, window=200, out=None):
+    # 종가 / 이동평균 - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = np.asarray(close, dtype=float) / rolling_mean(close, window) - 1.0
+    return result if out is None else _finish(result, False, out)
+
+
+# ============================================================
+# Wilder 평활 / ATR / ADX
+# ============================================================
+def wilder_smooth(x, period, out=None):
+    # 첫 period 개 유효값의 단순평균으로 시작해 y_t = y_{t-1} + (x_t - y_{t-1}) / period
+    # 시작 이후 NaN 은 직전 평활값 유지
+    x2, squeeze = _as_2d(x)
+    n, k = x2.shape
+    result = np.full((n, k), np.nan)
+    seed = rolling_mean(x2, period)
+    started = np.zeros(k, dtype=bool)
+    prev = np.full(k, np.nan)
+    alpha = 1.0 / period
+    for i in range(n):
+        row = x2[i]
+        prev = np.where(started, np.where(np.isnan(row), prev, prev + alpha * (row - prev)), seed[i])
+        started |= ~np.isnan(seed[i])
+        result[i] = np.where(started, prev, np.nan)
+    return _finish(result, squeeze, out)
+
+
+def _smooth(x, period, smoothing):
+    if smoothing == "wilder":
+        return wilder_smooth(x, period)
+    if smoothing == "sma":
+        return rolling_mean(x, period)
+    raise ValueError(f"알 수 없는 평활 방식: {smoothing}")
+
+
+def true_range(high, low, close, out=None):
+    high, squeeze = _as_2d(high)
+    low, _ = _as_2d(low)
+    close, _ = _as_2d(close)
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    result = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    return _finish(result, squeeze, out)
+
+
+def directional_movement(high, low):
+    # (+DM, -DM). 첫 행은 0
+    high, squeeze = _as_2d(high)
+    low, _ = _as_2d(low)
+    up = np.full_like(high, np.nan)
+    down = np.full_like(low, np.nan)
+    up[1:] = high[1:] - high[:-1]
+    down[1:] = low[:-1] - low[1:]
+    with np.errstate(invalid="ignore"):
+        plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+        minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    if squeeze:
+        return plus_dm[:, 0], minus_dm[:, 0]
+    return plus_dm, minus_dm
+
+
+def atr(high, low, close, period=14, smoothing="wilder", out=None):
+    result = _smooth(true_range(high, low, close), period, smoothing)
+    return result if out is None else _finish(result, False, out)
+
+
+def adx(high, low, close, period=14, smoothing="wilder", out=None):
+    # smoothing="sma" 는 기존 RAI 계산(단순 이동평균 기반 ADX)과 동일한 결과
+    tr_s = atr(high, low, close, period, smoothing)
+    plus_dm, minus_dm = directional_movement(high, low)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        plus_di = 100 * _smooth(plus_dm, period, smoothing) / tr_s
+        minus_di = 100 * _smooth(minus_dm, period, smoothing) / tr_s
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    dx[np.isinf(dx)] = np.nan
+    result = _smooth(dx, period, smoothing)
+    return result if out is None else _finish(result, False, out)
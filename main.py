@@ -1,22 +1,168 @@
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
-import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# yfinance / matplotlib 은 무거우므로 데이터 다운로드, 차트 탭 생성 시점에 import 합니다.
+from analysis import analyze
+from drawdown import STATUS_BUY, STATUS_CORRECTION, STATUS_STABLE
+from drawdown_rank import STATUS_MODES
+from card_grid import VirtualCardGrid
+from snapshot import open_snapshot
+from data_quality import validate_frames, quality_summary
+
+# 자동 새로고침 주기 (Streamlit 캐시 TTL 과 동일한 15분)
+REFRESH_INTERVAL_MS = 15 * 60 * 1000
+# 티커가 이보다 많으면 개별 종목 탭은 미리 만들지 않고 카드를 클릭할 때 추가
+MAX_TICKER_TABS = 20
+
+# 종합 대시보드 카드 정렬 / 상태 필터
+# 정렬 키: (티커, 분석 결과) -> 값, 결과가 없거나 값이 NaN 인 티커는 뒤로
+CARD_SORTS = {
+    "기본 순서": None,
+    "하락률 깊은 순": lambda ticker, res: res['current_dd_20y'],
+    "하락률 얕은 순": lambda ticker, res: -res['current_dd_20y'],
+    "과거 분포 백분위 (드문 순)": lambda ticker, res: res['dd_percentile'],
+    "티커 이름순": lambda ticker, res: ticker,
+}
+CARD_FILTERS = {
+    "전체 상태": None,
+    "🔴 물타기 구간": STATUS_BUY,
+    "🟡 조정 구간": STATUS_CORRECTION,
+    "🔵 안정 구간": STATUS_STABLE,
+    "⚪ 데이터 없음": -1,
+}
+
+
+class TickerChart:
+    # 20년 하락률 차트. Figure/축/아티스트를 한 번만 만들고 새로고침 시에는 데이터만 교체합니다.
+    # - 정적 아티스트 (마지막 봉 이전 구간, 회복 구간, 저점 마커): 내용이 바뀐 경우에만 전체 다시 그리기
+    # - 실시간 아티스트 (마지막 봉 구간, 현재 하락률): animated 로 두고 배경 복사본 위에 blit
+    def __init__(self, fig, canvas, ticker, res):
+        self.fig = fig
+        self.canvas = canvas
+        self.ticker = ticker
+        self.ax = ax = fig.add_subplot(111)
+        self.signature = None
+        self.background = None
+        self.needs_full = True
+        self.pending = False
+
+        dd, roll = res['drawdown_20y'], res['rolling_mdd_1y']
+        self.dd_line, = ax.plot(dd.index[:-1], dd.iloc[:-1], color='red', alpha=0.8)
+        self.fill = ax.fill_between(dd.index[:-1], dd.iloc[:-1], 0, color='red', alpha=0.2)
+        self.roll_line, = ax.plot(roll.index[:-1], roll.iloc[:-1], color='purple', linestyle='--', linewidth=1, label='1Y Rolling MDD')
+        self.spans = ax.fill_between(dd.index, 0, 1, where=np.zeros(len(dd), bool), color='gold', alpha=0.3,
+                                     transform=ax.get_xaxis_transform(), linewidth=0)
+        self.markers, = ax.plot([], [], linestyle='none', marker='v', color='darkred', markersize=5)
+
+        ax.set_title(f"{ticker} 20-Year Drawdown Map", fontsize=11)
+        ax.axhline(0, color='black', linewidth=1)
+        self.mdd_line = ax.axhline(res['mdd_20y'], color='grey', linestyle='--', linewidth=1)
+        ax.axhline(-20, color='blue', linestyle=':', linewidth=1.5, label='-20% Threshold')
+        ax.grid(True, linestyle='--', alpha=0.5)
+
+        self.live_dd, = ax.plot(dd.index[-2:], dd.iloc[-2:], color='red', alpha=0.8, animated=True)
+        self.live_roll, = ax.plot(roll.index[-2:], roll.iloc[-2:], color='purple', linestyle='--', linewidth=1, animated=True)
+        self.live_point, = ax.plot(dd.index[-1:], dd.iloc[-1:], marker='o', color='red', markersize=4, animated=True)
+        self.live_text = ax.text(0.99, 0.03, "", transform=ax.transAxes, ha='right', va='bottom', fontsize=9, animated=True)
+        self.live_artists = (self.live_dd, self.live_roll, self.live_point, self.live_text)
+
+        canvas.mpl_connect('draw_event', self.on_draw)
+        self.update(res)
+
+    def update(self, res):
+        # 데이터만 교체하고 필요한 다시 그리기 방식을 기록 (실제 그리기는 draw 에서, 보이는 탭만)
+        dd, roll = res['drawdown_20y'], res['rolling_mdd_1y']
+        signature = (
+            len(dd), dd.index[-2] if len(dd) > 1 else None, dd.iloc[:-1].to_numpy().tobytes(),
+            roll.iloc[:-1].to_numpy().tobytes(), repr(res['recovery_list']), res['mdd_20y'],
+        )
+        if signature != self.signature:
+            self.signature = signature
+            self.set_static(res)
+            self.needs_full = True
+
+        self.live_dd.set_data(dd.index[-2:], dd.iloc[-2:])
+        self.live_roll.set_data(roll.index[-2:], roll.iloc[-2:])
+        self.live_point.set_data(dd.index[-1:], dd.iloc[-1:])
+        self.live_text.set_text(f"Now {dd.iloc[-1]:.2f}%")
+        lo, hi = self.ax.get_ylim()
+        if not lo <= dd.iloc[-1] <= hi:
+            self.needs_full = True
+        self.pending = True
+
+    def set_static(self, res):
+        dd, roll = res['drawdown_20y'], res['rolling_mdd_1y']
+        head = dd.iloc[:-1]
+        self.dd_line.set_data(head.index, head)
+        self.roll_line.set_data(roll.index[:-1], roll.iloc[:-1])
+        self.mdd_line.set_ydata([res['mdd_20y'], res['mdd_20y']])
+
+        # 회복 구간 음영 / 구간별 저점 마커
+        in_span = np.zeros(len(dd), dtype=bool)
+        marker_x, marker_y = [], []
+        for r in res['recovery_list']:
+            end_date = r[1] if r[1] else dd.index[-1]
+            in_span |= (dd.index >= r[0]) & (dd.index <= end_date)
+            marker_x.append(dd.loc[r[0]:end_date].idxmin())
+            marker_y.append(r[3])
+        self.markers.set_data(marker_x, marker_y)
+        self.set_fill('fill', head.index, head.to_numpy(), 0, color='red', alpha=0.2)
+        self.set_fill('spans', dd.index, 0, 1, where=in_span, color='gold', alpha=0.3,
+                      transform=self.ax.get_xaxis_transform(), linewidth=0)
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+    def set_fill(self, name, x, y1, y2, **kwargs):
+        # matplotlib 3.10+ 는 fill_between 결과를 제자리에서 갱신, 이전 버전은 새로 생성
+        coll = getattr(self, name)
+        where = kwargs.pop('where', None)
+        if hasattr(coll, 'set_data'):
+            coll.set_data(x, y1, y2, where=where)
+        else:
+            coll.remove()
+            setattr(self, name, self.ax.fill_between(x, y1, y2, where=where, **kwargs))
+
+    def on_draw(self, event=None):
+        # 전체 그리기 직후 배경(정적 아티스트)을 저장하고 실시간 아티스트를 위에 그림
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_live()
+
+    def draw_live(self):
+        for artist in self.live_artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+
+    def draw(self):
+        # 반환: 'full' (전체 다시 그리기) / 'blit' (실시간 아티스트만) / None (변경 없음)
+        if not self.pending:
+            return None
+        self.pending = False
+        if self.needs_full or self.background is None:
+            self.needs_full = False
+            self.canvas.draw()
+            return 'full'
+        self.canvas.restore_region(self.background)
+        self.draw_live()
+        return 'blit'
+
 
 class MDDDashboardApp:
-    def __init__(self, root):
+    def __init__(self, root, tickers=None, themes=None):
         self.root = root
         self.root.title("MDD 통합 대시보드 (ETF 모니터링)")
         self.root.geometry("1050x800")
         self.root.resizable(True, True)
         
-        # 주시할 대상 ETF 7종목
-        self.tickers = ["QQQ", "SPY", "IWM", "HYG", "LQD", "XLY", "XLP"]
+        # 주시할 대상 ETF 7종목 (--universe 로 다른 유니버스 지정 가능)
+        self.tickers = list(tickers) if tickers else ["QQQ", "SPY", "IWM", "HYG", "LQD", "XLY", "XLP"]
         
         # 각 티커별 테마/관련주 정보 매핑
         self.ticker_themes = {
@@ -28,9 +174,20 @@ class MDDDashboardApp:
             "XLY": "경기소비재 (아마존, 테슬라 등)",
             "XLP": "필수소비재 (P&G, 코카콜라 등)"
         }
+        self.ticker_themes.update(themes or {})
         
         self.data = {}
         self.analysis_results = {}
+        self.card_grid = None
+        self.charts = {}
+        self.ticker_tabs = {}
+        self.built_tabs = set()
+        self.refresh_queue = queue.Queue()
+        self.refreshing = False
+        self.quality_state = None
+        self.close_prices = None
+        self.asof = None
+        self.status_mode = "fixed"
         
         self.create_header()
         self.notebook = ttk.Notebook(self.root)
@@ -44,91 +201,138 @@ class MDDDashboardApp:
         
         title_label = ttk.Label(header_frame, text="📊 미국 주요 ETF 하락장 모니터링", font=("Arial", 16, "bold"))
         title_label.pack(side=tk.LEFT)
+
+        # 기준일 (비우면 최신). 과거 날짜를 적용하면 받아 둔 데이터로 그 시점의 상태를 다시 그림 (다운로드/전체 재계산 없음)
+        asof_frame = ttk.Frame(header_frame)
+        asof_frame.pack(side=tk.LEFT, padx=20)
+        ttk.Label(asof_frame, text="기준일").pack(side=tk.LEFT)
+        self.asof_var = tk.StringVar()
+        asof_entry = ttk.Entry(asof_frame, textvariable=self.asof_var, width=11)
+        asof_entry.pack(side=tk.LEFT, padx=4)
+        asof_entry.bind("<Return>", lambda event: self.apply_asof())
+        ttk.Button(asof_frame, text="적용", command=self.apply_asof).pack(side=tk.LEFT)
+        ttk.Button(asof_frame, text="최신", command=self.reset_asof).pack(side=tk.LEFT, padx=(4, 0))
+
+        # 상태 기준: 고정 기준선 / 티커 변동성에 맞춘 기준선
+        self.status_mode_var = tk.StringVar(value=STATUS_MODES["fixed"])
+        mode_box = ttk.Combobox(asof_frame, textvariable=self.status_mode_var, values=list(STATUS_MODES.values()), state="readonly", width=20)
+        mode_box.pack(side=tk.LEFT, padx=(12, 0))
+        mode_box.bind("<<ComboboxSelected>>", lambda event: self.apply_status_mode())
         
         self.status_label = ttk.Label(header_frame, text="데이터를 불러오는 중입니다. 잠시만 기다려주세요...", font=("Arial", 11), foreground="blue")
         self.status_label.pack(side=tk.RIGHT)
 
-    def load_and_analyze(self):
+    def fetch_close_prices(self, quality_state=None):
+        # 반환: (종가, 품질 검증 결과). 인스턴스 상태를 바꾸지 않으므로 작업 스레드에서 호출해도 안전
         end_date = datetime.today()
         start_date = end_date - relativedelta(years=20)
+
+        # 공유 스냅샷(MDD_SNAPSHOT_DIR)이 최신이고 티커/기간을 모두 포함하면 다운로드 없이 메모리 매핑으로 사용
+        snap = open_snapshot()
+        if snap is not None and snap.is_fresh() and snap.covers(self.tickers, start_date):
+            return snap.frame('close')[self.tickers].iloc[snap.index.searchsorted(start_date):].dropna(how='all'), snap.quality()
+
+        import yfinance as yf
+        df = yf.download(self.tickers, start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d'), progress=False)
         
-        try:
-            df = yf.download(self.tickers, start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d'), progress=False)
-            
-            if df.empty:
-                raise ValueError("데이터를 가져오지 못했습니다.")
-                
-            if isinstance(df.columns, pd.MultiIndex):
-                close_prices = df['Close']
-            else:
-                close_prices = df['Close']
-            
-            for ticker in self.tickers:
-                prices = close_prices[ticker].dropna()
-                self.analyze_ticker(ticker, prices)
-                
-            self.status_label.config(text=f"업데이트 완료: {end_date.strftime('%Y-%m-%d')}", foreground="green")
-            self.build_ui()
+        if df.empty:
+            raise ValueError("데이터를 가져오지 못했습니다.")
             
+        if isinstance(df.columns, pd.MultiIndex):
+            close_prices = df['Close']
+        else:
+            close_prices = df['Close']
+        # 품질 검증 (새로고침 시 이력이 그대로인 티커는 이전 결과 재사용)
+        fields, quality_state, _ = validate_frames({'close': close_prices}, quality_state)
+        return fields['close'], quality_state
+
+    def load_and_analyze(self):
+        # 최초 1회 로드 후 REFRESH_INTERVAL_MS 마다 백그라운드 새로고침
+        try:
+            self.close_prices, self.quality_state = self.fetch_close_prices(self.quality_state)
+            self.apply_results(self.analyze())
         except Exception as e:
             messagebox.showerror("오류", f"데이터 로드 중 문제가 발생했습니다:\n{e}")
             self.status_label.config(text="업데이트 실패", foreground="red")
+        self.root.after(REFRESH_INTERVAL_MS, self.refresh)
 
-    def analyze_ticker(self, ticker, prices):
-        # 1. 고점 및 하락률 계산
-        roll_max_20y = prices.cummax()
-        drawdown_20y = (prices / roll_max_20y - 1.0) * 100
-        mdd_20y = drawdown_20y.min()
-        current_dd_20y = drawdown_20y.iloc[-1]
-        
-        # 2. 현재 하락 지속 기간 계산 (마지막 고점 기준)
-        is_peak = prices == roll_max_20y
-        peak_dates = prices[is_peak].index
-        
-        last_peak = peak_dates[-1] if len(peak_dates) > 0 else prices.index[0]
-        ongoing_days = (prices.index[-1] - last_peak).days
-        
-        # 3. 주요 회복 구간 리스트 계산 (50일 이상)
-        recovery_list = []
-        for i in range(len(peak_dates) - 1):
-            start = peak_dates[i]
-            end = peak_dates[i+1]
-            days = (end - start).days
-            if days >= 50:
-                period_mdd = drawdown_20y.loc[start:end].min()
-                recovery_list.append((start, end, days, period_mdd))
-                
-        if ongoing_days >= 50:
-            period_mdd = drawdown_20y.loc[last_peak:].min()
-            recovery_list.append((last_peak, None, ongoing_days, period_mdd))
-            
-        recovery_list.sort(key=lambda x: x[2], reverse=True)
-        
-        # 4. 구간 판단 로직
-        if current_dd_20y <= -20.0:
-            status = "🔴 물타기 구간"
-            status_desc = "고점 대비 20% 이상 하락 (바겐세일 적극 검토)"
-            color = "#ffcccc"
-        elif current_dd_20y <= -10.0:
-            status = "🟡 조정 구간"
-            status_desc = "고점 대비 10~20% 하락 (분할 매수 준비)"
-            color = "#fff0b3"
+    def refresh(self):
+        # 다운로드/분석은 작업 스레드에서, 화면 갱신만 UI 스레드에서 (Tk 위젯은 UI 스레드에서만 접근)
+        if not self.refreshing:
+            self.refreshing = True
+            self.status_label.config(text="새로고침 중...", foreground="blue")
+
+            # 작업 스레드는 시작 시점의 설정 값만 사용하고 결과를 큐로 돌려줌 (공유 상태는 poll_refresh 에서만 변경)
+            asof, mode, quality_state = self.asof, self.status_mode, self.quality_state
+
+            def worker():
+                try:
+                    close_prices, quality = self.fetch_close_prices(quality_state)
+                    results = analyze(close_prices, self.tickers, asof, mode)
+                    self.refresh_queue.put((True, (close_prices, quality, results, asof, mode)))
+                except Exception as e:
+                    self.refresh_queue.put((False, e))
+
+            threading.Thread(target=worker, daemon=True).start()
+            self.root.after(200, self.poll_refresh)
+        self.root.after(REFRESH_INTERVAL_MS, self.refresh)
+
+    def poll_refresh(self):
+        try:
+            ok, payload = self.refresh_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(200, self.poll_refresh)
+            return
+        self.refreshing = False
+        if ok:
+            close_prices, quality, results, asof, mode = payload
+            self.close_prices, self.quality_state = close_prices, quality
+            if (asof, mode) != (self.asof, self.status_mode):
+                # 새로고침 도중 기준일/상태 기준을 바꿨으면 새 데이터를 현재 설정으로 다시 분석
+                results = self.analyze()
+            self.apply_results(results)
         else:
-            status = "🔵 안정 구간"
-            status_desc = "고점 대비 10% 이내 하락 (월 적립 매수 유지)"
-            color = "#cce6ff"
-            
-        self.analysis_results[ticker] = {
-            'drawdown_20y': drawdown_20y,
-            'mdd_20y': mdd_20y,
-            'current_dd_20y': current_dd_20y,
-            'recovery_list': recovery_list,
-            'status': status,
-            'status_desc': status_desc,
-            'bg_color': color,
-            'last_peak': last_peak,
-            'ongoing_days': ongoing_days
-        }
+            self.status_label.config(text=f"새로고침 실패: {payload}", foreground="red")
+
+    def analyze(self):
+        # 현재 종가/설정으로 분석 (UI 스레드 전용)
+        return analyze(self.close_prices, self.tickers, self.asof, self.status_mode)
+
+    def apply_asof(self):
+        text = self.asof_var.get().strip()
+        try:
+            self.asof = pd.Timestamp(text) if text else None
+        except ValueError:
+            self.status_label.config(text=f"기준일 형식 오류: {text} (예: 2022-10-12)", foreground="red")
+            return
+        if self.close_prices is not None:
+            self.apply_results(self.analyze())
+
+    def reset_asof(self):
+        self.asof_var.set("")
+        self.apply_asof()
+
+    def apply_status_mode(self):
+        label = self.status_mode_var.get()
+        self.status_mode = next((key for key, text in STATUS_MODES.items() if text == label), "fixed")
+        if self.close_prices is not None:
+            self.apply_results(self.analyze())
+
+    def apply_results(self, results):
+        t0 = time.perf_counter()
+        self.analysis_results = results
+        if self.card_grid is None:
+            self.build_ui()
+        else:
+            self.update_ui()
+        ui_ms = (time.perf_counter() - t0) * 1000
+        quality_text = quality_summary(self.quality_state)
+        self.status_label.config(
+            text=f"업데이트 완료: {datetime.today().strftime('%Y-%m-%d %H:%M')} (화면 갱신 {ui_ms:.0f}ms)"
+            + (f" · 기준일 {self.asof:%Y-%m-%d}" if self.asof is not None else "")
+            + (f" · {quality_text}" if quality_text else ""),
+            foreground="darkorange" if quality_text else "green",
+        )
 
     def build_ui(self):
         # 1. 종합 대시보드 탭
@@ -136,64 +340,182 @@ class MDDDashboardApp:
         self.notebook.add(dash_tab, text=" 📊 종합 대시보드 ")
         self.build_dashboard_tab(dash_tab)
         
-        # 2. 개별 종목 탭
-        for ticker in self.tickers:
-            tab_frame = ttk.Frame(self.notebook)
-            self.notebook.add(tab_frame, text=f" {ticker} ")
-            self.build_ticker_tab(tab_frame, ticker)
+        # 2. 개별 종목 탭 (차트는 탭이 처음 선택될 때 생성). 티커가 많으면 카드를 클릭할 때 탭 추가
+        if len(self.tickers) <= MAX_TICKER_TABS:
+            for ticker in self.tickers:
+                self.add_ticker_tab(ticker)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+    def add_ticker_tab(self, ticker):
+        tab_frame = ttk.Frame(self.notebook)
+        self.notebook.add(tab_frame, text=f" {ticker} ")
+        self.ticker_tabs[str(tab_frame)] = (tab_frame, ticker)
+        return str(tab_frame)
+
+    def open_ticker_tab(self, ticker):
+        tab_id = next((tab_id for tab_id, (_, t) in self.ticker_tabs.items() if t == ticker), None)
+        if tab_id is None:
+            tab_id = self.add_ticker_tab(ticker)
+        self.notebook.select(tab_id)
+
+    def update_ui(self):
+        # 새로고침: 위젯/차트를 다시 만들지 않고 내용만 교체, 차트는 현재 보이는 탭만 다시 그림
+        self.apply_card_view(refresh=True)
+        for tab_id, (tab_frame, ticker) in self.ticker_tabs.items():
+            if tab_id in self.built_tabs and ticker in self.analysis_results:
+                res = self.analysis_results[ticker]
+                self.fill_recovery_table(self.charts[tab_id]['tree'], res['recovery_list'])
+                self.charts[tab_id]['chart'].update(res)
+        self.draw_visible_chart()
+
+    def draw_visible_chart(self):
+        view = self.charts.get(self.notebook.select())
+        if view is not None:
+            view['chart'].draw()
+
+    def on_tab_changed(self, event=None):
+        tab_id = self.notebook.select()
+        if tab_id in self.ticker_tabs and tab_id not in self.built_tabs:
+            self.built_tabs.add(tab_id)
+            tab_frame, ticker = self.ticker_tabs[tab_id]
+            self.build_ticker_tab(tab_frame, ticker, tab_id)
+        # 숨겨져 있는 동안 갱신된 차트는 보이는 시점에 한 번만 그림
+        self.draw_visible_chart()
 
     def build_dashboard_tab(self, parent):
-        canvas = tk.Canvas(parent, borderwidth=0, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
+        # 정렬 / 필터 (상태, 현재 하락률 기준)
+        toolbar = ttk.Frame(parent)
+        toolbar.pack(fill=tk.X, padx=5, pady=(5, 0))
+        ttk.Label(toolbar, text="정렬").pack(side=tk.LEFT)
+        self.card_sort_var = tk.StringVar(value=next(iter(CARD_SORTS)))
+        sort_box = ttk.Combobox(toolbar, textvariable=self.card_sort_var, values=list(CARD_SORTS), state="readonly", width=22)
+        sort_box.pack(side=tk.LEFT, padx=(4, 12))
+        ttk.Label(toolbar, text="상태").pack(side=tk.LEFT)
+        self.card_filter_var = tk.StringVar(value=next(iter(CARD_FILTERS)))
+        filter_box = ttk.Combobox(toolbar, textvariable=self.card_filter_var, values=list(CARD_FILTERS), state="readonly", width=14)
+        filter_box.pack(side=tk.LEFT, padx=(4, 12))
+        ttk.Label(toolbar, text="현재 하락률 ≤").pack(side=tk.LEFT)
+        self.card_dd_var = tk.StringVar()
+        dd_entry = ttk.Entry(toolbar, textvariable=self.card_dd_var, width=6)
+        dd_entry.pack(side=tk.LEFT, padx=4)
+        ttk.Label(toolbar, text="%").pack(side=tk.LEFT)
+        self.card_count_label = ttk.Label(toolbar, foreground="#555555")
+        self.card_count_label.pack(side=tk.RIGHT)
+        for box in (sort_box, filter_box):
+            box.bind("<<ComboboxSelected>>", lambda event: self.apply_card_view(to_top=True))
+        dd_entry.bind("<Return>", lambda event: self.apply_card_view(to_top=True))
 
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        grid_frame = ttk.Frame(parent)
+        grid_frame.pack(fill=tk.BOTH, expand=True)
+        self.card_grid = VirtualCardGrid(grid_frame, self.create_card, self.fill_card, on_click=self.open_ticker_tab)
+        self.apply_card_view(refresh=True)
+
+    def card_order(self):
+        # 정렬/필터를 적용한 카드 순서 (하락률 입력이 숫자가 아니면 하락률 필터는 적용하지 않음)
+        sort_name = self.card_sort_var.get()
+        level = CARD_FILTERS.get(self.card_filter_var.get())
+        try:
+            max_dd = float(self.card_dd_var.get().strip().rstrip("%"))
+        except ValueError:
+            max_dd = None
+        results = self.analysis_results
+        tickers = self.tickers
+        if level == -1:
+            tickers = [t for t in tickers if t not in results]
+        elif level is not None:
+            tickers = [t for t in tickers if t in results and results[t]['status_level'] == level]
+        if max_dd is not None:
+            tickers = [t for t in tickers if t in results and results[t]['current_dd_20y'] <= max_dd]
+        key = CARD_SORTS.get(sort_name)
+        if key is None:
+            return tickers
+        values = {t: key(t, results[t]) for t in tickers if t in results}
+        ranked = [t for t in tickers if pd.notna(values.get(t, np.nan))]
+        ranked_set = set(ranked)
+        return sorted(ranked, key=values.get) + [t for t in tickers if t not in ranked_set]
+
+    def apply_card_view(self, refresh=False, to_top=False):
+        order = self.card_order()
+        self.card_count_label.config(text=f"표시 {len(order)} / 전체 {len(self.tickers)}")
+        self.card_grid.set_keys(order, refresh=refresh, to_top=to_top)
+
+    def create_card(self, master):
+        # 카드 위젯 한 벌 (가상화 그리드가 보이는 칸 수만큼 만들어 재사용)
+        card = tk.Frame(master, bd=2, relief=tk.RIDGE, padx=15, pady=20)
+        labels = {
+            'ticker': tk.Label(card, font=("Arial", 22, "bold")),
+            'theme': tk.Label(card, font=("Arial", 11), fg="#555555"),
+            'status': tk.Label(card, font=("Arial", 16, "bold")),
+            'info': tk.Label(card, font=("Arial", 12), justify="center"),
+            'desc': tk.Label(card, font=("Arial", 10), fg="#333333"),
+            'events': tk.Label(card, font=("Arial", 9), fg="#555555", justify="left", wraplength=280),
+        }
+        labels['ticker'].pack(pady=(5, 2))
+        labels['theme'].pack(pady=(0, 10))
+        labels['status'].pack(pady=5)
+        labels['info'].pack(pady=10)
+        labels['events'].pack(pady=(0, 5))
+        labels['desc'].pack(side=tk.BOTTOM, pady=5)
+        return card, labels
 
-        canvas.pack(side="left", fill="both", expand=True, padx=5, pady=5)
-        scrollbar.pack(side="right", fill="y")
+    def fill_card(self, card, labels, ticker):
+        labels['ticker'].config(text=ticker)
+        labels['theme'].config(text=self.ticker_themes.get(ticker, "기타/알 수 없음"))
+        res = self.analysis_results.get(ticker)
+        if res is None:
+            # 데이터를 받지 못했거나 품질 검증에서 격리된 티커
+            card.config(bg="#eeeeee")
+            for label in labels.values():
+                label.config(bg="#eeeeee")
+            labels['status'].config(text="⚪ 데이터 없음")
+            for name in ('info', 'events', 'desc'):
+                labels[name].config(text="")
+            return
+        
+        # 현재 하락률 및 유지 기간 로직
+        if res['current_dd_20y'] == 0:
+            duration_text = "✨ 전고점 갱신 중! (0일)"
+        else:
+            last_peak_str = res['last_peak'].strftime('%y.%m.%d')
+            duration_text = f"하락 지속: {res['ongoing_days']}일째\n(마지막 고점: {last_peak_str})"
         
-        columns = 3
-        for i in range(columns):
-            scrollable_frame.columnconfigure(i, weight=1, minsize=300)
+        info_text = (
+            f"현재 하락률: {res['current_dd_20y']:.2f}%\n"
+            f"{duration_text}\n\n"
+            f"역대 최대 낙폭: {res['mdd_20y']:.2f}%\n"
+            f"최근 1년/3년/5년: {res['mdd_1y']:.1f}% / {res['mdd_3y']:.1f}% / {res['mdd_5y']:.1f}%\n"
+            f"과거 분포 백분위: 하위 {res['dd_percentile']:.0f}% (연 변동성 {res['vol']:.0f}%)"
+        )
+        card.config(bg=res['bg_color'])
+        for label in labels.values():
+            label.config(bg=res['bg_color'])
+        labels['status'].config(text=res['status'])
+        labels['info'].config(text=info_text)
+        labels['desc'].config(text=res['status_desc'])
+        labels['events'].config(text=f"📚 과거 기준선 진입 이후\n{res['event_text']}")
 
-        for i, ticker in enumerate(self.tickers):
-            row = i // columns
-            col = i % columns
-            res = self.analysis_results[ticker]
-            theme_text = self.ticker_themes.get(ticker, "기타/알 수 없음")
-            
-            card = tk.Frame(scrollable_frame, bg=res['bg_color'], bd=2, relief=tk.RIDGE, padx=15, pady=20)
-            card.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-            
-            # 티커와 테마 표시
-            tk.Label(card, text=ticker, font=("Arial", 22, "bold"), bg=res['bg_color']).pack(pady=(5, 2))
-            tk.Label(card, text=theme_text, font=("Arial", 11), fg="#555555", bg=res['bg_color']).pack(pady=(0, 10))
-            
-            # 상태 표시
-            tk.Label(card, text=res['status'], font=("Arial", 16, "bold"), bg=res['bg_color']).pack(pady=5)
-            
-            # 현재 하락률 및 유지 기간 로직
-            if res['current_dd_20y'] == 0:
-                duration_text = "✨ 전고점 갱신 중! (0일)"
+    def fill_recovery_table(self, tree, recovery_list):
+        # 기존 행은 값만 교체하고 부족/남는 행만 추가/삭제
+        rows = tree.get_children()
+        for idx, r in enumerate(recovery_list, 1):
+            start_str = r[0].strftime('%Y-%m-%d')
+            end_str = r[1].strftime('%Y-%m-%d') if r[1] else "현재 진행중"
+            values = (f"{idx}위", start_str, end_str, f"{r[2]}일", f"{r[3]:.2f}%")
+            if idx <= len(rows):
+                tree.item(rows[idx - 1], values=values)
             else:
-                last_peak_str = res['last_peak'].strftime('%y.%m.%d')
-                duration_text = f"하락 지속: {res['ongoing_days']}일째\n(마지막 고점: {last_peak_str})"
-            
-            info_text = (
-                f"현재 하락률: {res['current_dd_20y']:.2f}%\n"
-                f"{duration_text}\n\n"
-                f"역대 최대 낙폭: {res['mdd_20y']:.2f}%"
-            )
-            tk.Label(card, text=info_text, font=("Arial", 12), bg=res['bg_color'], justify="center").pack(pady=10)
-            tk.Label(card, text=res['status_desc'], font=("Arial", 10), bg=res['bg_color'], fg="#333333").pack(side=tk.BOTTOM, pady=5)
+                tree.insert("", tk.END, values=values)
+        if len(rows) > len(recovery_list):
+            tree.delete(*rows[len(recovery_list):])
+
+    def build_ticker_tab(self, parent, ticker, tab_id):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-    def build_ticker_tab(self, parent, ticker):
-        res = self.analysis_results[ticker]
+        res = self.analysis_results.get(ticker)
+        if res is None:
+            ttk.Label(parent, text=f"{ticker}: 데이터가 없어 차트를 표시할 수 없습니다.").pack(pady=20)
+            return
         
         table_frame = ttk.LabelFrame(parent, text=f"{ticker} 주요 하락 및 회복 구간 (50일 이상)")
         table_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -214,39 +536,30 @@ class MDDDashboardApp:
         tree.configure(yscroll=scrollbar.set)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        for idx, r in enumerate(res['recovery_list'], 1):
-            start_str = r[0].strftime('%Y-%m-%d')
-            end_str = r[1].strftime('%Y-%m-%d') if r[1] else "현재 진행중"
-            tree.insert("", tk.END, values=(f"{idx}위", start_str, end_str, f"{r[2]}일", f"{r[3]:.2f}%"))
+        self.fill_recovery_table(tree, res['recovery_list'])
             
         chart_frame = tk.Frame(parent, bg="white", bd=2, relief=tk.SUNKEN)
         chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         fig = Figure(figsize=(8, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        dd = res['drawdown_20y']
-        
-        ax.plot(dd.index, dd, color='red', alpha=0.8)
-        ax.fill_between(dd.index, dd, 0, color='red', alpha=0.2)
-        
-        for r in res['recovery_list']:
-            end_date = r[1] if r[1] else dd.index[-1]
-            ax.axvspan(r[0], end_date, color='gold', alpha=0.3)
-            mdd_date = dd.loc[r[0]:end_date].idxmin()
-            ax.plot(mdd_date, r[3], marker='v', color='darkred', markersize=5)
-            
-        ax.set_title(f"{ticker} 20-Year Drawdown Map", fontsize=11)
-        ax.axhline(0, color='black', linewidth=1)
-        ax.axhline(res['mdd_20y'], color='grey', linestyle='--', linewidth=1)
-        ax.axhline(-20, color='blue', linestyle=':', linewidth=1.5, label='-20% Threshold')
-        ax.grid(True, linestyle='--', alpha=0.5)
-        
         canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
+        chart = TickerChart(fig, canvas, ticker, res)
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.charts[tab_id] = {'tree': tree, 'chart': chart}
 
 if __name__ == "__main__":
+    import argparse
+    from universe import load_universe
+
+    parser = argparse.ArgumentParser(description="MDD 통합 대시보드 (Tk)")
+    parser.add_argument("--universe", help="티커 목록 CSV ('ticker' 필수 / 'theme' 선택, 지정하지 않으면 기본 ETF 7종목)")
+    args = parser.parse_args()
+    tickers = themes = None
+    if args.universe:
+        universe = load_universe(args.universe)
+        tickers = universe["ticker"].tolist()
+        themes = {t: theme for t, theme in zip(universe["ticker"], universe["theme"]) if theme}
+
     root = tk.Tk()
-    app = MDDDashboardApp(root)
+    app = MDDDashboardApp(root, tickers, themes)
     root.mainloop()
\ No newline at end of file
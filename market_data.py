@@ -0,0 +1,172 @@
+import sys
+import time
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+from universe import load_universe
+from snapshot import open_snapshot, publish_price_fields, snapshot_root, snapshot_ttl, price_fields
+from data_quality import validate_frames, quality_report, quality_summary
+from single_flight import SingleFlight
+
+# ============================================================
+# 티커 구성 (1, 2, 4페이지 공용)
+# ============================================================
+tickers_rebal = ["SPY", "QQQ", "IWM", "HYG", "LQD", "XLY", "XLP", "^VIX", "^VIX3M", "SHY"]
+
+base_ticker_themes = {
+    "QQQ": "나스닥 100", "SPY": "S&P 500", "IWM": "러셀 2000",
+    "HYG": "하이일드 채권", "LQD": "투자등급 채권", "XLY": "경기소비재", "XLP": "필수소비재",
+    "MAGS": "매그니피센트 7", "QLD": "나스닥 100 (2배)", "GLD": "금 (Gold)", "SLV": "은 (Silver)", 
+    "SOXX": "반도체 지수", "BTC-USD": "비트코인 (BTC)", "ETH-USD": "이더리움 (ETH)", "SOL-USD": "솔라나 (SOL)",
+    "^VIX": "변동성 지수 (VIX)", "^VIX3M": "VIX 3개월", "SHY": "단기 국채 (1-3년)"
+}
+
+
+def get_universe():
+    # MDD 모니터링 대상은 유니버스 파일(universe.csv 또는 MDD_UNIVERSE_FILE 환경변수)에서 로드
+    universe_df = load_universe()
+    tickers_mdd = universe_df["ticker"].tolist()
+    all_tickers = list(set(tickers_mdd + tickers_rebal))
+
+    ticker_themes = dict(base_ticker_themes)
+    ticker_themes.update({t: th for t, th in zip(universe_df["ticker"], universe_df["theme"]) if th})
+    return tickers_mdd, all_tickers, ticker_themes
+
+
+# ============================================================
+# 데이터 로드 (yfinance 는 실제 다운로드가 필요할 때만 import)
+# ============================================================
+# 세션 간 공유 캐시: (티커, 기간) 키별로 다운로드는 한 번만 진행되고 동시에 요청한 세션은 그 결과를 기다림.
+# 캐시가 만료되면 이전 데이터를 먼저 보여주고 백그라운드에서 새로고침 (single_flight.py, MDD_FETCH_TTL / MDD_FETCH_STALE_TTL)
+# 값은 세션들이 공유하므로 호출한 쪽에는 복사본을 돌려줌 (st.cache_data 와 같은 규칙)
+_flights = SingleFlight()
+
+
+def _download_recent(tickers, years):
+    import yfinance as yf
+    end_date = datetime.today()
+    start_date = end_date - relativedelta(years=years)
+    df = yf.download(tickers, start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d'), progress=False, auto_adjust=True)
+    df.attrs["downloaded_at"] = time.time()  # 스냅샷 신선도 기준 (게시 시각이 아니라 다운로드 시각)
+    return df
+
+
+def _download_from(tickers, s_date):
+    import yfinance as yf
+    return yf.download(tickers, start=s_date, auto_adjust=False, progress=False)
+
+
+def _ticker_key(tickers):
+    return tickers if isinstance(tickers, str) else tuple(tickers)
+
+
+def load_data(tickers, years=20, allow_stale=True):
+    key = ("recent", _ticker_key(tickers), years)
+    return _flights.get(key, lambda: _download_recent(tickers, years), allow_stale=allow_stale).copy()
+
+
+def load_backtest_data(tickers, s_date):
+    key = ("from", _ticker_key(tickers), s_date)
+    return _flights.get(key, lambda: _download_from(tickers, s_date)).copy()
+
+
+# 프로세스 내 마지막 검증 결과: 캐시 만료 후 다시 받은 데이터에서도 이력이 같은 티커는 재검사하지 않음
+_quality_state = {}
+
+
+def _validate_recent(tickers, years):
+    # 새로고침 때는 만료된 원본이 아니라 새로 받은 원본으로 검증
+    raw = load_data(tickers, years, allow_stale=False)
+    fields, state, _ = validate_frames(price_fields(raw), _quality_state.get("last"))
+    _quality_state["last"] = state
+    _publish_fields(fields, state, years, raw.attrs.get("downloaded_at"))
+    return fields, state
+
+
+# 스냅샷 게시는 검증 결과를 새로 만들 때(다운로드 직후)만: 요청 스레드가 캐시된 이전 데이터를 다시 게시하지 않음
+_publish_state = {"error": None}
+
+
+def _publish_fields(fields, quality, years, downloaded_at):
+    # 다운로드 시각 기준으로 이미 만료된 데이터는 게시하지 않음. 같은 데이터/더 최신 스냅샷 판단은 publish_price_fields
+    if not snapshot_root() or fields["close"].empty or downloaded_at is None or time.time() - downloaded_at > snapshot_ttl():
+        return
+    try:
+        publish_price_fields(fields, years, quality=quality, created=downloaded_at)
+        _publish_state["error"] = None
+    except OSError as e:
+        _publish_state["error"] = str(e)
+        print(f"스냅샷 게시 실패: {e}", file=sys.stderr)
+
+
+def load_validated_data(tickers, years=20):
+    # 다운로드 -> 품질 검증(수정/격리) 후 (필드별 패널, 검증 결과)
+    fields, state = _flights.get(("validated", _ticker_key(tickers), years), lambda: _validate_recent(tickers, years))
+    return {f: frame.copy() for f, frame in fields.items()}, state
+
+
+def render_fetch_panel():
+    # 프로세스 전체(모든 세션) 기준 다운로드 캐시/병합 통계
+    m = _flights.metrics()
+    with st.sidebar.expander("📡 다운로드 요청 병합", expanded=False):
+        st.caption(
+            f"캐시 적중 {m['hits']} · 만료 데이터 제공 {m['stale_hits']} (백그라운드 새로고침 {m['refreshes']})  \n"
+            f"실제 다운로드 {m['fetches']} · 병합 대기 {m['coalesced_waits']}회 (누적 {m['wait_seconds']:.1f}초) · 실패 {m['failures']}  \n"
+            f"저장 {m['entries']}건 · 진행 중 {m['inflight']}건"
+        )
+
+
+def render_quality_notice(state):
+    # 문제가 있는 티커가 있을 때만 사이드바에 요약 + 상세 표
+    text = quality_summary(state)
+    if not text:
+        return
+    with st.sidebar.expander(f"🩺 {text}", expanded=False):
+        report = quality_report(state)
+        st.dataframe(report[report["status"] != "ok"][["status", "issues", "first", "last"]], use_container_width=True)
+        st.caption("repaired: 0 이하/튀는 가격 제거 · quarantined: 분석에서 제외 · warning: 보고만 함 (분할 비율 점프 포함, 수정주가이므로 조정하지 않음)")
+
+
+def fresh_snapshot(tickers, lookback_years):
+    # MDD_SNAPSHOT_DIR 가 설정되어 있고, 요청한 티커/기간을 모두 포함하는 신선한 스냅샷
+    snap = open_snapshot()
+    start = datetime.today() - relativedelta(years=lookback_years)
+    if snap is not None and snap.is_fresh() and snap.covers(tickers, start):
+        return snap, start
+    return None, start
+
+
+def load_price_panels(lookback_years):
+    # (종가, 고가, 저가) 패널 반환
+    _, all_tickers, _ = get_universe()
+
+    # 1) 공유 스냅샷: 메모리 매핑된 배열을 행 범위만 잘라서 그대로 사용 (복사/역직렬화 없음, 게시 시점에 검증 완료)
+    snap, start = fresh_snapshot(all_tickers, lookback_years)
+    if snap is not None:
+        st.sidebar.caption(f"📦 공유 스냅샷 사용 중 ({snap.version})")
+        render_quality_notice(snap.quality())
+        i0 = snap.index.searchsorted(pd.Timestamp(start))
+        return tuple(snap.frame(f).iloc[i0:] for f in ("close", "high", "low"))
+
+    # 2) 직접 다운로드 + 품질 검증 (스냅샷 디렉터리가 있으면 새로 받은 데이터는 검증 직후 다른 프로세스를 위해 게시)
+    with st.spinner(f'최근 {lookback_years}년의 주가 데이터를 불러오는 중입니다...'):
+        fields, quality = load_validated_data(all_tickers, lookback_years)
+    render_quality_notice(quality)
+    if snapshot_root() and _publish_state["error"]:
+        st.sidebar.caption(f"⚠️ 스냅샷 게시 실패: {_publish_state['error']}")
+
+    return fields["close"], fields["high"], fields["low"]
+
+
+def load_snapshot_summary(tickers, lookback_years):
+    # 스냅샷에 같은 조회 기간으로 미리 계산된 MDD 요약표가 있으면 반환 (없으면 None)
+    snap, _ = fresh_snapshot(tickers, lookback_years)
+    if snap is None or snap.meta.get("years") != lookback_years:
+        return None
+    summary = snap.summary()
+    if summary is None:
+        return None
+    return summary[summary.index.isin(tickers)].reindex([t for t in tickers if t in summary.index])
@@ -0,0 +1,440 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+from market_data import load_backtest_data
+from drawdown import trailing_mdd
+from panel import build_price_panel
+from backtest import BacktestCache, canonical_hash, canonical_weights, annual_returns, rolling_metrics, ROLLING_WINDOWS
+from contributions import compile_schedules, read_cashflow_file
+from universe import normalize_ticker
+from ticker_index import load_ticker_index
+from rerun_timing import timed_fragment
+
+MAX_PORTFOLIOS = 200
+CHART_MAX_PORTFOLIOS = 10
+CASH_COL = "원금+이자 (Cash)"
+WEIGHT_SUFFIX = " (%)"
+RESULT_KEY = "_backtest_result"
+CHART_NAMES = ["성장 곡선", "연도별 수익률", "낙폭 추이", "롤링 위험 지표"]
+CHART_MAX_POINTS = 600          # 롤링 지표 차트의 최대 표시 행 수 (기간이 길면 간격을 두고 추출)
+ROLLING_LABELS = {"cagr": "CAGR (%)", "std_dev": "변동성 (%)", "sharpe": "샤프 지수", "sortino": "소르티노 지수"}
+METRIC_FORMATS = {
+    "start_balance": "${:,.0f}", "total_invested": "${:,.0f}", "end_balance": "${:,.0f}",
+    "total_return": "{:.2f}%", "cagr": "{:.2f}%", "std_dev": "{:.2f}%", "best_year": "{:.2f}%",
+    "worst_year": "{:.2f}%", "mdd": "{:.2f}%", "sharpe": "{:.2f}", "sortino": "{:.2f}", "xirr": "{:.2f}%",
+    "cvar": "{:.2f}%", "ulcer": "{:.2f}", "calmar": "{:.2f}", "longest_underwater": "{:,.0f}일", "recovery_days": "{:,.0f}일",
+}
+METRIC_MISSING = {"recovery_days": "미회복"}
+# 적립 일정 프리셋: (일정, 매일 적립금 대비 회차당 금액 배수). 배수 None 은 전체 기간 적립금을 시작일에 한 번에 투자
+# 여러 개를 고르면 같은 포트폴리오를 일정별로 나란히 비교 (결과 컬럼: "포트폴리오 · 일정")
+SCHEDULE_PRESETS = {
+    "매일": ({"kind": "daily"}, 1),
+    "매주 (월요일)": ({"kind": "weekly", "weekday": 0}, 5),
+    "격주 (금요일)": ({"kind": "weekly", "weekday": 4, "every": 2}, 10),
+    "매월 (1일)": ({"kind": "monthly", "days": (1,)}, 21),
+    "월 2회 급여일 (15일 · 말일)": ({"kind": "monthly", "days": (15, 31)}, 10.5),
+    "분기 (3개월마다)": ({"kind": "monthly", "days": (1,), "every": 3}, 63),
+    "시작일 일시 투자": ({"kind": "lump"}, None),
+}
+CUSTOM_SCHEDULE = "사용자 현금흐름 파일"
+BENCHMARK_CHOICES = ["SPY", "QQQ", "VOO", "TQQQ", "QLD", "BTC-USD", "SOXX", "GLD"]
+
+
+def default_portfolio_data(n_portfolios):
+    # 기본 예시 2개 + 추가 포트폴리오는 빈 비중
+    data = pd.DataFrame({
+        "Ticker": ["QLD", "MAGS", "TQQQ", "BRK-B", "SPY", ""],
+        "포트폴리오 1 (%)": [30.0, 20.0, 10.0, 5.0, 0.0, 0.0],
+        "포트폴리오 2 (%)": [0.0, 0.0, 0.0, 0.0, 100.0, 0.0]
+    })
+    for i in range(3, n_portfolios + 1):
+        data[f"포트폴리오 {i}{WEIGHT_SUFFIX}"] = 0.0
+    return data.iloc[:, :n_portfolios + 1]
+
+
+def read_portfolio_file(file) -> pd.DataFrame:
+    # 첫 컬럼: 티커, 나머지 컬럼: 포트폴리오별 비중(%)
+    df = pd.read_csv(file, comment="#", skipinitialspace=True)
+    if df.shape[1] < 2:
+        raise ValueError("티커 컬럼과 비중 컬럼이 1개 이상 필요합니다.")
+    if df.shape[1] - 1 > MAX_PORTFOLIOS:
+        raise ValueError(f"포트폴리오는 최대 {MAX_PORTFOLIOS}개까지 지원합니다.")
+    names = [str(c).strip() for c in df.columns[1:]]
+    df.columns = ["Ticker"] + [c if c.endswith(WEIGHT_SUFFIX) else c + WEIGHT_SUFFIX for c in names]
+    df["Ticker"] = df["Ticker"].fillna("").astype(str)
+    weights = df.iloc[:, 1:].apply(pd.to_numeric, errors="coerce")
+    return pd.concat([df[["Ticker"]], weights], axis=1)
+
+
+def parse_portfolios(edited_df) -> pd.DataFrame:
+    # 편집 표 -> (티커 x 포트폴리오) 비중 행렬 (각 포트폴리오 합계 1로 정규화, 비중이 없는 포트폴리오는 제외)
+    tickers = edited_df["Ticker"].fillna("").astype(str).map(normalize_ticker)
+    weights = edited_df.drop(columns="Ticker").apply(pd.to_numeric, errors="coerce").fillna(0.0).clip(lower=0.0)
+    weights.columns = [str(c).removesuffix(WEIGHT_SUFFIX) for c in weights.columns]
+    weights = weights[(tickers != "").to_numpy()].groupby(tickers[tickers != ""].to_numpy()).sum()
+    weights = weights.loc[weights.sum(axis=1) > 0]
+    totals = weights.sum(axis=0)
+    return weights.loc[:, totals > 0] / totals[totals > 0]
+
+
+def drop_tickers(portfolios: pd.DataFrame, tickers) -> pd.DataFrame:
+    # 제외한 티커의 비중을 빼고 포트폴리오별 합계 1로 다시 정규화 (남은 비중이 없는 포트폴리오는 제외)
+    weights = portfolios.drop(index=list(tickers), errors="ignore")
+    totals = weights.sum(axis=0)
+    return weights.loc[:, totals > 0] / totals[totals > 0]
+
+
+def ticker_messages(checked, strict=False) -> list:
+    # 티커 색인 검증 결과(TickerIndex.check) -> 다운로드 전에 보여줄 (종류, 문구) 목록
+    messages = []
+    if checked["invalid"]:
+        messages.append(("warning", f"⚠️ 형식이 올바르지 않아 제외한 티커: {', '.join(checked['invalid'])}"))
+    if checked["missing"]:
+        messages.append(("warning", f"⚠️ 최근 다운로드에서 데이터가 없어 제외한 티커: {', '.join(checked['missing'])}"))
+    if checked["unknown"]:
+        text = ", ".join(f"{t} (→ {' / '.join(s)}?)" if s else t for t, s in checked["unknown"].items())
+        action = "제외했습니다" if strict else "그대로 다운로드를 시도합니다"
+        messages.append(("warning" if strict else "info", f"🔎 티커 색인에 없는 티커: {text} — {action}."))
+    return messages
+
+
+def inception_messages(index, portfolios, benchmarks, start_date) -> list:
+    # 색인의 상장일 기준, 시작일 이후 상장된 자산 때문에 설정 비중/벤치마크 기간이 짧아지는 경우 (다운로드 전 경고)
+    late = index.late_starters(sorted(set(portfolios.index) | set(benchmarks)), start_date)
+    if late.empty:
+        return []
+    parts = []
+    for col in portfolios.columns:
+        held = late[late.index.isin(portfolios.index[portfolios[col] > 0])]
+        if not held.empty:
+            parts.append(f"{col} {held.max():%Y-%m-%d} ({', '.join(held.index)})")
+    parts += [f"{b} {late[b]:%Y-%m-%d}" for b in benchmarks if b in late.index and b not in portfolios.columns]
+    return [("info", "📅 티커 색인 기준 상장일이 시작일 이후라 설정 비중/기간이 온전히 적용되는 날이 늦어집니다: " + " · ".join(parts))]
+
+
+def format_metrics(metrics: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            [METRIC_FORMATS[name].format(v) if pd.notna(v) else METRIC_MISSING.get(name, "N/A") for v in row]
+            for name, row in zip(metrics.index, metrics.to_numpy())
+        ],
+        index=metrics.index, columns=metrics.columns,
+    )
+
+
+def downsample(frame: pd.DataFrame, max_points=CHART_MAX_POINTS) -> pd.DataFrame:
+    # 일정 간격으로 행 추출 (마지막 행은 항상 포함)
+    if len(frame) <= max_points:
+        return frame
+    step = -(-len(frame) // max_points)
+    rows = np.r_[np.arange(0, len(frame) - 1, step), len(frame) - 1]
+    return frame.iloc[rows]
+
+
+def schedule_specs(names, daily_invest, n_days, custom=None) -> dict:
+    # 선택한 프리셋 이름 -> {이름: 적립 일정 spec}. custom: 업로드한 현금흐름 파일 일정
+    specs = {}
+    for name in names:
+        if name == CUSTOM_SCHEDULE:
+            if custom is not None:
+                specs[name] = custom
+            continue
+        spec, multiple = SCHEDULE_PRESETS[name]
+        specs[name] = dict(spec, amount=daily_invest * (n_days if multiple is None else multiple))
+    return specs
+
+
+def run_backtest(cache, portfolios, benchmarks, start_date, initial_invest, daily_invest, cash_interest_rate, reinvest_dividends,
+                 schedules=("매일",), custom_schedule=None):
+    # 반환: 결과 영역(results_section)에 필요한 값 묶음, 실패 시 {"error": 메시지}
+    # schedules: 비교할 적립 일정 이름 (SCHEDULE_PRESETS / CUSTOM_SCHEDULE)
+    target_tickers = sorted(set(benchmarks) | set(portfolios.index))
+    df_raw_bt = load_backtest_data(target_tickers, start_date.strftime("%Y-%m-%d"))
+    
+    price_col = 'Adj Close' if reinvest_dividends else 'Close'
+    
+    if isinstance(df_raw_bt.columns, pd.MultiIndex):
+        try:
+            df_bt = df_raw_bt[price_col]
+        except KeyError:
+            df_bt = df_raw_bt['Close'] 
+    else:
+        df_bt = df_raw_bt[price_col].to_frame(name=target_tickers[0])
+        
+    # 교집합(dropna) 대신 각 티커의 상장일부터 사용: 주말(암호화폐)은 거래일 달력에 맞춰 제외
+    panel = build_price_panel(df_bt, calendar="trading", start=start_date)
+    no_data = [t for t in target_tickers if t not in panel.columns or pd.isna(panel.inception.get(t))]
+    
+    if panel.prices.empty or len(no_data) == len(target_tickers):
+        return {"error": "데이터가 없습니다. (잘못된 티커가 있는지 확인하세요.)"}
+    # 확인한 상장일/데이터 없는 티커를 색인에 기억 (다음 실행 때 다운로드 전에 제외). 전체 실패는 네트워크 문제일 수 있어 제외
+    load_ticker_index().learn(panel.inception, no_data)
+
+    notices = []
+    if no_data:
+        notices.append(("warning", f"⚠️ 데이터를 찾을 수 없어 제외된 티커: {', '.join(no_data)}"))
+    late = panel.late_starters().drop(no_data, errors="ignore")
+    if not late.empty:
+        late_text = ", ".join(f"{t} ({d.strftime('%Y-%m-%d')})" for t, d in late.sort_values().items())
+        notices.append(("info", f"ℹ️ 시작일 이후 상장된 티커: {late_text} — 상장 전 구간의 해당 비중은 같은 포트폴리오의 다른 자산에 배분되며, 벤치마크는 상장일부터 시작합니다."))
+
+    # 모든 포트폴리오 + 벤치마크(단일 티커 100%)를 하나의 비중 행렬로 보고, 캐시에 없는 컬럼만 한 번에 시뮬레이션
+    bench_cols = [b for b in benchmarks if b in panel.columns and b not in portfolios.columns]
+    weights = pd.concat([portfolios, pd.DataFrame(np.eye(len(bench_cols)), index=bench_cols, columns=bench_cols)], axis=1)
+    # 적립 일정은 달력에 맞춰 날짜별 적립금 벡터로 한 번 컴파일하고, 일정마다 전체 컬럼을 한 번에 시뮬레이션
+    flows = compile_schedules(schedule_specs(schedules, daily_invest, len(panel.index), custom_schedule), panel.index, start_date)
+    if flows.empty:
+        return {"error": "적립 일정을 하나 이상 선택해주세요. (사용자 현금흐름 파일은 업로드가 필요합니다.)"}
+    parts, metric_parts, contrib, port_cols, cash_cols = [], [], {}, [], []
+    for name in flows.columns:
+        res_s, met_s, _ = cache.simulate(panel, weights, initial_invest, flows[name].to_numpy(), cash_interest_rate, cash_col=CASH_COL)
+        if len(flows.columns) > 1:
+            rename = {c: f"{c} · {name}" for c in res_s.columns}
+            res_s, met_s = res_s.rename(columns=rename), met_s.rename(columns=rename)
+        else:
+            rename = {c: c for c in res_s.columns}
+        parts.append(res_s)
+        metric_parts.append(met_s)
+        contrib.update({c: flows[name] for c in res_s.columns})
+        port_cols += [rename[c] for c in portfolios.columns if c in rename]
+        cash_cols += [rename[c] for c in (CASH_COL,) if c in rename]
+    results, metrics = pd.concat(parts, axis=1), pd.concat(metric_parts, axis=1)
+    kept = results.columns[results.notna().any()]
+    results, metrics = results[kept], metrics[kept]
+    contrib = pd.DataFrame(contrib, index=panel.index)[kept]
+
+    metric_names = [
+        "Start Balance (시작 금액)", "Total Invested (총 투자금)", "End Balance (최종 평가금)",
+        "Total Return (총 수익률)", "Annualized Return (CAGR)", "Standard Deviation (변동성)",
+        "Best Year (최고 연도)", "Worst Year (최악 연도)", "Maximum Drawdown (최대 낙폭)",
+        "Sharpe Ratio (샤프 지수)", "Sortino Ratio (소르티노 지수)", "Money-Weighted Return (XIRR, 금액가중 연수익률)",
+        "CVaR 95% (하위 5% 일간 평균 손실)", "Ulcer Index (울서 지수)", "Calmar Ratio (칼마 비율)",
+        "Longest Underwater (최장 수면 아래 기간)", "Recovery Time (MDD 저점 후 회복 기간)",
+    ]
+    
+    summary_df = format_metrics(metrics)
+    summary_df.index = metric_names
+
+    # 최근 1/3/5년 구간 MDD (전체 결과 컬럼을 한 번에 계산)
+    trailing = trailing_mdd(results)
+    for label in trailing.index:
+        summary_df.loc[f"Trailing {label.upper()} MDD (최근 {label[:-1]}년 최대 낙폭)"] = [
+            f"{v:.2f}%" if pd.notna(v) else "N/A" for v in trailing.loc[label]
+        ]
+
+    # 최근 1년/3년 롤링 지표도 결과 묶음과 함께 캐시 (차트 토글 때 다시 계산하지 않음)
+    rolling = rolling_metrics(results, initial_invest, contrib.to_numpy(), cash_interest_rate)
+
+    # 결과 묶음은 세션 간 공유 캐시에도 들어가므로 이후에는 읽기만 할 것
+    return {
+        "results": results, "metrics": metrics, "summary": summary_df, "notices": notices, "rolling": rolling,
+        "port_cols": [c for c in port_cols if c in kept], "cash_cols": [c for c in cash_cols if c in kept],
+        "initial_invest": initial_invest, "contributions": contrib,
+    }
+
+
+# 세션 간 공유: 같은 포트폴리오를 비교하는 사용자들이 시뮬레이션 결과를 재사용
+@st.cache_resource
+def get_backtest_cache():
+    return BacktestCache()
+
+
+# ============================================================
+# [PAGE 3] DCA 백테스팅 시뮬레이터
+# ============================================================
+def render(lookback_years=None):
+    st.header("📈 3. DCA 백테스팅 시뮬레이터")
+    st.markdown("초기 자본금과 매일 적립할 금액을 설정하고, 내 포트폴리오의 과거 성과를 분석합니다.")
+
+    # 포트폴리오 개수 / 파일 업로드는 폼 밖에서 바로 반영 (편집 표의 컬럼 구성이 바뀌므로)
+    col_n, col_file = st.columns([1, 2])
+    n_portfolios = col_n.number_input("비교할 포트폴리오 개수", min_value=1, max_value=MAX_PORTFOLIOS, value=2, step=1)
+    uploaded = col_file.file_uploader("포트폴리오 비중 파일 업로드 (CSV: 첫 컬럼 티커, 나머지 컬럼 포트폴리오별 비중 %)", type=["csv"])
+    if uploaded is not None:
+        try:
+            portfolio_data = read_portfolio_file(uploaded)
+        except ValueError as e:
+            st.error(f"포트폴리오 파일을 읽을 수 없습니다: {e}")
+            portfolio_data = default_portfolio_data(n_portfolios)
+    else:
+        portfolio_data = default_portfolio_data(n_portfolios)
+    weight_cols = [c for c in portfolio_data.columns if c != "Ticker"]
+
+    # 티커 색인 검색: 티커나 이름 일부를 입력하면 바로 후보가 좁혀짐 (네트워크 없음)
+    ticker_index = load_ticker_index()
+    found = st.selectbox(
+        "🔎 티커 검색 (티커/이름 일부 입력)", ticker_index.tickers(), index=None,
+        format_func=ticker_index.label, placeholder="예: QQQ, 나스닥, Apple",
+    )
+    if found is not None:
+        st.caption(f"편집 표의 티커 칸에 `{found}` 를 입력하세요.")
+
+    with st.form("dca_settings"):
+        st.subheader("⚙️ 1. 백테스트 환경 설정")
+        col1, col2, col3 = st.columns(3)
+        initial_invest = col1.number_input("초기 시작 금액 ($)", min_value=0.0, value=0.0, step=100.0)
+        daily_invest = col2.number_input(
+            "매일 추가 투자 금액 ($)", min_value=0.0, value=80.0, step=10.0,
+            help="다른 적립 일정은 같은 예산으로 환산합니다: 매주 5일치, 격주 10일치, 매월 21일치, 월 2회 10.5일치, 분기 63일치, 일시 투자는 전체 기간치",
+        )
+        start_date = col3.date_input("백테스트 시작 날짜", value=pd.to_datetime("2024-01-01"))
+        
+        col4, col5 = st.columns(2)
+        cash_interest_rate = col4.number_input("원금 연이율 (Cash Interest Rate, %)", min_value=0.0, value=0.0, step=0.1)
+        with col5:
+            st.markdown("<br>", unsafe_allow_html=True)
+            reinvest_dividends = st.checkbox("🔄 배당 재투자 (Reinvest Dividends)", value=True, help="체크 시 배당금 수익이 차트에 복리로 계산(Adj Close)됩니다.")
+
+        col6, col7 = st.columns(2)
+        schedules = col6.multiselect(
+            "적립 일정 (여러 개 선택 시 일정별로 나란히 비교)", list(SCHEDULE_PRESETS) + [CUSTOM_SCHEDULE], default=["매일"],
+        )
+        cashflow_file = col7.file_uploader("사용자 현금흐름 파일 (CSV: date, amount)", type=["csv"])
+
+        st.markdown("---")
+        st.subheader("💼 2. 포트폴리오 자산 배분 (Portfolio Allocation)")
+        
+        col_port, col_bench = st.columns([2, 1])
+        with col_port:
+            column_config = {"Ticker": st.column_config.TextColumn("티커 (예: AAPL)", required=True)}
+            for c in weight_cols:
+                column_config[c] = st.column_config.NumberColumn(c, min_value=0, max_value=100, step=1)
+            edited_df = st.data_editor(
+                portfolio_data, 
+                num_rows="dynamic", 
+                use_container_width=True,
+                column_config=column_config
+            )
+
+        with col_bench:
+            st.markdown("**비교할 벤치마크 (Benchmarks)**")
+            benchmarks = st.multiselect(
+                "벤치마크 지수 추가",
+                BENCHMARK_CHOICES + [t for t in ticker_index.tickers() if t not in BENCHMARK_CHOICES],
+                default=["SPY", "QQQ"]
+            )
+            strict_tickers = st.checkbox("티커 색인에 없는 티커는 다운로드하지 않음", value=False)
+            
+        submitted = st.form_submit_button("백테스트 실행 및 분석 🚀", use_container_width=True)
+
+    if submitted:
+        portfolios = parse_portfolios(edited_df)
+        # 다운로드 전에 티커 색인으로 검증: 형식 오류/최근 데이터 없음(+ 엄격 모드의 미등록 티커)은 여기서 제외
+        checked = ticker_index.check(sorted(set(portfolios.index) | set(benchmarks)), strict=strict_tickers)
+        portfolios = drop_tickers(portfolios, checked["pruned"])
+        benchmarks = [b for b in benchmarks if b not in checked["pruned"]]
+        for kind, text in ticker_messages(checked, strict_tickers) + inception_messages(ticker_index, portfolios, benchmarks, start_date):
+            getattr(st, kind)(text)
+        # 새로 실행하면 이전 결과는 버림 (오류 시 이전 결과가 남아 혼동되지 않도록)
+        st.session_state.pop(RESULT_KEY, None)
+        custom_schedule, custom_error = None, None
+        if cashflow_file is not None:
+            try:
+                custom_schedule = read_cashflow_file(cashflow_file)
+            except ValueError as e:
+                custom_error = f"현금흐름 파일을 읽을 수 없습니다: {e}"
+        if cashflow_file is not None and custom_schedule is not None and CUSTOM_SCHEDULE not in schedules:
+            # 파일을 올렸으면 선택하지 않아도 비교 대상에 포함
+            schedules = schedules + [CUSTOM_SCHEDULE]
+        
+        if custom_error:
+            st.error(custom_error)
+        elif portfolios.empty and not benchmarks:
+            st.error("티커를 하나 이상 입력하거나 벤치마크를 선택해주세요.")
+        else:
+            # 정규화된 입력(비중 순서/스케일 무관)이 같으면 세션과 무관하게 캐시된 결과를 바로 사용
+            cache = get_backtest_cache()
+            form_key = canonical_hash(
+                "form", tuple((c, canonical_weights(portfolios[c])) for c in portfolios.columns), tuple(benchmarks),
+                start_date.isoformat(), float(initial_invest), float(daily_invest), float(cash_interest_rate), bool(reinvest_dividends),
+                tuple(schedules), None if custom_schedule is None else tuple(
+                    zip(custom_schedule["flows"].index.strftime("%Y-%m-%d"), custom_schedule["flows"].to_numpy(dtype=float).tolist())
+                ),
+            )
+            result = cache.get(form_key)
+            if result is None:
+                with st.spinner("과거 데이터를 기반으로 시뮬레이션 중입니다..."):
+                    result = run_backtest(
+                        cache, portfolios, benchmarks, start_date, initial_invest, daily_invest, cash_interest_rate, reinvest_dividends,
+                        schedules, custom_schedule,
+                    )
+                if "error" not in result:
+                    cache.put(form_key, result)
+            if "error" in result:
+                st.error(result["error"])
+            else:
+                # 결과는 세션에 보관: 차트 토글 등 결과 영역 조작은 fragment 만 다시 실행되어 시뮬레이션을 반복하지 않음
+                run = st.session_state.get(RESULT_KEY + "_run", 0) + 1
+                st.session_state[RESULT_KEY + "_run"] = run
+                st.session_state[RESULT_KEY] = dict(result, run=run)
+
+    if RESULT_KEY in st.session_state:
+        results_section()
+
+
+@timed_fragment("3. 백테스트 · 결과 표/차트 (차트 토글)")
+def results_section():
+    res = st.session_state[RESULT_KEY]
+    results, metrics, port_cols = res["results"], res["metrics"], res["port_cols"]
+    for kind, text in res["notices"]:
+        getattr(st, kind)(text)
+
+    st.markdown("---")
+    st.markdown("### 📋 퍼포먼스 요약 (Performance Summary)")
+    st.dataframe(res["summary"], use_container_width=True)
+    
+    st.markdown("---")
+    st.markdown("### 📈 포트폴리오 성장 곡선 (Portfolio Growth)")
+    # 포트폴리오가 많으면 최종 평가금 상위 포트폴리오만 기본 표시 (표에는 전체 표시)
+    shown = metrics.loc["end_balance", port_cols].sort_values(ascending=False).index[:CHART_MAX_PORTFOLIOS].tolist()
+    if len(port_cols) > len(shown):
+        st.caption(f"차트에는 기본으로 최종 평가금 상위 {len(shown)}개 포트폴리오와 벤치마크만 표시합니다. (전체 {len(port_cols)}개는 위 표 참고)")
+    col_charts, col_series = st.columns([1, 2])
+    # 실행마다 위젯 key 를 바꿔 새 결과의 기본 선택이 적용되도록 함
+    charts = col_charts.multiselect("표시할 차트", CHART_NAMES, default=CHART_NAMES, key=f"bt_charts_{res['run']}")
+    chart_cols = col_series.multiselect(
+        "차트에 표시할 항목", results.columns.tolist(),
+        default=[c for c in results.columns if c not in port_cols or c in shown], key=f"bt_series_{res['run']}",
+    )
+    if not chart_cols:
+        st.info("차트에 표시할 항목을 하나 이상 선택해주세요.")
+        return
+
+    if CHART_NAMES[0] in charts:
+        st.line_chart(results[chart_cols], height=400)
+    
+    # 원금+이자 컬럼은 일정별 이름("원금+이자 (Cash) · 매월")으로도 들어오므로 결과에 기록된 이름으로 제외
+    eq_only = results[chart_cols].drop(columns=res["cash_cols"], errors="ignore")
+    if eq_only.empty:
+        return
+    if CHART_NAMES[3] in charts:
+        rolling_chart(res, eq_only.columns.tolist())
+    sub_charts = [c for c in CHART_NAMES[1:3] if c in charts]
+    if not sub_charts:
+        return
+    for name, col in zip(sub_charts, st.columns(len(sub_charts))):
+        with col:
+            if name == CHART_NAMES[1]:
+                st.markdown("#### 📊 연도별 수익률 (Annual Returns)")
+                annual_rets = annual_returns(eq_only, res["initial_invest"], res["contributions"][eq_only.columns].to_numpy())
+                annual_rets.index = annual_rets.index.astype(str)
+                st.bar_chart(annual_rets, height=350)
+            else:
+                st.markdown("#### 📉 낙폭 추이 (Underwater/Drawdowns)")
+                roll_max_eq = eq_only.cummax()
+                dd_curve = (eq_only / roll_max_eq - 1) * 100
+                st.line_chart(dd_curve, height=350)
+
+
+def rolling_chart(res, cols):
+    st.markdown("#### 🔁 롤링 위험 지표 (Rolling Metrics)")
+    col_metric, col_window = st.columns([2, 1])
+    metric = col_metric.radio("지표", list(ROLLING_LABELS), format_func=ROLLING_LABELS.get, horizontal=True, key="bt_rolling_metric")
+    window = col_window.radio("기간", list(ROLLING_WINDOWS), format_func=lambda w: f"최근 {w[:-1]}년", horizontal=True, key="bt_rolling_window")
+    frame = res["rolling"][(window, metric)][cols].dropna(how="all")
+    if frame.empty:
+        st.info(f"롤링 {window[:-1]}년 지표를 계산하기에는 기간이 짧습니다.")
+        return
+    st.caption(f"각 날짜까지 최근 {window[:-1]}년 창의 {ROLLING_LABELS[metric]} (적립금 영향을 뺀 일간 수익률 기준)")
+    st.line_chart(downsample(frame), height=350)
@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import matplotlib.pyplot as plt
+
+from market_data import get_universe, load_price_panels
+from drawdown import rows_per_year
+from comovement import CoMovementRegistry, log_returns, MIN_CORR_OBS
+from rerun_timing import timed_fragment
+
+# 세션/재실행 간 공유되는 상태: 새 거래일이 들어오면 증분 갱신만 수행
+@st.cache_resource
+def get_comovement_registry():
+    return CoMovementRegistry()
+
+# ============================================================
+# [PAGE 4] 자산 간 동조화 분석 (상관계수 + 동반 하락)
+# ============================================================
+def render(lookback_years):
+    _, all_tickers, _ = get_universe()
+    close_prices, _, _ = load_price_panels(lookback_years)
+
+    st.header("🔗 4. 자산 간 동조화 분석 (Co-movement)")
+    st.markdown("어떤 자산들이 **함께 하락 구간(Underwater)에 머무르는지**, 최근 수익률이 **얼마나 같이 움직이는지** 확인합니다.")
+
+    CORR_WINDOWS = {"3개월": 0.25, "6개월": 0.5, "1년": 1, "3년": 3}
+
+    col1, col2, col3 = st.columns(3)
+    win_label = col1.selectbox("상관계수 롤링 구간", list(CORR_WINDOWS.keys()), index=2)
+    uw_threshold = col2.selectbox("하락 구간 기준 (고점 대비)", [-10.0, -20.0], format_func=lambda v: f"{v:.0f}% 이하")
+    co_scope = col3.radio("동반 하락 집계 기간", ["전체 기간", "최근 롤링 구간"], horizontal=True)
+
+    available = sorted(t for t in all_tickers if t in close_prices.columns and close_prices[t].notna().any())
+    selected = st.multiselect("분석 대상 티커", available, default=available)
+
+    if len(selected) < 2:
+        st.warning("비교할 티커를 2개 이상 선택해주세요.")
+    else:
+        panel = close_prices[selected]
+        window = int(round(CORR_WINDOWS[win_label] * rows_per_year(panel.index)))
+        state = get_comovement_registry().get(panel, window, uw_threshold, key_extra=lookback_years)
+        corr = state.correlation()
+        co = state.cooccurrence(full_history=(co_scope == "전체 기간"))
+
+        label_size = max(3, min(9, 360 // len(selected)))
+        heat_col1, heat_col2 = st.columns(2)
+        for col, mat, title, cmap, vmin in [
+            (heat_col1, corr, f"롤링 {win_label} 수익률 상관계수", "RdBu_r", -1),
+            (heat_col2, co, f"동반 하락 확률 P(열 하락 | 행 하락), 기준 {uw_threshold:.0f}%", "Reds", 0),
+        ]:
+            with col:
+                st.markdown(f"#### {title}")
+                fig, ax = plt.subplots(figsize=(6, 5.5))
+                im = ax.imshow(mat.to_numpy(), cmap=cmap, vmin=vmin, vmax=1, interpolation="nearest")
+                ax.set_xticks(range(len(selected)))
+                ax.set_yticks(range(len(selected)))
+                ax.set_xticklabels(selected, rotation=90, fontsize=label_size)
+                ax.set_yticklabels(selected, fontsize=label_size)
+                fig.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+                fig.tight_layout()
+                st.pyplot(fig)
+                plt.close(fig)
+
+        underwater = state.underwater_now()
+        under_list = underwater[underwater].index.tolist()
+        st.markdown(f"#### 🌊 현재 동반 하락 중인 자산 ({len(under_list)} / {len(selected)}개, 고점 대비 {uw_threshold:.0f}% 이하)")
+        st.write(", ".join(under_list) if under_list else "현재 기준선 아래에 있는 자산이 없습니다.")
+
+        st.markdown("#### 🔝 함께 하락하는 경향이 가장 강한 조합")
+        iu, ju = np.triu_indices(len(selected), k=1)
+        co_vals = co.to_numpy()
+        pairs = pd.DataFrame({
+            "자산 A": np.array(selected)[iu],
+            "자산 B": np.array(selected)[ju],
+            "P(B 하락 | A 하락)": co_vals[iu, ju],
+            "P(A 하락 | B 하락)": co_vals[ju, iu],
+            f"롤링 {win_label} 상관계수": corr.to_numpy()[iu, ju],
+        })
+        pairs["동반 하락 점수"] = pairs[["P(B 하락 | A 하락)", "P(A 하락 | B 하락)"]].min(axis=1)
+        st.dataframe(
+            pairs.sort_values("동반 하락 점수", ascending=False).head(20).round(3),
+            use_container_width=True, hide_index=True
+        )
+
+        # 두 자산 선택은 아래 fragment 만 다시 실행 (히트맵/상관계수 행렬은 다시 그리지 않음)
+        pair_section(panel, selected, window, win_label)
+
+
+@timed_fragment("4. 동조화 · 두 자산 상세 비교")
+def pair_section(panel, selected, window, win_label):
+    st.markdown("#### 🔍 두 자산 상세 비교")
+    pc1, pc2 = st.columns(2)
+    pair_a = pc1.selectbox("자산 A", selected, index=selected.index("SPY") if "SPY" in selected else 0)
+    pair_b = pc2.selectbox("자산 B", selected, index=selected.index("HYG") if "HYG" in selected else 1)
+
+    pair_rets = pd.DataFrame(log_returns(panel[[pair_a, pair_b]]), index=panel.index, columns=[pair_a, pair_b])
+    pair_rets = pair_rets.dropna()
+    pair_corr = pair_rets[pair_a].rolling(window, min_periods=MIN_CORR_OBS).corr(pair_rets[pair_b])
+
+    chart_col1, chart_col2 = st.columns(2)
+    with chart_col1:
+        st.caption(f"{pair_a} vs {pair_b} 롤링 {win_label} 상관계수 추이")
+        st.line_chart(pair_corr.rename("상관계수"))
+    with chart_col2:
+        st.caption("고점 대비 하락률 (%) 비교")
+        pair_prices = panel[[pair_a, pair_b]]
+        st.line_chart((pair_prices / pair_prices.cummax() - 1) * 100)
@@ -0,0 +1,263 @@
+import streamlit as st
+import pandas as pd
+import matplotlib.pyplot as plt
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+from market_data import get_universe, load_price_panels, load_snapshot_summary
+from drawdown import drawdown_summary, rolling_mdd, STATUS_BUY, STATUS_CORRECTION, STATUS_STABLE
+from event_study import cached_event_study, event_text, events_asof, event_summary, data_version, HORIZON_LABELS
+from range_index import panel_index
+from drawdown_rank import drawdown_ranks, drawdown_ranks_asof, STATUS_MODES
+from rerun_timing import timed_fragment
+
+STATUS_LABELS = {
+    STATUS_BUY: ("🔴 물타기 구간 (적극 매수)", "red"),
+    STATUS_CORRECTION: ("🟡 조정 구간 (분할 매수)", "orange"),
+    STATUS_STABLE: ("🔵 안정 구간 (적립 유지)", "blue"),
+}
+SORT_OPTIONS = {
+    "현재 하락률 (깊은 순)": ("current_dd", True),
+    "과거 분포 백분위 (드문 순)": ("dd_percentile", True),
+    "MDD (깊은 순)": ("mdd", True),
+    "하락 지속일 (긴 순)": ("ongoing_days", False),
+    "티커 (알파벳 순)": (None, True),
+}
+CARDS_PER_PAGE = 9
+
+
+# ============================================================
+# [PAGE 1] 기존 ETF 대시보드
+# ============================================================
+def render(lookback_years):
+    tickers_mdd, _, ticker_themes = get_universe()
+    close_prices, _, _ = load_price_panels(lookback_years)
+
+    st.header("📊 1. ETF 하락장 모니터링 (MDD)")
+    st.info(f"📅 **조회 기간:** 최근 {lookback_years}년 (시작: {(datetime.today() - relativedelta(years=lookback_years)).strftime('%Y-%m-%d')})")
+    
+    st.markdown("""
+    ### 🔔 상태 판별 기준 (MDD)
+    | 상태 | 상세 기준 | 투자전략 |
+    | :--- | :--- | :--- |
+    | 🔴 **물타기 구간** | **MDD -20% 이하** | 적극 매수 및 비중 확대 |
+    | 🟡 **조정 구간** | **MDD -10% 이하** | 분할 매수 진입 |
+    | 🔵 **안정 구간** | **MDD -10% 초과** | 기존 적립 및 관망 유지 |
+    """)
+    st.markdown("---")
+
+    # 기준일: 과거 날짜를 고르면 그 시점까지의 데이터만으로 페이지 전체를 다시 그림
+    # (요약표는 데이터 버전별로 한 번 만든 구간 질의 인덱스에서 조회, 가격 이력을 다시 계산하지 않음)
+    index = panel_index(close_prices, data_version(close_prices))
+    last_date = close_prices.index[-1].date() if len(close_prices.index) else datetime.today().date()
+    asof = st.date_input(
+        "🕰️ 기준일 (과거 시점으로 보기)", value=last_date, max_value=last_date,
+        min_value=close_prices.index[0].date() if len(close_prices.index) else None,
+        help="선택한 날짜 종가 기준의 상태/하락률/MDD 를 표시합니다. 그 이후 가격은 사용하지 않습니다.",
+    )
+    is_past = asof < last_date
+
+    # 전체 유니버스 요약표 (한 번의 벡터 연산)
+    if is_past:
+        summary = index.summary_asof(asof, tickers_mdd)
+        close_prices = close_prices.loc[:pd.Timestamp(asof)]
+        st.warning(f"🕰️ **{asof:%Y-%m-%d}** 시점 기준으로 표시 중입니다. (이후 가격과, 그 시점에 아직 결과가 나오지 않은 이벤트 성과는 제외)")
+    else:
+        summary = load_snapshot_summary(tickers_mdd, lookback_years)
+        if summary is None:
+            summary = drawdown_summary(close_prices.reindex(columns=tickers_mdd))
+    summary["theme"] = [ticker_themes.get(t, "") for t in summary.index]
+
+    # 티커별 과거 하락률 분포 내 백분위 / 변동성 기준선 (새 거래일만 증분 반영, 정렬·카드 렌더링 때는 조회만)
+    ranked = index.close[[t for t in summary.index if t in index.close.columns]]
+    ranks = drawdown_ranks_asof(ranked, asof) if is_past else drawdown_ranks(ranked, key_extra=lookback_years)
+    summary = summary.join(ranks.drop(columns="current_dd"))
+
+    # 기준선(-10% / -20%) 진입 이후 과거 성과: 같은 가격 데이터면 다시 계산하지 않음 (기준일은 확정된 결과만 다시 집계)
+    studied = [t for t in summary.index if t in index.close.columns]
+    events, event_stats, event_pooled = cached_event_study(index.close[studied])
+    if is_past:
+        known = events_asof(events, index.dates, asof)
+        event_stats, event_pooled = event_summary(known), event_summary(known, by=["threshold"])
+
+    st.markdown(f"### 📋 유니버스 요약 ({len(summary)} / {len(tickers_mdd)}개 종목)")
+    # 정렬/필터/상세 차트 조작은 아래 fragment 만 다시 실행 (데이터 로드/요약 계산은 반복하지 않음)
+    summary_section(summary, close_prices, tickers_mdd, ticker_themes, event_stats, event_pooled)
+    range_section(index, list(summary.index), asof)
+
+
+@timed_fragment("1. MDD · 구간 조회 (티커/기간)")
+def range_section(index, tickers, asof):
+    # 임의 기간의 최고가/최저가/구간 MDD (티커별 세그먼트 트리 질의)
+    st.markdown("---")
+    st.markdown("### 🔎 기간별 최고가 / 최저가 / MDD 조회")
+    if not tickers:
+        st.info("조회할 수 있는 티커가 없습니다.")
+        return
+    col1, col2, col3 = st.columns(3)
+    ticker = col1.selectbox("티커", tickers, key="range_ticker")
+    first = index.dates[0].date()
+    start = col2.date_input("시작일", value=max(asof - relativedelta(years=1), first), min_value=first, max_value=asof)
+    end = col3.date_input("종료일", value=asof, min_value=first, max_value=asof)
+    stats = index.range_stats(ticker, start, end) if start <= end else None
+    if stats is None:
+        st.info("선택한 기간에 가격 데이터가 없습니다.")
+        return
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("구간 MDD", f"{stats['mdd']:.2f}%", f"{stats['peak_date']:%y.%m.%d} → {stats['trough_date']:%y.%m.%d}", delta_color="off")
+    c2.metric("최고가", f"${stats['high']:,.2f}", f"{stats['high_date']:%Y-%m-%d}", delta_color="off")
+    c3.metric("최저가", f"${stats['low']:,.2f}", f"{stats['low_date']:%Y-%m-%d}", delta_color="off")
+    c4.metric("기간 수익률", f"{stats['return']:+.2f}%", f"{stats['start']:%y.%m.%d} ~ {stats['end']:%y.%m.%d}", delta_color="off")
+
+
+def event_table(stats: pd.DataFrame):
+    columns = {"events": st.column_config.NumberColumn("진입 횟수", format="%d")}
+    for h in ("3m", "1y"):
+        columns[f"{h}_median"] = st.column_config.NumberColumn(f"{HORIZON_LABELS[h]} 후 중앙값 (%)", format="%+.1f")
+        columns[f"{h}_win"] = st.column_config.NumberColumn(f"{HORIZON_LABELS[h]} 후 상승 확률 (%)", format="%.0f")
+        columns[f"{h}_recovered"] = st.column_config.NumberColumn(f"{HORIZON_LABELS[h]} 내 회복률 (%)", format="%.0f")
+    columns["recovered_pct"] = st.column_config.NumberColumn("회복률 (%)", format="%.0f")
+    columns["recovery_median_days"] = st.column_config.NumberColumn("회복 소요일 (중앙)", format="%d일")
+    table = stats[list(columns)].reset_index()
+    table["threshold"] = table["threshold"].map(lambda v: f"{v:.0f}% 진입")
+    st.dataframe(table, use_container_width=True, hide_index=True, column_config=columns)
+
+
+@timed_fragment("1. MDD · 요약표 (정렬/필터)")
+def summary_section(summary, close_prices, tickers_mdd, ticker_themes, event_stats, event_pooled):
+    ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 2])
+    sort_label = ctrl1.selectbox("정렬 기준", list(SORT_OPTIONS.keys()), index=0)
+    mode_label = ctrl2.selectbox(
+        "상태 기준", list(STATUS_MODES.values()),
+        help="변동성 기준: 연 변동성 16% 자산의 -10% / -20% 를 기준으로, 티커 변동성에 비례해 기준선을 넓히거나 좁힙니다.",
+    )
+    status_mode = next(key for key, text in STATUS_MODES.items() if text == mode_label)
+    if status_mode == "vol":
+        summary = summary.assign(status_level=summary["status_level_vol"].fillna(summary["status_level"]).astype(int))
+    summary = summary.assign(status=summary["status_level"].map(lambda lv: STATUS_LABELS[lv][0]))
+    status_filter = ctrl3.multiselect(
+        "상태 필터", [STATUS_LABELS[lv][0] for lv in (STATUS_BUY, STATUS_CORRECTION, STATUS_STABLE)],
+        default=[STATUS_LABELS[lv][0] for lv in (STATUS_BUY, STATUS_CORRECTION, STATUS_STABLE)]
+    )
+
+    sort_col, sort_asc = SORT_OPTIONS[sort_label]
+    view = summary[summary["status"].isin(status_filter)]
+    view = view.sort_index() if sort_col is None else view.sort_values(sort_col, ascending=sort_asc, kind="stable")
+
+    columns = ["theme", "status", "price", "daily_return", "current_dd", "dd_percentile", "vol", "mdd", "mdd_1y", "mdd_3y", "mdd_5y", "last_peak", "ongoing_days"]
+    if status_mode == "vol":
+        columns[6:6] = ["band_correction", "band_buy"]
+    st.dataframe(
+        view[columns],
+        use_container_width=True,
+        height=min(38 + 35 * len(view), 600),
+        column_config={
+            "ticker": "티커",
+            "theme": "테마",
+            "status": "상태",
+            "price": st.column_config.NumberColumn("현재가 ($)", format="%.2f"),
+            "daily_return": st.column_config.NumberColumn("일간 수익률 (%)", format="%+.2f"),
+            "current_dd": st.column_config.NumberColumn("현재 하락률 (%)", format="%.2f"),
+            "dd_percentile": st.column_config.NumberColumn("과거 분포 백분위 (%)", format="%.0f", help="과거 거래일 중 하락률이 지금 이하였던 비율 (낮을수록 드문 낙폭)"),
+            "vol": st.column_config.NumberColumn("연 변동성 (%)", format="%.0f"),
+            "band_correction": st.column_config.NumberColumn("조정 기준선 (%)", format="%.1f"),
+            "band_buy": st.column_config.NumberColumn("물타기 기준선 (%)", format="%.1f"),
+            "mdd": st.column_config.NumberColumn("MDD (%)", format="%.2f"),
+            "mdd_1y": st.column_config.NumberColumn("1년 MDD (%)", format="%.2f"),
+            "mdd_3y": st.column_config.NumberColumn("3년 MDD (%)", format="%.2f"),
+            "mdd_5y": st.column_config.NumberColumn("5년 MDD (%)", format="%.2f"),
+            "last_peak": st.column_config.DateColumn("마지막 고점", format="YYYY-MM-DD"),
+            "ongoing_days": st.column_config.NumberColumn("하락 지속일", format="%d일"),
+        }
+    )
+    missing = [t for t in tickers_mdd if t not in summary.index]
+    if missing:
+        st.caption(f"⚠️ 데이터를 받지 못한 티커: {', '.join(missing)}")
+
+    with st.expander("📚 기준선 진입 이후 과거 성과 (이벤트 스터디)", expanded=False):
+        st.caption("고점 갱신 이후 하락률이 처음 -10% / -20% 이하가 된 날을 이벤트로 보고, 조회 기간 안에서 이후 수익률과 전고점 회복까지의 기간을 집계했습니다. (같은 하락 구간 안의 재진입은 제외)")
+        if event_pooled.empty:
+            st.write("조회 기간 안에 기준선 진입 이력이 없습니다.")
+        else:
+            st.markdown("**전체 종목**")
+            event_table(event_pooled)
+            st.markdown("**종목별** (현재 표의 필터/정렬 기준)")
+            studied = set(event_stats.index.get_level_values("ticker"))
+            event_table(event_stats.loc[[t for t in view.index if t in studied]])
+
+    card_section(view, summary, close_prices, ticker_themes, event_stats, status_mode)
+
+
+@timed_fragment("1. MDD · 상세 차트 (티커 선택/페이지)")
+def card_section(view, summary, close_prices, ticker_themes, event_stats, status_mode):
+    # 상세 차트는 사용자가 선택한 티커만, 페이지 단위로 렌더링
+    st.markdown("---")
+    st.markdown("### 📉 종목별 상세 차트")
+    opened = st.multiselect("상세 차트를 볼 티커 선택", list(view.index), default=list(view.index[:3]))
+
+    n_pages = max(1, -(-len(opened) // CARDS_PER_PAGE))
+    card_page = st.number_input(f"상세 차트 페이지 (총 {n_pages}쪽)", min_value=1, max_value=n_pages, value=1, step=1) if n_pages > 1 else 1
+    page_tickers = opened[(card_page - 1) * CARDS_PER_PAGE: card_page * CARDS_PER_PAGE]
+
+    # 3개씩 묶어서 행(Row) 단위로 컬럼 생성
+    for i in range(0, len(page_tickers), 3):
+        cols = st.columns(3)
+
+        for j in range(3):
+            if i + j < len(page_tickers):
+                ticker = page_tickers[i + j]
+                row = summary.loc[ticker]
+                prices = close_prices[ticker].dropna()
+                drawdown = (prices / prices.cummax() - 1.0) * 100
+                rolling_1y = rolling_mdd(prices.to_frame(ticker), {"1y": 1})["1y"][ticker]
+
+                current_dd = row["current_dd"]
+                last_peak_dt = row["last_peak"]
+                ongoing_days = int(row["ongoing_days"])
+                status, color = STATUS_LABELS[row["status_level"]]
+
+                with cols[j]:
+                    st.subheader(f"{ticker} - {ticker_themes.get(ticker, '')}")
+                    current_price = row["price"]
+                    daily_return = row["daily_return"]
+                    return_color = "red" if daily_return > 0 else "blue" if daily_return < 0 else "gray"
+                    
+                    st.markdown(f"**상태:** :{color}[{status}]")
+                    st.markdown(f"**현재가:** ${current_price:,.2f} (:{return_color}[{daily_return:+.2f}%])")
+                    
+                    if current_dd == 0:
+                        st.markdown(f"""
+                            <div style="font-size:14px; color:gray; margin-bottom:2px;">현재 하락률</div>
+                            <div style="font-size:20px; font-weight:bold;">✨ 전고점 갱신 중!</div>
+                        """, unsafe_allow_html=True)
+                    else:
+                        label_text = f"현재 하락률 (고점: {last_peak_dt.strftime('%y.%m.%d')} / {ongoing_days}일째)"
+                        st.markdown(f"""
+                            <div style="font-size:14px; color:gray; margin-bottom:2px;">{label_text}</div>
+                            <div style="font-size:20px; font-weight:bold; color:{color};">{current_dd:.2f}%</div>
+                        """, unsafe_allow_html=True)
+
+                    trailing_text = " / ".join(
+                        f"{label.replace('y', '년')} {row[f'mdd_{label}']:.2f}%" if pd.notna(row[f"mdd_{label}"]) else f"{label.replace('y', '년')} -"
+                        for label in ("1y", "3y", "5y")
+                    )
+                    st.caption(f"최근 구간 MDD: {trailing_text} (전체 {row['mdd']:.2f}%)")
+                    if pd.notna(row["dd_percentile"]):
+                        st.caption(
+                            f"과거 하락률 분포: 하위 {row['dd_percentile']:.0f}% · 연 변동성 {row['vol']:.0f}% "
+                            f"(변동성 기준선 {row['band_correction']:.1f}% / {row['band_buy']:.1f}%)"
+                        )
+                    st.caption("📚 과거 기준선 진입 이후  \n" + "  \n".join(event_text(event_stats, ticker)))
+                    
+                    fig, ax = plt.subplots(figsize=(5, 3))
+                    ax.plot(drawdown.index, drawdown, color='red', alpha=0.8, linewidth=1)
+                    ax.fill_between(drawdown.index, drawdown, 0, color='red', alpha=0.2)
+                    ax.plot(rolling_1y.index, rolling_1y, color='purple', linestyle='--', linewidth=0.8, label='1Y Rolling MDD')
+                    ax.axhline(0, color='black', linewidth=0.8)
+                    buy_line = row["band_buy"] if status_mode == "vol" and pd.notna(row["band_buy"]) else -20
+                    ax.axhline(buy_line, color='blue', linestyle=':', label=f'{buy_line:.0f}% 기준선')
+                    ax.set_ylabel("Drawdown (%)", fontsize=8)
+                    ax.grid(True, linestyle='--', alpha=0.3)
+                    st.pyplot(fig)
+                    plt.close(fig)
+                    st.markdown("---")
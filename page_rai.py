@@ -0,0 +1,185 @@
+import streamlit as st
+import pandas as pd
+
+from market_data import load_price_panels
+from event_study import data_version
+from rai_model import (
+    rebalance_mask, forward_log_return, walk_forward_ridge, risk_appetite_index, rai_features, rai_percentile,
+    quantile_to_weight, W_FULL, STRATEGIES, DEFAULT_HORIZON,
+)
+from rerun_timing import timed_fragment
+
+WEIGHT_MODES = ["고정 가중치 (W_FULL)", "워크포워드 - 확장 윈도우", "워크포워드 - 롤링 3년"]
+ROLLING_FIT_WINDOW = 252 * 3
+
+REBAL_FREQS = ["D (매일)", "W-FRI (주 1회 금요일)", "M (월말)"]
+RAI_CACHE_KEY = "_rai_signal_cache"
+
+
+def is_exec_day(dt: pd.Timestamp, all_days: pd.DatetimeIndex, freq: str) -> bool:
+    if freq == "D": return True
+    if freq == "W-FRI": return dt.weekday() == 4
+    if freq == "M":
+        month_days = all_days[all_days.to_period("M") == dt.to_period("M")]
+        return dt == month_days.max()
+    return False
+
+
+def rai_signal(Xz, qqq_c, days_all, weight_mode, rebal_freq_val):
+    # (가중치, RAI, 백분위). 성향/보유 비중만 바뀐 재실행에서는 세션 메모를 재사용
+    # 키에 입력 데이터 해시 포함: 새로고침으로 오늘 봉이 바뀌거나 과거 수정주가가 조정되면 다시 계산
+    fit_freq = rebal_freq_val if weight_mode != WEIGHT_MODES[0] else None
+    key = (data_version(Xz), data_version(qqq_c.to_frame()), weight_mode, fit_freq)
+    memo = st.session_state.setdefault(RAI_CACHE_KEY, {})
+    if key in memo:
+        return memo[key]
+
+    # 고정 가중치 또는 리밸런싱일마다 재추정한 시변 가중치 (날짜 x 피처)
+    if weight_mode == WEIGHT_MODES[0]:
+        weights = W_FULL
+    else:
+        window = ROLLING_FIT_WINDOW if weight_mode == WEIGHT_MODES[2] else None
+        y = forward_log_return(qqq_c, DEFAULT_HORIZON)
+        weights = walk_forward_ridge(Xz, y, rebalance_mask(days_all, rebal_freq_val), DEFAULT_HORIZON, window)
+    rai = risk_appetite_index(Xz, weights)
+    
+    q = rai_percentile(rai)
+
+    if len(memo) >= 6:
+        memo.pop(next(iter(memo)))
+    memo[key] = (weights, rai, q)
+    return memo[key]
+
+
+# ============================================================
+# [PAGE 2] RAI 기반 동적 리밸런싱
+# ============================================================
+# 재실행 범위
+#   전체 실행          : 데이터 로드 + 피처/z-score 계산 (사이드바/페이지 변경 시)
+#   signal_section     : 리밸런싱 주기 / 성향 / 가중치 방식 변경 시 RAI·목표 비중 재계산
+#   position_section   : 포트폴리오 금액 / 현재 비중 변경 시 액션 지표와 스냅샷 표만 재계산
+def render(lookback_years):
+    close_prices, high_prices, low_prices = load_price_panels(lookback_years)
+
+    st.header("🔄 2. 포트폴리오 리밸런싱 시그널 (RAI)")
+    Xz, qqq_c, days_all = rai_features(close_prices, high_prices, low_prices)
+    signal_section(Xz, qqq_c, days_all)
+    st.markdown("---")
+    st.markdown("### 🧠 AI 목표 비중(Target Weight) 산출 원리")
+    st.markdown("""
+    이 대시보드의 **리밸런싱 시그널**은 단순한 가격 하락이 아니라, 시장의 심리와 자금 흐름을 읽어내는 **5단계의 알고리즘**을 거쳐 오늘 포트폴리오의 최적 비중을 결정합니다.
+
+    1. **8대 핵심 지표 수집**: 변동성(VIX 등 3개), 신용위험(회사채 비율), 기관 스마트머니 자금흐름(경기민감/방어주, 대/중소형주), 시장의 굵은 추세 강도(ADX) 등 거시경제를 파악하는 8가지 재료를 모읍니다.
+    2. **Z-Score 표준화**: 수집된 재료들이 평소보다 얼마나 비정상적인지 파악하기 위해, 최근 1년(252일) 평균 대비 현재 값이 얼마나 벗어나 있는지(표준편차) 동일한 잣대로 맞춥니다.
+    3. **RAI(위험 선호 지수) 산출**: 인공지능 기계학습(Ridge Regression)으로 과거 데이터를 분석해 찾아낸 **각 지표의 가중치**를 곱하고 더합니다. 이 과정을 통해 현재 시장의 투자 심리를 1개의 직관적인 점수(RAI)로 압축해 냅니다.
+    4. **최근 2년 내 상대 순위(백분위) 평가**: 과거 10년 전의 낡은 데이터가 아니라, **최근 2년(약 500거래일) 동안의 분위기 속에서 오늘의 RAI 점수가 상위 몇 %에 위치하는지(백분위)**를 계산하여 단기 폭락/급등장에 유연하게 대처합니다.
+    5. **목표 비중 매핑 (성향 반영)**: 산출된 백분위(%) 위치에 따라 포트폴리오 비중을 5단계로 조절합니다. 상단에서 설정하신 **[투자 성향]**에 따라 하락장(하위 10% 미만) 진입 시 방어 수준(안전자산 최대 확보량)이 다르게 맵핑됩니다.
+    """)
+
+
+@timed_fragment("2. RAI · 시그널 설정 (주기/성향/가중치)")
+def signal_section(Xz, qqq_c, days_all):
+    st.markdown("### ⚙️ 리밸런싱 파라미터 및 성향 설정")
+    col1, col2, col3 = st.columns(3)
+    rebal_freq = col1.selectbox("리밸런싱 기준일", REBAL_FREQS)
+    rebal_freq_val = rebal_freq.split(" ")[0]
+    strategy = col2.selectbox("💡 투자 성향 조절", STRATEGIES, index=1)
+    weight_mode = col3.selectbox(
+        "🧮 RAI 가중치", WEIGHT_MODES,
+        help=f"워크포워드: 리밸런싱일마다 그때까지 확정된 데이터로 Ridge 가중치를 다시 추정합니다. (목표: QQQ {DEFAULT_HORIZON}거래일 후 수익률)"
+    )
+
+    weights, rai, q = rai_signal(Xz, qqq_c, days_all, weight_mode, rebal_freq_val)
+    target_w_series = q.apply(lambda x: quantile_to_weight(x, strategy))
+
+    position_section(rai, q, target_w_series, qqq_c, days_all, rebal_freq_val, strategy)
+
+    st.markdown("#### 📈 최근 1년 RAI 및 목표 비중 추이")
+    plot_days = days_all[-252:]
+    
+    chart_col1, chart_col2 = st.columns(2)
+    with chart_col1:
+        st.caption("RAI (Risk Appetite Index) 추이")
+        st.line_chart(rai.reindex(plot_days))
+    with chart_col2:
+        st.caption("자동 산출된 목표 비중 (%) 추이")
+        st.line_chart(target_w_series.reindex(plot_days) * 100)
+
+    if isinstance(weights, pd.DataFrame):
+        with st.expander("🧮 워크포워드 Ridge 가중치 추이", expanded=False):
+            fitted = weights.dropna(how="all")
+            if fitted.empty:
+                st.info("재추정에 필요한 학습 데이터가 아직 부족합니다.")
+            else:
+                st.caption(f"첫 재추정일: {fitted.index[0].strftime('%Y-%m-%d')} · 리밸런싱 주기({rebal_freq_val})마다 갱신")
+                st.line_chart(fitted)
+                st.dataframe(pd.DataFrame({"고정 (W_FULL)": W_FULL, "현재 (워크포워드)": weights.iloc[-1]}).round(4), use_container_width=True)
+
+
+@timed_fragment("2. RAI · 포지션/액션 (금액/현재 비중)")
+def position_section(rai, q, target_w_series, qqq_c, days_all, rebal_freq_val, strategy):
+    col1, col2 = st.columns(2)
+    port_val = col1.number_input("현재 포트폴리오 금액 ($)", min_value=100, value=10000, step=100)
+    cur_q_weight = col2.number_input("현재 QQQ 비중 (0.0~1.0)", min_value=0.0, max_value=1.0, value=0.70, step=0.05)
+
+    latest_dt = days_all[-1]
+    rai_today = rai.iloc[-1]
+    q_today = q.iloc[-1]
+    target_today = target_w_series.iloc[-1]
+    is_today_exec = is_exec_day(latest_dt, days_all, rebal_freq_val)
+
+    st.markdown("---")
+    st.markdown(f"### 💡 오늘의 포지션 시그널 (기준일: {latest_dt.strftime('%Y-%m-%d')})")
+    
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("오늘의 RAI (위험선호도)", f"{rai_today:.3f}")
+    c2.metric("RAI 백분위 (최근 2년 상대평가)", f"{q_today*100:.1f}%")
+    c3.metric(f"목표 비중 ({strategy.split(' ')[1]})", f"{target_today*100:.0f}%", f"현재 {cur_q_weight*100:.0f}%")
+    
+    delta = target_today - cur_q_weight
+    dollars = delta * port_val
+
+    if not is_today_exec:
+        c4.metric("오늘의 Action", "HOLD", "실행일 아님(보류)")
+        st.info(f"선택하신 주기에 따르면 오늘은 리밸런싱 실행일이 아닙니다. 다음 **{rebal_freq_val}** 일정에 맞추어 아래 표적을 고려하세요.")
+    else:
+        if abs(delta) < 0.01:
+            c4.metric("오늘의 Action", "HOLD", "목표 비중과 일치")
+            st.success("✅ 이미 목표 비중에 도달해 있으므로 오늘은 매매할 필요가 없습니다.")
+        elif delta > 0:
+            c4.metric("오늘의 Action", "BUY (매수)", f"+${abs(dollars):,.0f}")
+            st.error(f"📈 **비중 확대 신호:** 평가금액 기준 약 **${abs(dollars):,.0f}** 규모의 주식을 추가 매수하세요.")
+        else:
+            c4.metric("오늘의 Action", "SELL (매도)", f"-${abs(dollars):,.0f}")
+            st.warning(f"📉 **비중 축소 신호:** 평가금액 기준 약 **${abs(dollars):,.0f}** 규모의 주식을 매도하여 현금을 확보하세요.")
+
+    st.markdown("#### 📅 최근 20거래일 시그널 스냅샷")
+    snap_days = days_all[-20:]
+    snap_data = []
+    temp_w = cur_q_weight
+    
+    for dt in snap_days:
+        tw = target_w_series.loc[dt]
+        exec_today = is_exec_day(dt, days_all, rebal_freq_val)
+        diff = tw - temp_w
+        
+        if exec_today:
+            if abs(diff) < 0.01: act_str = "HOLD"
+            elif diff > 0: act_str = f"BUY (+{diff*100:.0f}%p)"
+            else: act_str = f"SELL ({diff*100:.0f}%p)"
+            temp_w = tw
+        else:
+            if abs(diff) < 0.01: act_str = "HOLD [Sched]"
+            elif diff > 0: act_str = f"BUY (+{diff*100:.0f}%p) [Sched]"
+            else: act_str = f"SELL ({diff*100:.0f}%p) [Sched]"
+
+        snap_data.append({
+            "날짜": dt.strftime('%Y-%m-%d'),
+            "QQQ 종가": round(qqq_c.loc[dt], 2),
+            "RAI 지수": round(rai.loc[dt], 3),
+            "분위수": round(q.loc[dt], 3),
+            "목표 비중": f"{tw*100:.0f}%",
+            "액션": act_str
+        })
+    
+    st.dataframe(pd.DataFrame(snap_data).set_index("날짜"), use_container_width=True)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 정렬된 가격 패널 (여러 티커를 하나의 달력에 한 번에 정렬)
+# ============================================================
+# calendar 옵션
+#   "union"    : 어느 한 티커라도 거래된 모든 날짜 (암호화폐 주말 포함)
+#   "trading"  : union 에서 주말 제외 (모든 티커가 주말에도 거래되는 경우에만 주말 유지)
+#   "SPY" 등   : 특정 티커가 거래된 날짜
+#   DatetimeIndex : 지정한 날짜 그대로
+CALENDARS = ("union", "trading")
+
+
+class PricePanel:
+    # prices   : 달력에 정렬 + 상장 이후 구간만 직전 값으로 채운 가격 (상장 전은 NaN)
+    # observed : 해당 날짜에 실제 가격이 있었는지 (채운 값이 아닌지)
+    # listed   : 해당 날짜에 이미 상장되어 사용 가능한지 (inception 이후)
+    def __init__(self, prices, observed, listed, inception):
+        self.prices = prices
+        self.observed = observed
+        self.listed = listed
+        self.inception = inception
+
+    @property
+    def index(self):
+        return self.prices.index
+
+    @property
+    def columns(self):
+        return self.prices.columns
+
+    def common_start(self, tickers=None):
+        # 지정한 티커가 모두 상장된 첫 날짜 (기존 dropna() 방식의 시작일)
+        inception = self.inception if tickers is None else self.inception.reindex(tickers)
+        return inception.max()
+
+    def late_starters(self, start=None):
+        # start(기본: 달력 시작일) 이후에 상장되어 앞 구간 데이터가 없는 티커 -> 상장일
+        start = self.index[0] if start is None else pd.Timestamp(start)
+        return self.inception[self.inception.isna() | (self.inception > start)]
+
+
+def resolve_calendar(raw: pd.DataFrame, calendar) -> pd.DatetimeIndex:
+    if isinstance(calendar, pd.DatetimeIndex):
+        return calendar
+    observed_any = raw.notna().any(axis=1)
+    if calendar == "union":
+        return raw.index[observed_any.to_numpy()]
+    if calendar == "trading":
+        weekend = raw.index.weekday >= 5
+        trades_weekends = (raw[weekend].notna().any(axis=0) | raw.isna().all(axis=0)).all()
+        keep = observed_any.to_numpy() if trades_weekends else observed_any.to_numpy() & ~weekend
+        return raw.index[keep]
+    if calendar in raw.columns:
+        return raw.index[raw[calendar].notna().to_numpy()]
+    raise ValueError(f"알 수 없는 달력: {calendar}")
+
+
+def build_price_panel(raw: pd.DataFrame, calendar="union", start=None, end=None) -> PricePanel:
+    # raw: yf.download(...)['Close'] 처럼 날짜 x 티커 형태 (NaN 허용)
+    cal = resolve_calendar(raw, calendar)
+    if start is not None:
+        cal = cal[cal >= pd.Timestamp(start)]
+    if end is not None:
+        cal = cal[cal <= pd.Timestamp(end)]
+
+    # 달력 밖 날짜의 가격도 다음 달력일로 이월되도록 원본 기준으로 forward-fill 위치 계산
+    src = raw.to_numpy(dtype=float)
+    n_src, k = src.shape
+    valid = ~np.isnan(src)
+    last_pos = np.where(valid, np.arange(n_src)[:, None], -1)
+    np.maximum.accumulate(last_pos, axis=0, out=last_pos)
+
+    rows = raw.index.get_indexer(cal)
+    exact = rows >= 0
+    if not exact.all():
+        # 원본에 없는 날짜는 그 직전 원본 날짜 기준으로 채움
+        rows = np.where(rows >= 0, rows, raw.index.searchsorted(cal, side="right") - 1)
+    pos = np.where(rows[:, None] >= 0, last_pos[np.maximum(rows, 0)], -1)
+
+    cols = np.arange(k)
+    listed = pos >= 0
+    values = np.where(listed, src[np.maximum(pos, 0), cols], np.nan)
+    observed = listed & exact[:, None] & (pos == rows[:, None])
+
+    first_valid = np.where(valid.any(axis=0), valid.argmax(axis=0), -1)
+    inception = pd.Series(raw.index.take(np.maximum(first_valid, 0)), index=raw.columns).where(first_valid >= 0)
+    return PricePanel(
+        prices=pd.DataFrame(values, index=cal, columns=raw.columns),
+        observed=pd.DataFrame(observed, index=cal, columns=raw.columns),
+        listed=pd.DataFrame(listed, index=cal, columns=raw.columns),
+        inception=inception,
+    )
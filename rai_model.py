@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+from panel import build_price_panel
+from indicators import realized_vol, trend_gap, adx
+from compute_backend import get_backend
+
+# ============================================================
+# RAI(위험 선호 지수) 가중치 모델 - 고정 가중치 / 워크포워드 Ridge 재추정
+# ============================================================
+# 워크포워드: 각 리밸런싱일 t 에 "그날까지 결과(h일 후 수익률)가 확정된 표본"만으로 Ridge 를 다시 추정합니다.
+# 표본 s 의 결과는 s+h 일에 확정되므로 (x x', x y, x, y, 1) 을 s+h 위치에 더한 누적합이 곧 t 시점의 Gram 행렬이며,
+#   확장 윈도우: S[t]           롤링 윈도우(L): S[t] - S[t-L]
+# 로 날짜마다 처음부터 다시 적합하지 않고 (k x k) 연립방정식만 한 번에(batch) 풉니다.
+MIN_FEATURES = 4          # RAI 계산에 필요한 최소 유효 피처 수
+DEFAULT_HORIZON = 20      # 목표 변수: h 거래일 후 로그수익률
+DEFAULT_ALPHA = 1.0       # Ridge 벌점 (z-score 피처 기준)
+MIN_TRAIN_OBS = 252       # 첫 재추정에 필요한 최소 표본 수
+PERCENTILE_WINDOW = 252 * 2  # RAI 백분위 평가 구간 (최근 2년)
+
+
+def rebalance_mask(index: pd.DatetimeIndex, freq) -> np.ndarray:
+    # "D" 매일 / "W-FRI" 금요일 / "M" 월 마지막 거래일
+    if freq == "D":
+        return np.ones(len(index), dtype=bool)
+    if freq == "W-FRI":
+        return np.asarray(index.weekday == 4)
+    if freq == "M":
+        month = index.year * 12 + index.month
+        return np.r_[month[1:] != month[:-1], True] if len(index) else np.zeros(0, dtype=bool)
+    raise ValueError(f"알 수 없는 리밸런싱 주기: {freq}")
+
+
+def forward_log_return(prices: pd.Series, horizon=DEFAULT_HORIZON) -> np.ndarray:
+    values = prices.to_numpy(dtype=float)
+    out = np.full(len(values), np.nan)
+    if len(values) > horizon:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[:-horizon] = np.log(values[horizon:] / values[:-horizon])
+    return out
+
+
+def walk_forward_ridge(X: pd.DataFrame, y, rebalance, horizon=DEFAULT_HORIZON, window=None,
+                       alpha=DEFAULT_ALPHA, min_obs=MIN_TRAIN_OBS) -> pd.DataFrame:
+    # X: (날짜 x 피처) z-score, y: 각 날짜의 h일 후 수익률, rebalance: 재추정일 bool 마스크
+    # window: None 이면 확장 윈도우, 정수면 최근 window 개 표본(표본 날짜 기준)만 사용
+    # 반환: (날짜 x 피처) 시변 가중치. 재추정일 사이에는 직전 가중치 유지, 첫 재추정 전은 NaN
+    x = X.to_numpy(dtype=float)
+    y = np.asarray(y, dtype=float)
+    n, k = x.shape
+    ok = ~np.isnan(x).any(axis=1) & ~np.isnan(y)
+    xs = np.where(ok[:, None], x, 0.0)
+    ys = np.where(ok, y, 0.0)
+
+    # 표본 s 의 기여분을 결과 확정일 s+h 위치로 옮겨 누적 (rank-1 갱신의 누적합)
+    def arrived(a):
+        out = np.zeros_like(a)
+        if n > horizon:
+            out[horizon:] = a[:n - horizon]
+        return np.cumsum(out, axis=0)
+
+    XtX = arrived(xs[:, :, None] * xs[:, None, :])
+    Xty = arrived(xs * ys[:, None])
+    Sx = arrived(xs)
+    Sy = arrived(ys)
+    cnt = arrived(ok.astype(float))
+    if window is not None and n > window:
+        for a in (XtX, Xty, Sx, Sy, cnt):
+            a[window:] = a[window:] - a[:-window].copy()
+
+    fit = np.flatnonzero(np.asarray(rebalance, dtype=bool) & (cnt >= max(min_obs, k + 1)))
+    weights = np.full((n, k), np.nan)
+    if len(fit):
+        m = cnt[fit]
+        mx = Sx[fit] / m[:, None]
+        my = Sy[fit] / m
+        # 절편은 벌점 없이 평균 중심화로 처리: (Xc'Xc / m + alpha I) w = Xc'yc / m
+        G = XtX[fit] / m[:, None, None] - mx[:, :, None] * mx[:, None, :] + alpha * np.eye(k)
+        b = Xty[fit] / m[:, None] - mx * my[:, None]
+        weights[fit] = np.linalg.solve(G, b[:, :, None])[:, :, 0]
+    return pd.DataFrame(weights, index=X.index, columns=X.columns).ffill()
+
+
+def risk_appetite_index(Xz: pd.DataFrame, weights, min_features=MIN_FEATURES) -> pd.Series:
+    # weights: 피처별 고정 가중치(Series) 또는 (날짜 x 피처) 시변 가중치(DataFrame)
+    # 결측 피처가 있는 날은 남은 피처 가중치를 |가중치| 합계가 같아지도록 확대, 유효 피처가 min_features 미만이면 NaN
+    x = Xz.to_numpy(dtype=float)
+    if isinstance(weights, pd.DataFrame):
+        w = weights.reindex(index=Xz.index, columns=Xz.columns).to_numpy(dtype=float)
+    else:
+        w = np.broadcast_to(weights.reindex(Xz.columns).to_numpy(dtype=float), x.shape)
+    avail = ~np.isnan(x)
+    abs_w = np.abs(w)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = abs_w.sum(axis=1) / np.where(avail, abs_w, 0.0).sum(axis=1)
+        rai = np.where(avail, x * w, 0.0).sum(axis=1) * scale
+    rai[(avail.sum(axis=1) < min_features) | np.isnan(w).any(axis=1)] = np.nan
+    return pd.Series(rai, index=Xz.index, name="RAI")
+
+
+# ============================================================
+# RAI 피처 / 백분위 / 목표 비중 (Streamlit 2페이지, api_server.py 공용)
+# ============================================================
+RAI_TICKERS = ["SPY", "QQQ", "IWM", "HYG", "LQD", "XLY", "XLP", "^VIX", "^VIX3M"]
+STRATEGIES = ["🛡️ 방어형 (하락 시 현금 80%)", "⚖️ 중립형 (기본, 하락 시 현금 60%)", "🔥 공격형 (하락 시 현금 40%)"]
+
+W_FULL = pd.Series({
+    "vix_level": 0.0087, "small_big": 0.0079, "realized_vol20": 0.0033,
+    "cyc_def": 0.0023, "adx14": 0.0007, "vix_term": -0.0044,
+    "credit_risk": -0.0147, "trend_200": -0.0162
+})
+DIRECTION = {
+    "vix_level": -1, "vix_term": -1, "realized_vol20": -1, "credit_risk": +1,
+    "cyc_def": +1, "small_big": +1, "trend_200": +1, "adx14": +1
+}
+
+
+def quantile_to_weight(q: float, strat: str) -> float:
+    if "방어형" in strat:
+        if q <= 0.10: return 0.20
+        elif q <= 0.25: return 0.40
+        elif q <= 0.50: return 0.60
+        elif q <= 0.75: return 0.80
+        else: return 1.00
+    elif "공격형" in strat:
+        if q <= 0.10: return 0.60
+        elif q <= 0.25: return 0.70
+        elif q <= 0.50: return 0.80
+        elif q <= 0.75: return 0.90
+        else: return 1.00
+    else: 
+        if q <= 0.10: return 0.40
+        elif q <= 0.25: return 0.55
+        elif q <= 0.50: return 0.70
+        elif q <= 0.75: return 0.85
+        else: return 1.00
+
+
+def rai_features(close_prices, high_prices, low_prices):
+    # SPY 거래일 기준으로 RAI 입력 티커를 한 번에 정렬 (상장 전 구간은 NaN 유지)
+    panel = build_price_panel(close_prices.reindex(columns=RAI_TICKERS), calendar="SPY")
+    px = panel.prices
+    spy_c = px["SPY"]
+    spy_h = high_prices["SPY"].reindex(panel.index)
+    spy_l = low_prices["SPY"].reindex(panel.index)
+    
+    qqq_c, iwn_c, hyg_c, lqd_c = px["QQQ"], px["IWM"], px["HYG"], px["LQD"]
+    xly_c, xlp_c, vix_c, vix3m = px["XLY"], px["XLP"], px["^VIX"], px["^VIX3M"]
+
+    feat = pd.DataFrame(index=spy_c.index)
+    feat["vix_level"] = vix_c
+    feat["vix_term"] = vix_c / vix3m
+    feat["realized_vol20"] = realized_vol(spy_c.to_numpy(), 20)
+    feat["credit_risk"] = hyg_c / lqd_c
+    feat["cyc_def"] = xly_c / xlp_c
+    feat["small_big"] = iwn_c / spy_c
+    feat["trend_200"] = trend_gap(spy_c.to_numpy(), 200)
+    # 기존 가중치(W_FULL)가 단순 이동평균 기반 ADX 로 추정되었으므로 smoothing="sma" 유지
+    feat["adx14"] = adx(spy_h.to_numpy(), spy_l.to_numpy(), spy_c.to_numpy(), 14, smoothing="sma")
+
+    # 8개 피처의 252일 z-score 를 한 번에 계산 (연산 백엔드: MDD_COMPUTE_BACKEND)
+    direction = np.array([DIRECTION[c] for c in feat.columns], dtype=float)
+    Xz = get_backend().rolling_zscore(feat * direction, 252)
+
+    days_all = qqq_c.dropna().index
+    return Xz.reindex(days_all)[W_FULL.index], qqq_c.reindex(days_all), days_all
+
+
+def rai_percentile(rai: pd.Series, window=PERCENTILE_WINDOW) -> pd.Series:
+    # 최근 window 일 중 오늘 RAI 이하인 비율 (데이터가 window 일 미만인 초기 구간은 확장 윈도우)
+    q_exp = rai.expanding(min_periods=1).apply(lambda x: (x <= x[-1]).mean(), raw=True)
+    q_roll = rai.rolling(window).apply(lambda x: (x <= x[-1]).mean(), raw=True)
+    return q_roll.fillna(q_exp)
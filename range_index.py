@@ -0,0 +1,204 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from drawdown import SUMMARY_COLUMNS, ROLLING_MDD_YEARS, classify_status, rows_per_year
+from event_study import data_version
+
+# ============================================================
+# 구간 질의 인덱스: 임의 기간의 최고가/최저가/MDD, 과거 기준일 시점의 상태
+# ============================================================
+# 티커별로 한 번 만들어 두면 기준일/기간이 바뀌어도 가격 이력을 다시 훑지 않습니다.
+#   세그먼트 트리 노드 = 구간 집계 (최고가, 최저가, 구간 MDD) + 각 값의 위치
+#   앞 구간 A, 뒤 구간 B 결합: MDD = min(A.mdd, B.mdd, B.최저가 / A.최고가 - 1)  (rolling_mdd_values 와 같은 결합 법칙)
+#   임의 기간 질의 O(log n), 기준일 시점 하락률/누적 MDD/마지막 고점은 누적 배열 + 날짜 이진 탐색 O(log n)
+INDEX_CACHE_SIZE = 4
+
+
+def _pick(cond, a, b):
+    return a if cond else b
+
+
+def _merge(a, b, where=np.where):
+    # 집계 = (최고가, 위치, 최저가, 위치, MDD 비율, MDD 고점 위치, MDD 저점 위치). where 를 바꾸면 스칼라/배열 모두 사용
+    a_hi, a_hi_pos, a_lo, a_lo_pos, a_mdd, a_peak, a_trough = a
+    b_hi, b_hi_pos, b_lo, b_lo_pos, b_mdd, b_peak, b_trough = b
+    cross = b_lo / a_hi - 1.0
+    use_cross = cross < a_mdd
+    mdd = where(use_cross, cross, a_mdd)
+    peak = where(use_cross, a_hi_pos, a_peak)
+    trough = where(use_cross, b_lo_pos, a_trough)
+    use_b = b_mdd < mdd
+    take_hi = b_hi >= a_hi    # 같은 최고가면 나중 날짜 (drawdown_summary 의 마지막 고점과 같은 기준)
+    take_lo = b_lo < a_lo
+    return (
+        where(take_hi, b_hi, a_hi), where(take_hi, b_hi_pos, a_hi_pos),
+        where(take_lo, b_lo, a_lo), where(take_lo, b_lo_pos, a_lo_pos),
+        where(use_b, b_mdd, mdd), where(use_b, b_peak, peak), where(use_b, b_trough, trough),
+    )
+
+
+class DrawdownIndex:
+    # 한 티커의 가격 이력(결측 제외)으로 만든 인덱스
+    def __init__(self, prices: pd.Series):
+        prices = prices.dropna()
+        self.dates = prices.index
+        p = prices.to_numpy(dtype=float)
+        n = len(p)
+        rows = np.arange(n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            peak = np.maximum.accumulate(p) if n else p
+            self.prices = p
+            self.dd = (p / peak - 1.0) * 100
+        self.mdd_to_date = np.minimum.accumulate(self.dd) if n else self.dd
+        self.peak_pos = np.maximum.accumulate(np.where(p == peak, rows, -1)) if n else rows
+
+        # 세그먼트 트리: 리프는 [size, 2 * size), 빈 리프는 마지막 가격으로 채움 (질의 범위에는 포함되지 않음)
+        size = 1
+        while size < n:
+            size *= 2
+        self.size = size
+        leaf_p = np.concatenate([p, np.full(size - n, p[-1] if n else np.nan)])
+        leaf_pos = np.concatenate([rows, np.full(size - n, max(n - 1, 0))])
+        tree = [np.empty(2 * size, dtype=a.dtype) for a in (leaf_p, leaf_pos, leaf_p, leaf_pos, leaf_p, leaf_pos, leaf_pos)]
+        for arr, leaf in zip(tree, (leaf_p, leaf_pos, leaf_p, leaf_pos, np.zeros(size), leaf_pos, leaf_pos)):
+            arr[size:] = leaf
+        width = size // 2
+        while width >= 1:
+            # 한 층을 한 번에 결합 (자식: 2i, 2i + 1)
+            left = tuple(arr[2 * width:4 * width:2] for arr in tree)
+            right = tuple(arr[2 * width + 1:4 * width:2] for arr in tree)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                merged = _merge(left, right)
+            for arr, values in zip(tree, merged):
+                arr[width:2 * width] = values
+            width //= 2
+        self.tree = tree
+
+    def __len__(self):
+        return len(self.prices)
+
+    def position(self, date) -> int:
+        # date 이전(포함) 마지막 가격의 위치, 없으면 -1
+        return int(self.dates.searchsorted(pd.Timestamp(date), side="right")) - 1
+
+    def _node(self, i):
+        return tuple(arr[i] for arr in self.tree)
+
+    def query(self, i, j):
+        # 위치 i ~ j (포함) 구간 집계 (_merge 와 같은 튜플, MDD 는 비율)
+        left = right = None
+        lo, hi = i + self.size, j + self.size + 1
+        while lo < hi:
+            if lo & 1:
+                node = self._node(lo)
+                left = node if left is None else _merge(left, node, _pick)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                node = self._node(hi)
+                right = node if right is None else _merge(node, right, _pick)
+            lo >>= 1
+            hi >>= 1
+        if left is None or right is None:
+            return left if right is None else right
+        return _merge(left, right, _pick)
+
+    def range_stats(self, start=None, end=None):
+        # start ~ end (날짜 포함) 기간의 최고가/최저가/MDD/수익률. 기간 안에 가격이 없으면 None
+        i = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        j = len(self) - 1 if end is None else self.position(end)
+        if i > j:
+            return None
+        hi, hi_pos, lo, lo_pos, mdd, peak, trough = self.query(i, j)
+        return {
+            "start": self.dates[i], "end": self.dates[j],
+            "high": float(hi), "high_date": self.dates[hi_pos],
+            "low": float(lo), "low_date": self.dates[lo_pos],
+            "mdd": float(mdd) * 100, "peak_date": self.dates[peak], "trough_date": self.dates[trough],
+            "return": float(self.prices[j] / self.prices[i] - 1) * 100,
+        }
+
+
+class PanelIndex:
+    # (날짜 x 티커) 종가 패널 전체. 티커별 인덱스는 처음 조회할 때 생성
+    def __init__(self, close_prices: pd.DataFrame):
+        self.close = close_prices
+        self.dates = close_prices.index
+        self._tickers = {}
+        self._lock = threading.Lock()
+
+    def ticker(self, ticker) -> DrawdownIndex:
+        index = self._tickers.get(ticker)
+        if index is None:
+            index = DrawdownIndex(self.close[ticker])
+            with self._lock:
+                index = self._tickers.setdefault(ticker, index)
+        return index
+
+    def range_stats(self, ticker, start=None, end=None):
+        return self.ticker(ticker).range_stats(start, end)
+
+    def summary_asof(self, asof=None, tickers=None, years=None) -> pd.DataFrame:
+        # drawdown_summary(close_prices.loc[:asof]) 와 같은 표를 다시 계산하지 않고 인덱스 질의로 구성
+        years = ROLLING_MDD_YEARS if years is None else years
+        tickers = list(self.close.columns) if tickers is None else [t for t in tickers if t in self.close.columns]
+        columns = SUMMARY_COLUMNS + [f"mdd_{label}" for label in years]
+        end = len(self.dates) - 1 if asof is None else int(self.dates.searchsorted(pd.Timestamp(asof), side="right")) - 1
+        if end < 0:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name="ticker"))
+
+        # 최근 N년 구간: 기준일까지의 달력으로 구간 길이(행 수)를 정하고, 구간 첫날 이전 마지막 가격부터 포함 (ffill 과 같은 값)
+        per_year = rows_per_year(self.dates[:end + 1])
+        window_start = {}
+        for label, y in years.items():
+            w = int(round(y * per_year))
+            window_start[label] = self.dates[end - w + 1] if 0 < w <= end + 1 else None
+
+        rows = {}
+        for t in tickers:
+            index = self.ticker(t)
+            pos = index.position(self.dates[end])
+            if pos < 0:
+                continue
+            price = index.prices[pos]
+            prev = index.prices[pos - 1] if pos > 0 else price
+            last_peak = index.dates[index.peak_pos[pos]]
+            row = {
+                "price": price,
+                "daily_return": (price / prev - 1) * 100,
+                "current_dd": index.dd[pos],
+                "mdd": index.mdd_to_date[pos],
+                "last_peak": last_peak,
+                "ongoing_days": (index.dates[pos] - last_peak).days,
+                "status_level": classify_status(index.dd[pos]),
+            }
+            for label, start in window_start.items():
+                s = -1 if start is None else index.position(start)
+                row[f"mdd_{label}"] = float(index.query(s, pos)[4]) * 100 if s >= 0 else np.nan
+            rows[t] = row
+
+        summary = pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+        summary["last_peak"] = pd.DatetimeIndex(summary["last_peak"])
+        summary = summary.astype({"ongoing_days": int, "status_level": int})
+        summary.index.name = "ticker"
+        return summary
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def panel_index(close_prices: pd.DataFrame, version=None) -> PanelIndex:
+    # 데이터 버전별 인덱스 (Streamlit 세션 / Tk 새로고침 / 기준일 변경 간 공유)
+    version = data_version(close_prices) if version is None else version
+    with _cache_lock:
+        if version in _cache:
+            _cache.move_to_end(version)
+            return _cache[version]
+        index = _cache[version] = PanelIndex(close_prices)
+        while len(_cache) > INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
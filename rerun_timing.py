@@ -0,0 +1,56 @@
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+# ============================================================
+# 재실행 구간별 소요 시간 측정 (전체 스크립트 / 각 fragment)
+# ============================================================
+# 위젯 조작 시 fragment 안의 위젯이면 그 fragment 만, 그 외에는 전체 스크립트가 다시 실행됩니다.
+# 구간(scope)별로 최근 실행 시간을 세션에 모아 사이드바 표로 보여주므로 상호작용 종류별 지연을 비교할 수 있습니다.
+TIMINGS_KEY = "_rerun_timings"
+MAX_SAMPLES = 50
+
+
+@contextmanager
+def timed(scope):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        samples = st.session_state.setdefault(TIMINGS_KEY, {}).setdefault(scope, deque(maxlen=MAX_SAMPLES))
+        samples.append((time.perf_counter() - t0) * 1000)
+
+
+def timed_fragment(scope):
+    # @st.fragment + 실행 시간 기록
+    def decorator(fn):
+        @st.fragment
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timed(scope):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timing_table() -> pd.DataFrame:
+    rows = [
+        {"구간": scope, "횟수": len(s), "최근 (ms)": s[-1], "중앙값 (ms)": float(pd.Series(s).median()), "최대 (ms)": max(s)}
+        for scope, s in st.session_state.get(TIMINGS_KEY, {}).items() if s
+    ]
+    return pd.DataFrame(rows, columns=["구간", "횟수", "최근 (ms)", "중앙값 (ms)", "최대 (ms)"]).set_index("구간")
+
+
+def render_timing_panel():
+    # 전체 실행 시에만 갱신 (fragment 재실행 중에는 사이드바에 쓸 수 없음)
+    with st.sidebar.expander("⏱️ 재실행 시간 측정", expanded=False):
+        table = timing_table()
+        if table.empty:
+            st.caption("아직 측정된 실행이 없습니다.")
+        else:
+            st.dataframe(table.round(1), use_container_width=True)
+            st.caption("fragment 구간은 해당 영역의 위젯만 조작했을 때의 부분 재실행 시간입니다. (표는 다음 전체 실행 때 갱신)")
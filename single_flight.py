@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# ============================================================
+# 동시 요청 병합 (single-flight) + 만료 데이터 우선 제공 (stale-while-revalidate)
+# ============================================================
+# Streamlit 세션마다 같은 다운로드를 동시에 요청해도 키(티커, 기간)별로 실제 요청은 한 번만 나가고,
+# 나머지 호출은 그 결과를 기다렸다가 함께 받습니다 (캐시 만료 순간 데이터 제공자로 몰리는 중복 요청 방지).
+#   - 신선(ttl 이내)      : 저장된 값 그대로
+#   - 만료(stale_ttl 이내): 저장된 값을 바로 돌려주고, 백그라운드에서 한 번만 새로고침
+#   - 없음/너무 오래됨    : 진행 중인 요청이 있으면 기다리고, 없으면 직접 요청 (동시 호출은 모두 이 요청을 공유)
+# 실패(예외)는 기다리던 호출 모두에 전달하고 저장하지 않으므로 다음 호출이 다시 요청합니다.
+# 빈 결과(.empty)도 저장하지 않으며, 백그라운드 새로고침이 실패하거나 비어 있으면 이전 값을 계속 제공합니다.
+FETCH_TTL_ENV = "MDD_FETCH_TTL"
+FETCH_STALE_TTL_ENV = "MDD_FETCH_STALE_TTL"
+DEFAULT_TTL = 900
+DEFAULT_STALE_TTL = 24 * 3600
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, ttl=None, stale_ttl=None, max_entries=32):
+        self.ttl = float(os.environ.get(FETCH_TTL_ENV, DEFAULT_TTL)) if ttl is None else ttl
+        self.stale_ttl = float(os.environ.get(FETCH_STALE_TTL_ENV, DEFAULT_STALE_TTL)) if stale_ttl is None else stale_ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (저장 시각, 값)
+        self._inflight = {}             # key -> _Call
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "fetches": 0, "refreshes": 0, "coalesced_waits": 0, "wait_seconds": 0.0, "failures": 0}
+
+    def get(self, key, fetch, allow_stale=True):
+        # fetch(): 실제 요청. allow_stale=False 면 만료된 값 대신 새 값을 기다림 (이 값으로 다시 파생 결과를 만들 때)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = now - entry[0] if entry is not None else None
+            if entry is not None and age <= self.ttl:
+                self.stats["hits"] += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            call = self._inflight.get(key)
+            if allow_stale and entry is not None and age <= self.stale_ttl:
+                self.stats["stale_hits"] += 1
+                if call is None:
+                    self.stats["refreshes"] += 1
+                    call = self._inflight[key] = _Call()
+                    threading.Thread(target=self._run, args=(key, fetch, call), daemon=True, name=f"refresh {key!r}"[:60]).start()
+                return entry[1]
+            leader = call is None
+            if leader:
+                self.stats["fetches"] += 1
+                call = self._inflight[key] = _Call()
+            else:
+                self.stats["coalesced_waits"] += 1
+
+        if leader:
+            self._run(key, fetch, call)
+        else:
+            t0 = time.perf_counter()
+            call.done.wait()
+            with self._lock:
+                self.stats["wait_seconds"] += time.perf_counter() - t0
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def _run(self, key, fetch, call):
+        try:
+            call.value = fetch()
+        except Exception as e:
+            call.error = e
+        with self._lock:
+            if call.error is not None:
+                self.stats["failures"] += 1
+            elif not getattr(call.value, "empty", False):
+                self._entries[key] = (time.monotonic(), call.value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        call.done.set()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "inflight": len(self._inflight)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,263 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 프로세스 간 공유 스냅샷 (메모리 매핑, 역직렬화 없음)
+# ============================================================
+# 디렉터리 구조
+#   <root>/CURRENT                : 현재 버전 이름 (os.replace 로 원자적 교체)
+#   <root>/<version>/meta.json    : 날짜 수, 티커 목록, 생성 시각, 필드 목록
+#   <root>/<version>/index.npy    : 날짜 (datetime64[ns] 를 int64 로 저장)
+#   <root>/<version>/<field>.npy  : (날짜 x 티커) float64 C-order 배열 (close, high, low, drawdown ...)
+#   <root>/<version>/summary.arrow: 티커별 요약표 (비압축 Arrow IPC)
+#   <root>/<version>/quality.json : 데이터 품질 검증 결과 (data_quality.py, 다음 게시 때 이력이 같은 티커는 재사용)
+#   <root>/<version>/confirmed    : 같은 데이터를 다시 받은 시각 (mtime). 내용이 같으면 새 버전 대신 신선도만 갱신
+# 생성 시각(created)은 게시 시각이 아니라 원본을 다운로드한 시각이므로, 스냅샷 나이는 실제 데이터 나이와 같습니다.
+# 읽기는 np.load(mmap_mode="r") / pyarrow memory_map 이므로 여러 Streamlit 워커와 Tk 앱이 같은
+# 페이지 캐시를 공유하며, 워커를 늘려도 프로세스별 메모리는 늘지 않습니다.
+SNAPSHOT_DIR_ENV = "MDD_SNAPSHOT_DIR"
+SNAPSHOT_TTL_ENV = "MDD_SNAPSHOT_TTL"
+DEFAULT_TTL = 900
+KEEP_VERSIONS = 3
+
+_open_lock = threading.Lock()
+_opened = {}  # (root, version) -> Snapshot
+
+
+def snapshot_root():
+    return os.environ.get(SNAPSHOT_DIR_ENV) or None
+
+
+def snapshot_ttl():
+    return float(os.environ.get(SNAPSHOT_TTL_ENV, DEFAULT_TTL))
+
+
+class Snapshot:
+    def __init__(self, root, version):
+        self.root = root
+        self.version = version
+        self.path = os.path.join(root, version)
+        with open(os.path.join(self.path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.columns = pd.Index(self.meta["columns"])
+        self.index = pd.DatetimeIndex(np.load(os.path.join(self.path, "index.npy"), mmap_mode="r").view("datetime64[ns]"))
+        self._fields = {}
+        self._summary = None
+        self._quality = None
+
+    @property
+    def created(self):
+        # 게시 이후 같은 데이터를 다시 받아 확인했다면 그 다운로드 시각 (confirm_snapshot)
+        try:
+            confirmed = os.path.getmtime(os.path.join(self.path, "confirmed"))
+        except OSError:
+            confirmed = 0.0
+        return max(self.meta["created"], confirmed)
+
+    @property
+    def age(self):
+        return time.time() - self.created
+
+    @property
+    def fields(self):
+        return list(self.meta["fields"])
+
+    def array(self, field) -> np.ndarray:
+        # 읽기 전용 memmap (복사 없음)
+        if field not in self._fields:
+            self._fields[field] = np.load(os.path.join(self.path, f"{field}.npy"), mmap_mode="r")
+        return self._fields[field]
+
+    def frame(self, field) -> pd.DataFrame:
+        return pd.DataFrame(self.array(field), index=self.index, columns=self.columns, copy=False)
+
+    def summary(self) -> pd.DataFrame:
+        if self._summary is None:
+            import pyarrow as pa
+            path = os.path.join(self.path, "summary.arrow")
+            if not os.path.exists(path):
+                return None
+            with pa.memory_map(path, "r") as source:
+                self._summary = pa.ipc.open_file(source).read_all().to_pandas().set_index("ticker")
+        return self._summary
+
+    def quality(self):
+        if self._quality is None:
+            from data_quality import load_quality
+            self._quality = load_quality(os.path.join(self.path, "quality.json"))
+        return self._quality
+
+    def covers(self, tickers, start=None):
+        if start is not None and (len(self.index) == 0 or self.index[0] > pd.Timestamp(start) + pd.Timedelta(days=7)):
+            return False
+        return set(tickers).issubset(self.columns)
+
+    def is_fresh(self, ttl=None):
+        return self.age <= (snapshot_ttl() if ttl is None else ttl)
+
+
+def current_version(root):
+    try:
+        with open(os.path.join(root, "CURRENT"), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def open_snapshot(root=None):
+    # 현재 버전 스냅샷 (프로세스 내 버전별 1회만 매핑)
+    root = root or snapshot_root()
+    if not root:
+        return None
+    version = current_version(root)
+    if version is None:
+        return None
+    key = (root, version)
+    with _open_lock:
+        snap = _opened.get(key)
+        if snap is None:
+            try:
+                snap = Snapshot(root, version)
+            except FileNotFoundError:
+                return None
+            # 이전 버전 매핑은 해제 (이미 열어둔 참조는 그대로 유효)
+            for old in [k for k in _opened if k[0] == root]:
+                del _opened[old]
+            _opened[key] = snap
+    return snap
+
+
+def publish_snapshot(frames: dict, summary=None, root=None, keep=KEEP_VERSIONS, extra_meta=None, quality=None, created=None):
+    # frames: {필드명: DataFrame}, 모두 같은 index/columns 로 정렬되어 있어야 함
+    # created: 원본 다운로드 시각 (없으면 지금)
+    root = root or snapshot_root()
+    if not root:
+        return None
+    os.makedirs(root, exist_ok=True)
+
+    first = next(iter(frames.values()))
+    index, columns = first.index, first.columns
+    now_ns = time.time_ns()
+    version = time.strftime("v%Y%m%d-%H%M%S", time.localtime(now_ns / 1e9)) + f"-{now_ns % 1_000_000_000:09d}-{os.getpid()}"
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=root)
+
+    np.save(os.path.join(tmp_dir, "index.npy"), index.values.astype("datetime64[ns]").view("int64"))
+    for name, df in frames.items():
+        values = df.reindex(index=index, columns=columns).to_numpy(dtype=np.float64)
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(values))
+    if summary is not None:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(summary.reset_index(), preserve_index=False)
+        with pa.OSFile(os.path.join(tmp_dir, "summary.arrow"), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+    if quality is not None:
+        from data_quality import save_quality
+        save_quality(os.path.join(tmp_dir, "quality.json"), quality)
+    meta = {
+        "version": version,
+        "created": time.time() if created is None else created,
+        "columns": [str(c) for c in columns],
+        "fields": list(frames.keys()),
+        "start": str(index[0].date()) if len(index) else None,
+        "end": str(index[-1].date()) if len(index) else None,
+        **(extra_meta or {}),
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    # 1) 버전 디렉터리 확정 -> 2) CURRENT 포인터 원자적 교체
+    os.replace(tmp_dir, os.path.join(root, version))
+    pointer_tmp = os.path.join(root, f".CURRENT-{version}")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(root, "CURRENT"))
+
+    _prune_versions(root, keep)
+    return version
+
+
+def _prune_versions(root, keep):
+    # 오래된 버전 삭제 (이미 매핑한 프로세스는 파일이 지워져도 기존 매핑을 계속 읽을 수 있음)
+    current = current_version(root)
+    versions = sorted(d for d in os.listdir(root) if d.startswith("v") and os.path.isdir(os.path.join(root, d)))
+    for old in versions[:-keep]:
+        if old != current:
+            shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+
+def price_fields(df_raw) -> dict:
+    # yf.download 결과(MultiIndex 컬럼) -> {"close", "high", "low"}
+    if isinstance(df_raw.columns, pd.MultiIndex):
+        return {"close": df_raw["Close"], "high": df_raw["High"], "low": df_raw["Low"]}
+    return {"close": df_raw, "high": df_raw, "low": df_raw}
+
+
+def confirm_snapshot(snap, created):
+    # 현재 스냅샷과 같은 데이터를 더 나중에 받았을 때: 배열을 다시 쓰지 않고 신선도(created)만 갱신
+    path = os.path.join(snap.path, "confirmed")
+    with open(path, "a", encoding="utf-8"):
+        pass
+    os.utime(path, (created, created))
+
+
+def publish_price_fields(fields: dict, years=None, root=None, quality=None, created=None):
+    # 품질 검증이 끝난 {"close", "high", "low"} 패널 + 파생 분석(하락률, 요약표) 게시
+    # created: 원본 다운로드 시각. 현재 스냅샷이 같은 데이터(data_version)이거나 더 나중에 받은 데이터면 게시하지 않음 (None 반환)
+    from drawdown import drawdown_frame, drawdown_summary
+    from event_study import data_version
+
+    root = root or snapshot_root()
+    if not root:
+        return None
+    created = time.time() if created is None else created
+    version = data_version(fields["close"])
+    current = open_snapshot(root)
+    if current is not None and current.created >= created:
+        return None
+    if current is not None and current.meta.get("data_version") == version:
+        confirm_snapshot(current, created)
+        return None
+    frames = {**fields, "drawdown": drawdown_frame(fields["close"])}
+    return publish_snapshot(frames, summary=drawdown_summary(fields["close"]), root=root,
+                            extra_meta={"years": years, "data_version": version}, quality=quality, created=created)
+
+
+def publish_price_data(df_raw, years=None, root=None, quality=None, created=None):
+    # yf.download 결과를 품질 검증(수정/격리) 후 게시 (publish_price_fields)
+    # years: 조회 기간 (요약표가 어떤 기간 기준인지 소비자가 확인하는 데 사용)
+    # quality: 이미 검증한 결과 (없으면 현재 스냅샷의 결과를 재사용해 바뀐 티커만 검사)
+    from data_quality import validate_frames
+
+    if quality is None:
+        current = open_snapshot(root)
+        quality = current.quality() if current is not None else None
+    fields, quality, _ = validate_frames(price_fields(df_raw), quality)
+    return publish_price_fields(fields, years, root=root, quality=quality, created=created)
+
+if __name__ == "__main__":
+    # 사용법: MDD_SNAPSHOT_DIR=/srv/mdd python snapshot.py [조회 기간(년), 기본 20]
+    import yfinance as yf
+    from datetime import datetime
+    from dateutil.relativedelta import relativedelta
+    from universe import load_universe
+    from market_data import tickers_rebal
+
+    if not snapshot_root():
+        sys.exit(f"{SNAPSHOT_DIR_ENV} 환경변수로 스냅샷 디렉터리를 지정하세요.")
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    tickers = sorted(set(load_universe()["ticker"].tolist() + tickers_rebal))
+    end_date = datetime.today()
+    start_date = end_date - relativedelta(years=years)
+    downloaded_at = time.time()
+    df = yf.download(tickers, start=start_date.strftime('%Y-%m-%d'), end=end_date.strftime('%Y-%m-%d'), progress=False, auto_adjust=True)
+    version = publish_price_data(df, years, created=downloaded_at)
+    print(f"게시 완료: {version} ({len(tickers)}개 티커)" if version else "현재 스냅샷과 같은 데이터이거나 더 최신 스냅샷이 있어 게시하지 않았습니다.")
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 저장소 최상위 모듈(drawdown_rank.py 등)을 바로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def prices():
+    # 가상 종가 패널: 중간 상장 티커, 드문 결측, 큰 하락 구간 포함
+    rng = np.random.default_rng(7)
+    index = pd.bdate_range("2015-01-01", periods=1600)
+    values = 100 * np.exp(np.cumsum(rng.normal(0.0002, 0.02, (len(index), 5)), axis=0))
+    values[rng.random(values.shape) < 0.01] = np.nan
+    values[:300, 3] = np.nan
+    values[:5, 1] *= 3.0    # 창 맨 앞의 높은 고점: 창이 밀리면 사라져야 함
+    return pd.DataFrame(values, index=index, columns=["AAA", "BBB", "CCC", "DDD", "EEE"])
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from alerts import DrawdownAlertEngine
+from drawdown import STATUS_BUY, STATUS_CORRECTION
+
+
+def replay(prices, hysteresis=2.0):
+    engine = DrawdownAlertEngine(["AAA"], hysteresis)
+    engine.seed(pd.DataFrame({"AAA": [90.0, 100.0]}, index=pd.bdate_range("2024-01-01", periods=2)))
+    dates = pd.bdate_range("2024-01-03", periods=len(prices))
+    return engine, [[a["level"] for a in engine.update([p], d)] for p, d in zip(prices, dates)]
+
+
+def test_correction_band_alerts_once_per_peak():
+    # 고점 100: -10% 기준선 부근에서 오르내려도 🟡 한 번만 (해제/재진입은 알리지 않음)
+    _, fired = replay([89.9, 92.5, 89.5])
+    assert fired == [[STATUS_CORRECTION], [], []]
+
+
+def test_buy_band_alerts_once_per_peak():
+    _, fired = replay([79.0, 82.5, 79.5])
+    assert fired == [[STATUS_BUY], [], []]
+
+
+def test_new_high_starts_new_episode():
+    engine, fired = replay([89.9, 92.5, 101.0, 90.5])
+    assert fired == [[STATUS_CORRECTION], [], [], [STATUS_CORRECTION]]
+    assert engine.peak[0] == 101.0
+
+
+def test_dedup_survives_restart(tmp_path):
+    engine, _ = replay([89.9, 92.5])
+    path = tmp_path / "state.json"
+    engine.save(path)
+    restored = DrawdownAlertEngine(["AAA"])
+    assert restored.load(path) == []
+    assert restored.update([89.5]) == []
+    assert [a["level"] for a in restored.update([79.0])] == [STATUS_BUY]
+    assert np.array_equal(restored.sent_level, [STATUS_BUY])
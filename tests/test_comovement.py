@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from comovement import CoMovementState
+
+WINDOW = 120
+THRESHOLD = -10.0
+
+
+def rebuilt(prices):
+    state = CoMovementState(prices.columns, WINDOW, THRESHOLD)
+    state.rebuild(prices)
+    return state
+
+
+def assert_same_state(state, expected):
+    pd.testing.assert_frame_equal(state.correlation(), expected.correlation(), atol=1e-9)
+    pd.testing.assert_frame_equal(state.cooccurrence(), expected.cooccurrence(), atol=1e-12)
+    pd.testing.assert_frame_equal(state.cooccurrence(full_history=False), expected.cooccurrence(full_history=False), atol=1e-12)
+    pd.testing.assert_series_equal(state.underwater_now(), expected.underwater_now())
+
+
+def test_appended_rows_match_rebuild(prices):
+    state = CoMovementState(prices.columns, WINDOW, THRESHOLD)
+    state.sync(prices.iloc[:1500])
+    state.sync(prices.iloc[:1510])
+    assert_same_state(state, rebuilt(prices.iloc[:1510]))
+
+
+def test_sliding_window_matches_rebuild(prices):
+    state = CoMovementState(prices.columns, WINDOW, THRESHOLD)
+    state.sync(prices.iloc[:1500])
+    state.sync(prices.iloc[10:1501])
+    expected = rebuilt(prices.iloc[10:1501])
+    assert_same_state(state, expected)
+    assert state.stats["rebuilds"] == 1 and state.stats["slides"] == 1
+    # 앞 구간이 빠지면 결과가 실제로 달라지는 데이터인지 확인
+    assert not np.allclose(expected.cooccurrence(), rebuilt(prices.iloc[:1501]).cooccurrence(), equal_nan=True)
+
+
+def test_revised_last_bar_replaces_one_row(prices):
+    state = CoMovementState(prices.columns, WINDOW, THRESHOLD)
+    state.sync(prices.iloc[:1500])
+    revised = prices.iloc[:1500].copy()
+    revised.iloc[-1] = revised.iloc[-1] * [0.8, 1.0, 5.0, 1.1, np.nan]
+    state.sync(revised)
+    assert_same_state(state, rebuilt(revised))
+    assert state.stats["rebuilds"] == 1 and state.stats["revisions"] == 1
+
+
+def test_daily_updates_stay_incremental(prices):
+    # 매일 창이 하루씩 밀리고, 장중에는 마지막 봉이 여러 번 바뀌는 운영 패턴
+    state = CoMovementState(prices.columns, WINDOW, THRESHOLD)
+    state.sync(prices.iloc[:1300])
+    for day in range(1, 60):
+        for tick in (0.9, 1.05, 1.0):
+            window = prices.iloc[day:1300 + day].copy()
+            window.iloc[-1] *= tick
+            state.sync(window)
+        assert_same_state(state, rebuilt(window))
+    assert state.stats["rebuilds"] == 1
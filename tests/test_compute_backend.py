@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compute_backend import BACKENDS, NumpyBackend, get_backend
+
+WINDOW = 20
+# polars 는 자체 이동 분산(구간 추가/제거) 알고리즘이라 수준 대비 변동이 아주 작은 시계열에서는 ~eps * 수준/변동 오차
+ZSCORE_RTOL = {("polars", "drifting_level"): 1e-5}
+
+
+def make_backend(name):
+    # 설치되지 않은 라이브러리의 백엔드는 건너뜀
+    pytest.importorskip({"polars": "polars", "arrow": "pyarrow"}.get(name, "numpy"))
+    return BACKENDS[name]()
+
+
+def frame(n, seed=0, level=100.0):
+    rng = np.random.default_rng(seed)
+    values = level * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (n, 4)), axis=0))
+    return pd.DataFrame(values, index=pd.bdate_range("2020-01-01", periods=n), columns=["A", "B", "C", "D"])
+
+
+def with_gaps(df):
+    # 앞부분 결측(상장 전) + 중간 결측 + 전부 결측인 컬럼
+    df = df.copy()
+    df.iloc[:37, 1] = np.nan
+    df.iloc[[50, 51, 90], 2] = np.nan
+    df.iloc[:, 3] = np.nan
+    return df
+
+
+CASES = {
+    "plain": frame(300),
+    "gaps": with_gaps(frame(300, seed=1)),
+    "short": frame(WINDOW - 5, seed=2),
+    "exact_window": frame(WINDOW, seed=3),
+    "one_row": frame(1, seed=4),
+    # 수준이 매우 크고 계단식으로 바뀌는 시계열 (구간 내 변동은 작음): E[x^2] - 평균^2 방식이면 자릿수를 잃음
+    "drifting_level": pd.DataFrame(
+        1e9 + 1e7 * (np.arange(300)[:, None] // 60) + np.random.default_rng(5).normal(0, 1, (300, 4)),
+        index=pd.bdate_range("2020-01-01", periods=300), columns=["A", "B", "C", "D"],
+    ),
+}
+
+
+def assert_parity(expected: pd.DataFrame, actual: pd.DataFrame, rtol):
+    assert actual.shape == expected.shape
+    assert actual.index.equals(expected.index) and actual.columns.equals(expected.columns)
+    a, b = expected.to_numpy(), actual.to_numpy()
+    np.testing.assert_array_equal(np.isnan(a), np.isnan(b))
+    np.testing.assert_allclose(b, a, rtol=rtol, atol=rtol, equal_nan=True)
+
+
+@pytest.mark.parametrize("name", ["arrow", "polars"])
+@pytest.mark.parametrize("case", list(CASES))
+def test_rolling_zscore_matches_numpy(name, case):
+    backend = make_backend(name)
+    df = CASES[case]
+    rtol = ZSCORE_RTOL.get((name, case), 1e-8)
+    assert_parity(NumpyBackend().rolling_zscore(df, WINDOW), backend.rolling_zscore(df, WINDOW), rtol=rtol)
+
+
+@pytest.mark.parametrize("name", ["arrow", "polars"])
+@pytest.mark.parametrize("case", list(CASES))
+def test_drawdown_matches_numpy(name, case):
+    backend = make_backend(name)
+    df = CASES[case]
+    assert_parity(NumpyBackend().drawdown(df), backend.drawdown(df), rtol=1e-12)
+
+
+def test_numpy_zscore_matches_pandas_rolling():
+    df = CASES["gaps"]
+    mean = df.rolling(WINDOW).mean()
+    std = df.rolling(WINDOW).std(ddof=0)
+    assert_parity((df - mean) / std, NumpyBackend().rolling_zscore(df, WINDOW), rtol=1e-9)
+
+
+def test_unknown_backend_falls_back_to_numpy():
+    with pytest.warns(UserWarning):
+        assert get_backend("no-such-backend").name == "numpy"
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from data_quality import validate_frames
+
+
+def crash_panel():
+    # 하루 -50% 급락 후 그 수준 유지 (수정주가 데이터에서는 실제 하락)
+    index = pd.bdate_range("2024-01-01", periods=40)
+    btc = np.r_[np.linspace(100, 110, 20), np.linspace(55, 58, 20)]
+    spy = np.linspace(400, 420, 40)
+    return pd.DataFrame({"BTC-USD": btc, "SPY": spy}, index=index)
+
+
+def test_split_like_crash_is_reported_not_repaired():
+    close = crash_panel()
+    fields, state, _ = validate_frames({"close": close})
+    pd.testing.assert_frame_equal(fields["close"], close)
+    verdict = state["judged"]["BTC-USD"]
+    assert verdict["status"] == "warning" and "split 1" in verdict["issues"]
+
+
+def test_split_repair_is_opt_in():
+    # 수정주가가 아닌 원본을 검증할 때만: 이전 구간을 분할 비율만큼 소급 조정
+    close = crash_panel()
+    fields, state, _ = validate_frames({"close": close}, rules={"split": "repair"})
+    assert state["judged"]["BTC-USD"]["status"] == "repaired"
+    assert fields["close"]["BTC-USD"].iloc[0] == 50.0
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from drawdown_rank import DrawdownRanker
+
+
+def rebuilt(prices):
+    ranker = DrawdownRanker(prices.columns)
+    ranker.rebuild(prices)
+    return ranker.table()
+
+
+def test_appended_rows_match_rebuild(prices):
+    ranker = DrawdownRanker(prices.columns)
+    ranker.sync(prices.iloc[:1500])
+    ranker.sync(prices.iloc[:1510])
+    pd.testing.assert_frame_equal(ranker.table(), rebuilt(prices.iloc[:1510]), rtol=1e-9)
+
+
+def test_sliding_window_matches_rebuild(prices):
+    # 조회 창(오늘 - N년)이 밀려 앞 구간이 빠지는 경우
+    ranker = DrawdownRanker(prices.columns)
+    ranker.sync(prices.iloc[:1500])
+    ranker.sync(prices.iloc[10:1501])
+    expected = rebuilt(prices.iloc[10:1501])
+    pd.testing.assert_frame_equal(ranker.table(), expected, rtol=1e-9)
+    assert ranker.stats["rebuilds"] == 1 and ranker.stats["slides"] == 1
+    # 앞 구간이 빠지면 결과가 실제로 달라지는 데이터인지 확인
+    assert not np.allclose(expected["dd_percentile"], rebuilt(prices.iloc[:1501])["dd_percentile"])
+
+
+def test_changed_first_row_rebuilds(prices):
+    ranker = DrawdownRanker(prices.columns)
+    ranker.sync(prices.iloc[:1500])
+    revised = prices.iloc[:1505].copy()
+    revised.iloc[0] *= 0.5
+    ranker.sync(revised)
+    pd.testing.assert_frame_equal(ranker.table(), rebuilt(revised), rtol=1e-9)
+
+
+def test_revised_last_bar_replaces_one_row(prices):
+    # 장중 새로고침: 같은 날짜의 마지막 봉 값만 바뀜 (고점 갱신 / 결측 포함)
+    ranker = DrawdownRanker(prices.columns)
+    ranker.sync(prices.iloc[:1500])
+    revised = prices.iloc[:1500].copy()
+    revised.iloc[-1] = revised.iloc[-1] * [0.9, 1.0, 5.0, 1.1, np.nan]
+    ranker.sync(revised)
+    pd.testing.assert_frame_equal(ranker.table(), rebuilt(revised), rtol=1e-9)
+    assert ranker.stats["rebuilds"] == 1 and ranker.stats["revisions"] == 1
+
+
+def test_daily_updates_stay_incremental(prices):
+    # 매일 창이 하루씩 밀리고, 장중에는 마지막 봉이 여러 번 바뀌는 운영 패턴
+    ranker = DrawdownRanker(prices.columns)
+    ranker.sync(prices.iloc[:1300])
+    current = prices.copy()
+    for day in range(1, 60):
+        for tick in (0.97, 1.02, 1.0):
+            window = current.iloc[day:1300 + day].copy()
+            window.iloc[-1] *= tick
+            ranker.sync(window)
+        pd.testing.assert_frame_equal(ranker.table(), rebuilt(window), rtol=1e-9)
+    assert ranker.stats["rebuilds"] == 1
+    reference = DrawdownRanker(prices.columns)
+    reference.rebuild(window)
+    for a, b in zip(ranker._sorted, reference._sorted):
+        np.testing.assert_array_equal(a, b)
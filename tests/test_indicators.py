@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import realized_vol, trend_gap, adx, rolling_zscore
+
+# 기준: 커널 도입 전 app.py 의 RAI 피처 계산 (pandas rolling)
+
+
+def baseline_realized_vol(close: pd.Series):
+    return close.pct_change().rolling(20).std(ddof=0) * np.sqrt(252)
+
+
+def baseline_trend_gap(close: pd.Series):
+    return close / close.rolling(200).mean() - 1.0
+
+
+def baseline_adx(high: pd.Series, low: pd.Series, close: pd.Series):
+    up_move = high.diff()
+    down_move = -low.diff()
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+    tr1 = high - low
+    tr2 = (high - close.shift()).abs()
+    tr3 = (low - close.shift()).abs()
+    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    atr = tr.rolling(14).mean()
+    plus_di = 100 * pd.Series(plus_dm, index=close.index).rolling(14).mean() / atr
+    minus_di = 100 * pd.Series(minus_dm, index=close.index).rolling(14).mean() / atr
+    dx = (100 * (plus_di - minus_di).abs() / (plus_di + minus_di)).replace([np.inf, -np.inf], np.nan)
+    return dx.rolling(14).mean()
+
+
+def baseline_zscore(s: pd.Series, window=252):
+    m = s.rolling(window).mean()
+    sd = s.rolling(window).std(ddof=0)
+    return (s - m) / sd
+
+
+@pytest.fixture
+def ohlc():
+    # 앞부분 결측(상장 전) + 중간 결측이 있는 가상 일봉
+    rng = np.random.default_rng(11)
+    n = 1200
+    index = pd.bdate_range("2018-01-01", periods=n)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n)))
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    high = close + spread * rng.random(n)
+    low = close - spread * rng.random(n)
+    for a in (close, high, low):
+        a[:40] = np.nan
+        a[[300, 301, 302, 700, 950]] = np.nan
+    return pd.Series(close, index=index), pd.Series(high, index=index), pd.Series(low, index=index)
+
+
+def assert_same(expected: pd.Series, actual, rtol=1e-10):
+    actual = np.asarray(actual, dtype=float)
+    np.testing.assert_array_equal(np.isnan(actual), expected.isna().to_numpy())
+    np.testing.assert_allclose(actual, expected.to_numpy(), rtol=rtol, atol=1e-12, equal_nan=True)
+
+
+def test_realized_vol_matches_baseline(ohlc):
+    close, _, _ = ohlc
+    assert_same(baseline_realized_vol(close), realized_vol(close.to_numpy(), 20))
+
+
+def test_trend_gap_matches_baseline(ohlc):
+    close, _, _ = ohlc
+    assert_same(baseline_trend_gap(close), trend_gap(close.to_numpy(), 200))
+
+
+def test_adx_sma_matches_baseline(ohlc):
+    close, high, low = ohlc
+    assert_same(baseline_adx(high, low, close), adx(high.to_numpy(), low.to_numpy(), close.to_numpy(), 14, smoothing="sma"))
+
+
+def test_rolling_zscore_matches_baseline(ohlc):
+    close, high, low = ohlc
+    feats = pd.DataFrame({"ratio": high / low, "vol": baseline_realized_vol(close), "level": close})
+    z = rolling_zscore(feats.to_numpy(), 252)
+    for j, c in enumerate(feats.columns):
+        assert_same(baseline_zscore(feats[c]), z[:, j], rtol=1e-8)
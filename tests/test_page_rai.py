@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from page_rai import rai_signal, WEIGHT_MODES
+
+
+def test_revised_bar_invalidates_session_memo():
+    # 같은 마지막 날짜/길이라도 데이터가 바뀌면 (15분 새로고침으로 오늘 봉 수정) RAI 를 다시 계산
+    rng = np.random.default_rng(3)
+    days = pd.bdate_range("2020-01-01", periods=300)
+    Xz = pd.DataFrame(rng.normal(size=(300, 8)), index=days,
+                      columns=["vix_level", "vix_term", "realized_vol20", "credit_risk", "cyc_def", "small_big", "trend_200", "adx14"])
+    qqq_c = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300))), index=days)
+    _, rai, _ = rai_signal(Xz, qqq_c, days, WEIGHT_MODES[0], "D")
+
+    revised = Xz.copy()
+    revised.iloc[-1] += 1.0
+    _, rai2, _ = rai_signal(revised, qqq_c, days, WEIGHT_MODES[0], "D")
+    assert rai2.iloc[-1] != rai.iloc[-1]
+    assert rai_signal(revised, qqq_c, days, WEIGHT_MODES[0], "D")[1] is rai2
@@ -0,0 +1,50 @@
+import time
+
+import pandas as pd
+
+import market_data
+from snapshot import open_snapshot, publish_price_fields
+
+
+def fields_of(prices):
+    return {"close": prices, "high": prices, "low": prices}
+
+
+def test_created_is_download_time(tmp_path, prices):
+    downloaded_at = time.time() - 600
+    version = publish_price_fields(fields_of(prices), 5, root=str(tmp_path), created=downloaded_at)
+    snap = open_snapshot(str(tmp_path))
+    assert snap.version == version
+    assert snap.created == downloaded_at
+    assert not snap.is_fresh(ttl=300)
+
+
+def test_same_data_only_renews_freshness(tmp_path, prices):
+    root = str(tmp_path)
+    first = publish_price_fields(fields_of(prices), 5, root=root, created=time.time() - 600)
+    renewed_at = time.time() - 10
+    assert publish_price_fields(fields_of(prices), 5, root=root, created=renewed_at) is None
+    snap = open_snapshot(root)
+    assert snap.version == first
+    assert abs(snap.created - renewed_at) < 1e-3
+
+
+def test_older_download_does_not_replace_newer_snapshot(tmp_path, prices):
+    root = str(tmp_path)
+    newer = publish_price_fields(fields_of(prices), 5, root=root, created=time.time())
+    assert publish_price_fields(fields_of(prices.iloc[:-1]), 5, root=root, created=time.time() - 60) is None
+    assert open_snapshot(root).version == newer
+
+
+def test_stale_cached_data_is_not_republished(tmp_path, monkeypatch, prices):
+    # 만료된 캐시(다운로드 시각이 오래된 원본)를 다시 검증해도 스냅샷으로 게시하지 않음
+    monkeypatch.setenv("MDD_SNAPSHOT_DIR", str(tmp_path))
+    raw = pd.concat({"Close": prices, "High": prices, "Low": prices}, axis=1)
+    raw.attrs["downloaded_at"] = time.time() - 3600
+    monkeypatch.setattr(market_data, "load_data", lambda *args, **kwargs: raw.copy())
+    market_data._validate_recent(list(prices.columns), 5)
+    assert open_snapshot() is None
+
+    raw.attrs["downloaded_at"] = time.time()
+    market_data._validate_recent(list(prices.columns), 5)
+    assert open_snapshot().created == raw.attrs["downloaded_at"]
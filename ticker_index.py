@@ -0,0 +1,138 @@
+import difflib
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+from universe import normalize_ticker
+
+# ============================================================
+# 티커 메타데이터 색인 (티커 검증 / 자동 완성 / 상장일 경고)
+# ============================================================
+# 파일(ticker_index.csv 또는 MDD_TICKER_INDEX_FILE): ticker, name, asset_class, inception (YYYY-MM-DD)
+# 네트워크 없이 입력 티커를 바로 확인하고, 다운로드 전에 받을 필요가 없는 티커를 걸러냅니다.
+#   - 형식 오류        : 야후 파이낸스 티커 형식이 아님 -> 항상 제외
+#   - 최근 데이터 없음 : 직전 다운로드에서 데이터가 없던 티커 (MISSING_TTL 동안 기억) -> 제외
+#   - 색인에 없음      : 비슷한 티커를 제안. 색인이 모든 종목을 담지는 않으므로 strict=True 일 때만 제외
+# 다운로드로 확인한 상장일/데이터 없음은 프로세스 내 색인에 기억해 다음 검증에 사용합니다 (파일은 수정하지 않음).
+TICKER_INDEX_ENV = "MDD_TICKER_INDEX_FILE"
+DEFAULT_TICKER_INDEX_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ticker_index.csv")
+TICKER_PATTERN = re.compile(r"^\^?[A-Z0-9][A-Z0-9.=\-]{0,19}$")
+MISSING_TTL = 24 * 3600
+MAX_SUGGESTIONS = 3
+
+
+class TickerIndex:
+    def __init__(self, frame: pd.DataFrame):
+        # frame: ticker 인덱스, name / asset_class / inception(Timestamp) 컬럼
+        self.frame = frame
+        self._learned = {}      # 다운로드로 확인한 상장일 (색인에 없는 티커)
+        self._missing = {}      # 티커 -> 데이터가 없던 시각
+        self._lock = threading.Lock()
+
+    def __contains__(self, ticker):
+        return ticker in self.frame.index or ticker in self._learned
+
+    def tickers(self):
+        return self.frame.index.tolist()
+
+    def inception(self, ticker):
+        if ticker in self.frame.index:
+            return self.frame.at[ticker, "inception"]
+        return self._learned.get(ticker, pd.NaT)
+
+    def label(self, ticker):
+        # 자동 완성 목록 표시용: "QQQ · Invesco QQQ Trust (주식 ETF, 1999-03-10~)"
+        if ticker not in self.frame.index:
+            return ticker
+        row = self.frame.loc[ticker]
+        since = f", {row['inception']:%Y-%m-%d}~" if pd.notna(row["inception"]) else ""
+        return f"{ticker} · {row['name']} ({row['asset_class']}{since})"
+
+    def suggest(self, text, limit=MAX_SUGGESTIONS):
+        # 접두어 일치 -> 이름 포함 -> 철자가 비슷한 티커 순
+        t = normalize_ticker(text)
+        if not t:
+            return []
+        names = self.frame["name"].str.upper()
+        found = [x for x in self.frame.index if x.startswith(t) and x != t]
+        found += [x for x in self.frame.index[names.str.contains(t, regex=False)] if x not in found and x != t]
+        found += [x for x in difflib.get_close_matches(t, self.frame.index, n=limit, cutoff=0.7) if x not in found and x != t]
+        return found[:limit]
+
+    def check(self, tickers, strict=False) -> dict:
+        # 반환: {"keep": [...], "invalid": [...], "missing": [...], "unknown": {티커: [제안]}, "pruned": [...]}
+        now = time.monotonic()
+        with self._lock:
+            missing_since = dict(self._missing)
+        out = {"keep": [], "invalid": [], "missing": [], "unknown": {}, "pruned": []}
+        for t in tickers:
+            if not TICKER_PATTERN.match(t):
+                out["invalid"].append(t)
+                out["pruned"].append(t)
+            elif t in missing_since and now - missing_since[t] < MISSING_TTL:
+                out["missing"].append(t)
+                out["pruned"].append(t)
+            else:
+                if t not in self:
+                    out["unknown"][t] = self.suggest(t)
+                (out["pruned"] if strict and t in out["unknown"] else out["keep"]).append(t)
+        return out
+
+    def late_starters(self, tickers, start) -> pd.Series:
+        # 색인 기준으로 start 이후 상장된 티커 -> 상장일 (다운로드 전 경고용)
+        dates = pd.Series({t: self.inception(t) for t in tickers}, dtype="datetime64[ns]")
+        return dates[dates > pd.Timestamp(start)].sort_values()
+
+    def learn(self, inception: pd.Series, missing=()):
+        # 다운로드 결과 반영: 상장일(첫 유효 날짜)을 알게 된 티커, 데이터가 없던 티커
+        now = time.monotonic()
+        with self._lock:
+            for t, d in inception.dropna().items():
+                self._missing.pop(t, None)
+                if t not in self.frame.index:
+                    self._learned[t] = pd.Timestamp(d)
+            for t in missing:
+                self._missing[t] = now
+
+
+def read_ticker_index(source) -> pd.DataFrame:
+    df = pd.read_csv(source, dtype=str, comment="#", skipinitialspace=True).fillna("")
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "ticker" not in df.columns:
+        raise ValueError("티커 색인 파일에 'ticker' 컬럼이 없습니다.")
+    for col in ("name", "asset_class", "inception"):
+        if col not in df.columns:
+            df[col] = ""
+    df["ticker"] = df["ticker"].map(normalize_ticker)
+    df["inception"] = pd.to_datetime(df["inception"].str.strip(), errors="coerce")
+    df = df[df["ticker"] != ""].drop_duplicates(subset="ticker")
+    return df.set_index("ticker")[["name", "asset_class", "inception"]]
+
+
+def _empty_index() -> pd.DataFrame:
+    # 색인 파일이 없으면 빈 색인 (형식 검사와 다운로드 결과 기억만 동작)
+    return pd.DataFrame({"name": pd.Series(dtype=str), "asset_class": pd.Series(dtype=str),
+                         "inception": pd.Series(dtype="datetime64[ns]")}, index=pd.Index([], name="ticker"))
+
+
+_index_lock = threading.Lock()
+_indexes = {}  # 경로 -> (수정 시각, TickerIndex)
+
+
+def load_ticker_index(source=None) -> TickerIndex:
+    # 파일이 바뀌지 않았으면 프로세스 내에서 같은 색인(기억한 다운로드 결과 포함)을 재사용
+    source = source or os.environ.get(TICKER_INDEX_ENV, DEFAULT_TICKER_INDEX_FILE)
+    try:
+        mtime = os.path.getmtime(source)
+    except OSError:
+        mtime = None
+    with _index_lock:
+        cached = _indexes.get(source)
+        if cached is None or cached[0] != mtime:
+            frame = read_ticker_index(source) if mtime is not None else _empty_index()
+            cached = _indexes[source] = (mtime, TickerIndex(frame))
+        return cached[1]
+
@@ -0,0 +1,33 @@
+import os
+import pandas as pd
+
+# ============================================================
+# 모니터링 유니버스 (티커 목록) 로더
+# ============================================================
+DEFAULT_UNIVERSE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "universe.csv")
+
+
+def normalize_ticker(raw) -> str:
+    # 야후 파이낸스 표기법으로 정규화 (예: BRK.B -> BRK-B)
+    t = str(raw).strip().upper()
+    if "." in t and t not in ["KRW", "EUR"]:
+        t = t.replace(".", "-")
+    return t
+
+
+def load_universe(source=None) -> pd.DataFrame:
+    # source: 파일 경로 또는 업로드된 파일 객체 (CSV, 'ticker' 필수 / 'theme' 선택)
+    if source is None:
+        source = os.environ.get("MDD_UNIVERSE_FILE", DEFAULT_UNIVERSE_FILE)
+
+    df = pd.read_csv(source, dtype=str, comment="#", skipinitialspace=True).fillna("")
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if "ticker" not in df.columns:
+        raise ValueError("유니버스 파일에 'ticker' 컬럼이 없습니다.")
+    if "theme" not in df.columns:
+        df["theme"] = ""
+
+    df["ticker"] = df["ticker"].map(normalize_ticker)
+    df["theme"] = df["theme"].str.strip()
+    df = df[df["ticker"] != ""].drop_duplicates(subset="ticker")
+    return df[["ticker", "theme"]].reset_index(drop=True)